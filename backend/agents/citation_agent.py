@@ -1,13 +1,27 @@
 import re
 import httpx
-from typing import List, Dict
+from typing import List, Dict, Optional
 from config import config
+from tools.http_client import create_http_client
+from tools.doi_resolver import DOIResolver
+from utils.cache import make_key
+from utils.citations import canonical_doi
+from utils.scheduler import scheduler
+from utils.singleflight import flights
 
 class CitationAgent:
     """Validates citations in real-time"""
     
-    def __init__(self):
-        self.crossref_url = "https://api.crossref.org/works"
+    def __init__(self,
+                 client: Optional[httpx.AsyncClient] = None,
+                 resolver: Optional[DOIResolver] = None):
+        # Shared pooled client (injected from main.py lifespan)
+        self.client = client or create_http_client()
+        self.scheduler = scheduler
+        # The same citation in concurrent requests is looked up once
+        self.flights = flights
+        # CrossRef lookups go through the batched, locally stored resolver
+        self.resolver = resolver or DOIResolver(client=self.client)
     
     async def check_citation(self, citation: Dict) -> Dict:
         """Check a single citation"""
@@ -20,6 +34,8 @@ class CitationAgent:
             return await self._check_url_citation(citation)
         elif citation_type == 'doi':
             return await self._check_doi_citation(citation)
+        elif citation_type == 'ieee':
+            return await self._check_ieee_citation(citation)
         else:
             return self._unknown_citation(citation)
     
@@ -30,32 +46,44 @@ class CitationAgent:
         
         query = f"{author} {year}"
         
-        try:
-            params = {
-                'query': query,
-                'rows': 1,
-                'mailto': config.CROSSREF_EMAIL
+        return await self._search_crossref(citation, 'query', query)
+    
+    async def _check_ieee_citation(self, citation: Dict) -> Dict:
+        """Check a numbered [n] citation through its bibliography entry"""
+        entry = citation.get('entry')
+        
+        if entry is None:
+            return {
+                'citation': citation['text'],
+                'status': 'INVALID',
+                'found': False,
+                'issues': [f"Reference [{citation.get('reference_id', '')}] not found in the bibliography"]
             }
+        
+        # Prefer the exact identifiers the entry gives
+        if entry.get('doi'):
+            result = await self._check_doi_citation({'text': citation['text'], 'doi': entry['doi']})
+        elif entry.get('url'):
+            result = await self._check_url_citation({'text': citation['text'], 'url': entry['url']})
+        else:
+            result = await self._search_crossref(citation, 'query.bibliographic', entry['text'])
+        
+        result['entry'] = entry['text']
+        return result
+    
+    async def _search_crossref(self, citation: Dict, field: str, query: str) -> Dict:
+        """Look a citation up with a CrossRef works query; the top hit is the match"""
+        try:
+            metadata = await self.flights.do(
+                'crossref_search', make_key('crossref_search', query, field=field), lambda: self.resolver.search(field, query)
+            )
             
-            async with httpx.AsyncClient(timeout=config.API_TIMEOUT) as client:
-                response = await client.get(self.crossref_url, params=params)
-                data = response.json()
-            
-            items = data.get('message', {}).get('items', [])
-            
-            if items:
-                paper = items
+            if metadata:
                 return {
                     'citation': citation['text'],
                     'status': 'VALID',
                     'found': True,
-                    'metadata': {
-                        'title': paper.get('title', ['']) if isinstance(paper.get('title'), list) else paper.get('title', ''),
-                        'authors': [a.get('family', '') for a in paper.get('author', [])],
-                        'year': paper.get('published-online', {}).get('date-parts', []),
-                        'doi': paper.get('DOI', ''),
-                        'venue': paper.get('container-title', '')
-                    },
+                    'metadata': metadata,
                     'issues': []
                 }
             else:
@@ -78,9 +106,7 @@ class CitationAgent:
         url = citation.get('url', '')
         
         try:
-            async with httpx.AsyncClient(timeout=5) as client:
-                response = await client.head(url, allow_redirects=True)
-                status = response.status_code
+            status = await self.flights.do('url_check', url, lambda: self._head_status(url))
             
             is_valid = status < 400
             status_text = 'VALID' if is_valid else 'INVALID'
@@ -109,25 +135,16 @@ class CitationAgent:
         """Check DOI citation"""
         doi = citation.get('doi', '')
         
-        # CrossRef can look up by DOI
+        # Batched CrossRef lookup, answered locally for DOIs seen before
         try:
-            url = f"https://api.crossref.org/works/{doi}"
-            
-            async with httpx.AsyncClient(timeout=config.API_TIMEOUT) as client:
-                response = await client.get(url)
-                data = response.json()
+            record = await self.flights.do('doi', canonical_doi(doi), lambda: self.resolver.resolve(doi))
             
-            if response.status_code == 200:
-                message = data.get('message', {})
+            if record['found']:
                 return {
                     'citation': citation['text'],
                     'status': 'VALID',
                     'doi': doi,
-                    'metadata': {
-                        'title': message.get('title', ''),
-                        'doi': message.get('DOI', ''),
-                        'year': message.get('published-online', {}).get('date-parts', [])
-                    },
+                    'metadata': record['metadata'],
                     'issues': []
                 }
             else:
@@ -146,6 +163,13 @@ class CitationAgent:
                 'issues': [f'Error checking DOI: {str(e)}']
             }
     
+    async def _head_status(self, url: str) -> int:
+        async with self.scheduler.slot('url_check'):
+            response = await self.client.head(
+                url, follow_redirects=True, timeout=config.URL_CHECK_TIMEOUT
+            )
+            return response.status_code
+    
     def _unknown_citation(self, citation: Dict) -> Dict:
         """Handle unknown citation type"""
         return {
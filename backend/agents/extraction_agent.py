@@ -1,94 +1,124 @@
-import re
-from typing import List, Dict
+import threading
+from typing import List, Dict, Tuple
 
-import nltk
-import spacy
-from nltk.tokenize import sent_tokenize
-from spacy.util import is_package
-
-
-# Ensure NLTK punkt is available
-try:
-    nltk.data.find("tokenizers/punkt")
-except LookupError:
-    nltk.download("punkt")
+from config import config
+from utils.citations import scan_citations, resolve_references
 
 
 class ExtractionAgent:
-    """Extracts claims and citations from text"""
+    """
+    Extracts claims and citations from text.
+    spaCy and NLTK are imported and loaded on first use (or by `load()`
+    during warm-up), so importing this module stays cheap.
+    """
 
     def __init__(self):
-        # ❌ Do NOT auto-install models at runtime
-        if not is_package("en_core_web_sm"):
-            raise RuntimeError(
-                "spaCy model 'en_core_web_sm' is not installed.\n"
-                "Run this command once:\n"
-                "python -m spacy download en_core_web_sm"
-            )
-
-        self.nlp = spacy.load("en_core_web_sm")
+        self._nlp = None
+        self._sent_tokenize = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Load the spaCy model and NLTK sentence tokenizer if not loaded yet"""
+        with self._lock:
+            if self._nlp is not None:
+                return
+
+            import nltk
+            import spacy
+            from nltk.tokenize import sent_tokenize
+            from spacy.util import is_package
+
+            # ❌ Do NOT auto-install models at runtime
+            if not is_package("en_core_web_sm"):
+                raise RuntimeError(
+                    "spaCy model 'en_core_web_sm' is not installed.\n"
+                    "Run this command once:\n"
+                    "python -m spacy download en_core_web_sm"
+                )
+
+            # Ensure NLTK punkt is available
+            try:
+                nltk.data.find("tokenizers/punkt")
+            except LookupError:
+                nltk.download("punkt")
+
+            # Only entities and tokens are used, so skip the tagger/parser/lemmatizer
+            nlp = spacy.load("en_core_web_sm")
+            nlp.select_pipes(disable=[
+                name for name in config.EXTRACTION_DISABLED_PIPES
+                if name in nlp.pipe_names
+            ])
+
+            self._sent_tokenize = sent_tokenize
+            self._nlp = nlp
+
+    @property
+    def loaded(self) -> bool:
+        return self._nlp is not None
+
+    @property
+    def nlp(self):
+        self.load()
+        return self._nlp
 
     def extract_claims(self, text: str) -> List[Dict]:
         """Extract atomic factual claims"""
+        return self.extract_claims_from_sentences(self.split_sentences(text))
+
+    def split_sentences(self, text: str) -> List[str]:
+        """Split text into sentences; claim ids are positions in this list"""
         if not text or not text.strip():
             return []
 
-        sentences = sent_tokenize(text)
-        claims = []
-
-        for sent_idx, sentence in enumerate(sentences):
-            doc = self.nlp(sentence)
+        self.load()
+        return self._sent_tokenize(text)
+
+    def extract_claims_from_sentences(self, sentences: List[str], start: int = 0) -> List[Dict]:
+        """
+        Extract claims from pre-split sentences.
+        `start` is the position of sentences[0] in the whole document,
+        so chunks processed separately keep document-wide claim ids.
+        """
+        return self.extract_claims_at(list(enumerate(sentences, start)))
+
+    def extract_claims_at(self, sentences: List[Tuple[int, str]]) -> List[Dict]:
+        """
+        Extract claims from (document position, sentence) pairs, e.g. just
+        the sentences of a document that changed; ids follow the positions.
+        """
+        # Filter first, then run spaCy over the survivors in batches
+        factual = [
+            (sent_idx, sentence)
+            for sent_idx, sentence in sentences
+            if self._is_factual_claim(sentence)
+        ]
+        docs = self.nlp.pipe(
+            (sentence for _, sentence in factual),
+            batch_size=config.EXTRACTION_BATCH_SIZE
+        )
 
-            if self._is_factual_claim(sentence):
-                claims.append({
-                    "id": f"claim_{sent_idx}",
-                    "text": sentence.strip(),
-                    "entities": [(ent.text, ent.label_) for ent in doc.ents],
-                    "tokens": [token.text for token in doc]
-                })
+        claims = []
+        for (sent_idx, sentence), doc in zip(factual, docs):
+            claims.append({
+                "id": f"claim_{sent_idx}",
+                "text": sentence.strip(),
+                "entities": [(ent.text, ent.label_) for ent in doc.ents],
+                "tokens": [token.text for token in doc]
+            })
 
         return claims
 
     def extract_citations(self, text: str) -> List[Dict]:
-        """Extract citations from text"""
-        citations = []
-
-        # APA: Smith et al. (2023)
-        apa_pattern = r'(\w+(?:\s+et al\.)?)\s*\((\d{4})\)'
-        for match in re.finditer(apa_pattern, text):
-            citations.append({
-                "type": "apa",
-                "text": match.group(0),
-                "author": match.group(1),
-                "year": int(match.group(2))
-            })
-
-        # IEEE: [1]
-        for match in re.finditer(r'\[(\d+)\]', text):
-            citations.append({
-                "type": "ieee",
-                "text": match.group(0),
-                "reference_id": match.group(1)
-            })
-
-        # URLs
-        for match in re.finditer(r'https?://[^\s]+', text):
-            citations.append({
-                "type": "url",
-                "text": match.group(0),
-                "url": match.group(0)
-            })
-
-        # DOI
-        doi_pattern = r'(?:doi:|DOI\s+)([^\s]+)'
-        for match in re.finditer(doi_pattern, text, re.IGNORECASE):
-            citations.append({
-                "type": "doi",
-                "text": match.group(0),
-                "doi": match.group(1)
-            })
-
-        return citations
+        """
+        Extract citations from text in one pass, in document order.
+        Each occurrence keeps its character span (`start`, `end`); DOIs and
+        URLs are canonicalized so repeated references can be checked once.
+        IEEE "[n]" markers are resolved against the document's reference
+        list; the list's own labels are not reported as citations.
+        For very large inputs use utils.citations.scan_citation_chunks.
+        """
+        citations = [citation.to_dict() for citation in scan_citations(text)]
+        return resolve_references(text, citations)
 
     def _is_factual_claim(self, sentence: str) -> bool:
         """Check if sentence is a factual claim"""
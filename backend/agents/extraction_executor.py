@@ -0,0 +1,87 @@
+import asyncio
+import math
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from agents.extraction_agent import ExtractionAgent
+from config import config
+
+# One ExtractionAgent (and spaCy model) per worker process, loaded once
+_worker_agent: Optional[ExtractionAgent] = None
+
+
+def _init_worker():
+    global _worker_agent
+    _worker_agent = ExtractionAgent()
+    _worker_agent.load()
+
+
+def _extract_chunk(sentences: List[Tuple[int, str]]) -> List[Dict]:
+    return _worker_agent.extract_claims_at(sentences)
+
+
+class ExtractionExecutor:
+    """
+    Runs claim extraction off the event loop.
+    Small documents use the in-process agent on a worker thread; large
+    ones are split into sentence chunks across a process pool and merged
+    back in document order.
+    """
+
+    def __init__(self, extractor: ExtractionAgent, workers: Optional[int] = None):
+        self.extractor = extractor
+        self.workers = workers or config.EXTRACTION_WORKERS
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # spaCy pipelines are not safe to share between threads
+        self._lock = threading.Lock()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                # spawn: never fork a process that is running an event loop
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker
+            )
+        return self._pool
+
+    async def extract_claims(self, text: str) -> List[Dict]:
+        """Same output as ExtractionAgent.extract_claims, without blocking the loop"""
+        sentences = await self.split_sentences(text)
+        return await self.extract_claims_at(list(enumerate(sentences)))
+
+    async def split_sentences(self, text: str) -> List[str]:
+        return await asyncio.to_thread(self.extractor.split_sentences, text)
+
+    async def extract_claims_at(self, sentences: List[Tuple[int, str]]) -> List[Dict]:
+        """Claims from (document position, sentence) pairs, in the order given"""
+        if self.workers <= 1 or len(sentences) < config.EXTRACTION_PROCESS_MIN_SENTENCES:
+            return await asyncio.to_thread(self._extract_in_process, sentences)
+
+        chunk_size = min(
+            config.EXTRACTION_CHUNK_SENTENCES,
+            math.ceil(len(sentences) / self.workers)
+        )
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool()
+
+        chunks = await asyncio.gather(*(
+            loop.run_in_executor(pool, _extract_chunk, sentences[start:start + chunk_size])
+            for start in range(0, len(sentences), chunk_size)
+        ))
+
+        return [claim for chunk in chunks for claim in chunk]
+
+    async def extract_citations(self, text: str) -> List[Dict]:
+        return await asyncio.to_thread(self.extractor.extract_citations, text)
+
+    def _extract_in_process(self, sentences: List[Tuple[int, str]]) -> List[Dict]:
+        with self._lock:
+            return self.extractor.extract_claims_at(sentences)
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
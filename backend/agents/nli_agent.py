@@ -0,0 +1,119 @@
+import asyncio
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+
+class NLIAgent:
+    """
+    Local CPU natural-language-inference stage.
+    Scores every (evidence, claim) pair in batches and settles claims
+    whose entailment or contradiction is clear; the rest are left for
+    the LLM. Requires the optional `transformers` + `torch` packages.
+    """
+
+    def __init__(self, model_name: str = config.NLI_MODEL):
+        self.model_name = model_name
+        self.enabled = config.NLI_ENABLED
+        self._pipeline = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Load the model now rather than on the first batch"""
+        with self._lock:
+            self._load()
+
+    @property
+    def loaded(self) -> bool:
+        return self._pipeline is not None
+
+    def _load(self):
+        """Load the model on first use; disable the stage if it cannot load"""
+        if self._pipeline is not None or not self.enabled:
+            return
+
+        try:
+            from transformers import pipeline
+            self._pipeline = pipeline(
+                "text-classification",
+                model=self.model_name,
+                device=-1
+            )
+        except Exception as e:
+            logger.warning(f"NLI pre-filter disabled ({self.model_name}): {e}")
+            self.enabled = False
+
+    def score_pairs(self, pairs: List[Tuple[str, str]]) -> List[Dict[str, float]]:
+        """Label probabilities for each (premise, hypothesis) pair, in one batched pass"""
+        with self._lock:
+            self._load()
+            if not self.enabled or not pairs:
+                return [{} for _ in pairs]
+
+            outputs = self._pipeline(
+                [{"text": premise, "text_pair": hypothesis} for premise, hypothesis in pairs],
+                top_k=None,
+                batch_size=config.NLI_BATCH_SIZE,
+                truncation=True
+            )
+
+        return [
+            {entry["label"].lower(): entry["score"] for entry in output}
+            for output in outputs
+        ]
+
+    async def prefilter(self, items: List[Tuple[str, List[str]]]) -> List[Optional[Dict]]:
+        """
+        Verdict for each (claim, evidence_snippets) item that NLI settles
+        above NLI_THRESHOLD, or None where the LLM should decide.
+        """
+        if not self.enabled:
+            return [None] * len(items)
+
+        pairs, owners = [], []
+        for idx, (claim, evidence_snippets) in enumerate(items):
+            for snippet in evidence_snippets[:3]:
+                if snippet:
+                    pairs.append((snippet, claim))
+                    owners.append(idx)
+
+        scores = await asyncio.to_thread(self.score_pairs, pairs)
+
+        # Strongest entailment / contradiction per claim: (prob, snippet)
+        best: Dict[int, Dict[str, Tuple[float, str]]] = {}
+        for idx, (snippet, _), probs in zip(owners, pairs, scores):
+            claim_best = best.setdefault(idx, {})
+            for label in ("entailment", "contradiction"):
+                prob = probs.get(label, 0.0)
+                if prob > claim_best.get(label, (0.0, None))[0]:
+                    claim_best[label] = (prob, snippet)
+
+        verdicts = []
+        for idx, (claim, _) in enumerate(items):
+            claim_best = best.get(idx, {})
+            entail, entail_snippet = claim_best.get("entailment", (0.0, None))
+            contra, contra_snippet = claim_best.get("contradiction", (0.0, None))
+
+            if entail >= config.NLI_THRESHOLD and entail > contra:
+                verdicts.append(self._verdict(claim, "SUPPORTED", entail, entail_snippet))
+            elif contra >= config.NLI_THRESHOLD and contra > entail:
+                verdicts.append(self._verdict(claim, "CONTRADICTED", contra, contra_snippet))
+            else:
+                verdicts.append(None)
+
+        return verdicts
+
+    def _verdict(self, claim: str, status: str, confidence: float, snippet: str) -> Dict:
+        label = "entails" if status == "SUPPORTED" else "contradicts"
+        return {
+            "claim": claim,
+            "status": status,
+            "confidence": round(confidence, 3),
+            "explanation": f"Local NLI model: evidence {label} the claim (p={confidence:.2f})",
+            "best_evidence": snippet,
+            "judged_by": "nli"
+        }
@@ -1,9 +1,18 @@
 import json
 import logging
-from typing import List, Dict
+from typing import TYPE_CHECKING, List, Dict, Optional, Tuple
 import asyncio
-from google import genai
+import threading
 from config import config
+from utils.scheduler import scheduler
+from utils.cache import TwoTierCache, make_key
+from utils.circuit_breaker import breakers
+from utils.error_inspector import analyze_error
+from utils.metrics import metrics
+from utils.singleflight import Call, flights
+
+if TYPE_CHECKING:
+    from google import genai
 
 logger = logging.getLogger(__name__)
 
@@ -11,30 +20,90 @@ logger = logging.getLogger(__name__)
 class ReasoningAgent:
     """LLM-based reasoning using Google Gemini (new SDK)"""
 
-    def __init__(self):
-        # ✅ Correct way to authenticate
-        self.client = genai.Client(
-            api_key=config.GOOGLE_API_KEY
+    # Bump whenever the judging prompts change so cached verdicts are dropped
+    PROMPT_VERSION = "1"
+
+    def __init__(self,
+                 client: Optional["genai.Client"] = None,
+                 verdicts: Optional[TwoTierCache] = None):
+        # The Gemini SDK is imported and the client built on first use
+        self._client = client
+        self._client_lock = threading.Lock()
+
+        self.model_name = config.LLM_MODEL
+        # Used in order if the current model cannot be accessed
+        self.fallback_models = [m for m in config.LLM_FALLBACK_MODELS if m != self.model_name]
+        self.scheduler = scheduler
+        self.breakers = breakers
+        # Concurrent requests judging the same claim on the same evidence share one LLM call
+        self.flights = flights
+        self.verdicts = verdicts or TwoTierCache(
+            'verdicts',
+            path=config.VERDICT_CACHE_PATH,
+            ttl=config.VERDICT_CACHE_TTL,
+            stale_ttl=0,
+            max_entries=config.VERDICT_CACHE_MAX_ENTRIES,
+            max_disk_entries=config.VERDICT_CACHE_MAX_DISK_ENTRIES,
+            enabled=config.VERDICT_CACHE_ENABLED,
+            version=f"{self.model_name}:{self.PROMPT_VERSION}"
         )
 
-        self.model_name = "gemini-pro"
+    def load(self):
+        """Build the Gemini client if not built yet"""
+        with self._client_lock:
+            if self._client is None:
+                from google import genai
+
+                # ✅ Correct way to authenticate
+                self._client = genai.Client(
+                    api_key=config.GOOGLE_API_KEY
+                )
+
+    @property
+    def loaded(self) -> bool:
+        return self._client is not None
+
+    @property
+    def client(self) -> "genai.Client":
+        self.load()
+        return self._client
+
+    @client.setter
+    def client(self, client: "genai.Client"):
+        self._client = client
 
     async def judge_claim(self, claim: str, evidence_snippets: List[str]) -> Dict:
 
         if not evidence_snippets:
-            return {
-                "claim": claim,
-                "status": "UNVERIFIABLE",
-                "confidence": 0.0,
-                "explanation": "No evidence provided",
-                "best_evidence": None
-            }
+            return self._no_evidence(claim)
 
-        evidence_text = "\n\n".join(
-            f"Evidence {i + 1}: {snippet[:250]}"
-            for i, snippet in enumerate(evidence_snippets[:3])
+        verdict = await self.flights.do(
+            'gemini',
+            self._verdict_key(claim, evidence_snippets),
+            lambda: self._judge_single(claim, evidence_snippets)
         )
+        # Copy: the verdict is shared with every coalesced caller
+        return dict(verdict)
+
+    async def _judge_single(self, claim: str, evidence_snippets: List[str]) -> Dict:
+        """judge_claim without coalescing (batches register their own calls)"""
+        try:
+            verdict = await self.verdicts.get(self._verdict_key(claim, evidence_snippets))
+            if verdict is None:
+                verdict, model = await self._ask_single(claim, evidence_snippets)
+                # Stored under the model that answered, which may be a fallback
+                await self.verdicts.set(self._verdict_key(claim, evidence_snippets, model), verdict)
+            return self._finalize(verdict, claim, evidence_snippets)
+
+        except Exception as e:
+            logger.error(
+                f"Reasoning error for claim '{claim}': {e}",
+                exc_info=True
+            )
+            return self._analysis_error(claim, e)
 
+    async def _ask_single(self, claim: str, evidence_snippets: List[str]) -> Tuple[Dict, str]:
+        """One-claim prompt; (verdict, model that gave it). Raises if the reply is not a JSON verdict"""
         prompt = f"""
 You are an expert fact-checker.
 
@@ -42,7 +111,7 @@ Claim:
 {claim}
 
 Evidence:
-{evidence_text}
+{self._format_evidence(evidence_snippets)}
 
 Respond ONLY in JSON with this schema:
 {{
@@ -53,47 +122,244 @@ Respond ONLY in JSON with this schema:
 }}
 """
 
+        content, model = await self._generate(prompt)
+        verdict = json.loads(content)
+        if not isinstance(verdict, dict):
+            raise ValueError("Expected a JSON object verdict")
+        return verdict, model
+
+    async def judge_claims_batch(self, items: List[Tuple[str, List[str]]]) -> List[Dict]:
+        """
+        Judge many (claim, evidence_snippets) pairs with as few LLM calls
+        as the token budget allows. Results keep the order of `items`.
+        """
+        results: List[Optional[Dict]] = [None] * len(items)
+        keys = [self._verdict_key(claim, evidence_snippets) for claim, evidence_snippets in items]
+        joined = []
+        batches = []
+        batch, batch_tokens = [], 0
+
+        for idx, (claim, evidence_snippets) in enumerate(items):
+            if not evidence_snippets:
+                results[idx] = self._no_evidence(claim)
+                continue
+
+            cached = await self.verdicts.get(keys[idx])
+            if cached is not None:
+                results[idx] = self._finalize(cached, claim, evidence_snippets)
+                continue
+
+            # Being judged by a concurrent request: wait for that verdict
+            if self.flights.in_flight('gemini', keys[idx]):
+                joined.append(idx)
+                continue
+
+            tokens = self._estimate_tokens(claim, evidence_snippets)
+            if batch and (batch_tokens + tokens > config.LLM_BATCH_TOKEN_BUDGET
+                          or len(batch) >= config.LLM_BATCH_MAX_CLAIMS):
+                batches.append(batch)
+                batch, batch_tokens = [], 0
+
+            batch.append(idx)
+            batch_tokens += tokens
+
+        if batch:
+            batches.append(batch)
+
+        calls: Dict[int, Call] = {}
+        for batch in batches:
+            batch_calls = self.flights.start_many(
+                'gemini',
+                [keys[idx] for idx in batch],
+                lambda batch=batch: self._judge_batch([items[idx] for idx in batch])
+            )
+            calls.update(zip(batch, batch_calls))
+        for idx in joined:
+            claim, evidence_snippets = items[idx]
+            calls[idx] = self.flights.start(
+                'gemini', keys[idx],
+                lambda claim=claim, evidence_snippets=evidence_snippets: self._judge_single(claim, evidence_snippets)
+            )
+
+        verdicts = await asyncio.gather(*(self.flights.wait(call) for call in calls.values()))
+        for idx, verdict in zip(calls, verdicts):
+            # Copy: verdicts are shared with every coalesced caller
+            results[idx] = dict(verdict)
+
+        return results
+
+    async def cached_verdict(self, claim: str, evidence_snippets: List[str]) -> Optional[Dict]:
+        """The stored verdict for this claim and evidence, without calling the LLM"""
+        if not evidence_snippets:
+            return None
+        verdict = await self.verdicts.get(self._verdict_key(claim, evidence_snippets))
+        return self._finalize(verdict, claim, evidence_snippets) if verdict is not None else None
+
+    async def _judge_batch(self, items: List[Tuple[str, List[str]]]) -> List[Dict]:
+        """Judge one packed batch, splitting it in half if the reply is unusable"""
+        if len(items) == 1:
+            claim, evidence_snippets = items[0]
+            return [await self._judge_single(claim, evidence_snippets)]
+
+        claims_text = "\n\n".join(
+            f"Claim {i}:\n{claim}\n\nEvidence:\n{self._format_evidence(evidence_snippets)}"
+            for i, (claim, evidence_snippets) in enumerate(items)
+        )
+
+        prompt = f"""
+You are an expert fact-checker.
+
+Judge each claim below using only the evidence listed under it.
+
+{claims_text}
+
+Respond ONLY with a JSON array containing one object per claim, using this schema:
+[
+  {{
+    "id": 0,
+    "status": "SUPPORTED" | "CONTRADICTED" | "UNVERIFIABLE",
+    "confidence": 0.0-1.0,
+    "explanation": "1-2 sentence justification",
+    "best_evidence_idx": 0
+  }}
+]
+"""
+
+        try:
+            content, model = await self._generate(prompt)
+        except Exception as e:
+            # Rate limits, network and auth errors, open circuit: smaller
+            # batches would fail the same way, only with more calls
+            logger.error(f"Batch of {len(items)} claims failed: {e}")
+            return [self._analysis_error(claim, e) for claim, _ in items]
+
         try:
-            # ✅ Async-safe call using thread executor
+            parsed = json.loads(content)
+            by_id = {
+                entry.get("id"): entry
+                for entry in parsed
+                if isinstance(entry, dict)
+            }
+
+            if not all(i in by_id for i in range(len(items))):
+                raise ValueError(
+                    f"Batch reply covered {len(by_id)} of {len(items)} claims"
+                )
+
+        except (ValueError, TypeError) as e:
+            # Unusable reply (bad JSON, missing claims): retry in halves
+            logger.warning(
+                f"Batch of {len(items)} claims failed ({e}); retrying in smaller batches"
+            )
+            middle = len(items) // 2
+            left, right = await asyncio.gather(
+                self._judge_batch(items[:middle]),
+                self._judge_batch(items[middle:])
+            )
+            return left + right
+
+        verdicts = []
+        for i, (claim, evidence_snippets) in enumerate(items):
+            verdict = {k: v for k, v in by_id[i].items() if k != "id"}
+            await self.verdicts.set(self._verdict_key(claim, evidence_snippets, model), verdict)
+            verdicts.append(self._finalize(verdict, claim, evidence_snippets))
+
+        return verdicts
+
+    async def _generate(self, prompt: str) -> Tuple[str, str]:
+        """
+        Send one prompt to Gemini; (reply without code fences, model that gave it).
+        Goes through the 'gemini' circuit breaker; if the model cannot be
+        accessed, switches to the next fallback model and retries.
+        """
+        while True:
+            model = self.model_name
+            try:
+                response = await self.breakers.call('gemini', lambda: self._call_model(model, prompt))
+                break
+            except Exception as e:
+                if analyze_error(e)["type"] != "MODEL_ACCESS_ERROR":
+                    raise
+                if self.model_name != model:
+                    continue  # A concurrent call already switched models
+                if not self.fallback_models:
+                    raise
+                self.model_name = self.fallback_models.pop(0)
+                logger.warning(f"Model {model} unavailable ({e}); switching to {self.model_name}")
+
+        content = response.text.strip()
+
+        # Remove code fences if present
+        if "```" in content:
+            content = (
+                content.replace("```json", "")
+                       .replace("```", "")
+                       .strip()
+            )
+
+        return content, model
+
+    async def _call_model(self, model: str, prompt: str):
+        # ✅ Async-safe call using thread executor
+        async with self.scheduler.slot('gemini'):
             response = await asyncio.to_thread(
                 self.client.models.generate_content,
-                model=self.model_name,
+                model=model,
                 contents=prompt
             )
-            
 
-            content = response.text.strip()
+        metrics.record_tokens(model, getattr(response, 'usage_metadata', None))
+        return response
 
-            # Remove code fences if present
-            if "```" in content:
-                content = (
-                    content.replace("```json", "")
-                           .replace("```", "")
-                           .strip()
-                )
+    def _finalize(self, result: Dict, claim: str, evidence_snippets: List[str]) -> Dict:
+        """Attach the claim and the chosen evidence snippet to a parsed verdict"""
+        # Copy: verdicts may be shared with the cache
+        result = dict(result)
+        result["claim"] = claim
 
-            result = json.loads(content)
-            result["claim"] = claim
+        idx = result.get("best_evidence_idx", 0)
+        if isinstance(idx, int) and idx < len(evidence_snippets):
+            result["best_evidence"] = evidence_snippets[idx]
+        else:
+            result["best_evidence"] = evidence_snippets[0]
 
-            idx = result.get("best_evidence_idx", 0)
-            if isinstance(idx, int) and idx < len(evidence_snippets):
-                result["best_evidence"] = evidence_snippets[idx]
-            else:
-                result["best_evidence"] = evidence_snippets[0]
+        return result
 
-            return result
-        
-        
+    def _verdict_key(self, claim: str, evidence_snippets: List[str], model: Optional[str] = None) -> str:
+        """Fingerprint of exactly what `model` (default: the current one) would be shown"""
+        return make_key(
+            'verdict',
+            claim,
+            evidence=[" ".join(snippet[:250].split()) for snippet in evidence_snippets[:3]],
+            model=model or self.model_name,
+            prompt=self.PROMPT_VERSION
+        )
 
-        except Exception as e:
-            logger.error(
-                f"Reasoning error for claim '{claim}': {e}",
-                exc_info=True
-            )
-            return {
-                "claim": claim,
-                "status": "UNVERIFIABLE",
-                "confidence": 0.0,
-                "explanation": f"Analysis error: {str(e)}",
-                "best_evidence": None
-            }
\ No newline at end of file
+    def _format_evidence(self, evidence_snippets: List[str]) -> str:
+        return "\n\n".join(
+            f"Evidence {i + 1}: {snippet[:250]}"
+            for i, snippet in enumerate(evidence_snippets[:3])
+        )
+
+    def _estimate_tokens(self, claim: str, evidence_snippets: List[str]) -> int:
+        """Rough prompt size (~4 characters per token)"""
+        chars = len(claim) + sum(len(snippet[:250]) + 16 for snippet in evidence_snippets[:3])
+        return chars // 4 + 20
+
+    def _analysis_error(self, claim: str, error: Exception) -> Dict:
+        return {
+            "claim": claim,
+            "status": "UNVERIFIABLE",
+            "confidence": 0.0,
+            "explanation": f"Analysis error: {str(error)}",
+            "best_evidence": None
+        }
+
+    def _no_evidence(self, claim: str) -> Dict:
+        return {
+            "claim": claim,
+            "status": "UNVERIFIABLE",
+            "confidence": 0.0,
+            "explanation": "No evidence provided",
+            "best_evidence": None
+        }
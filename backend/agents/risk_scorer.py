@@ -1,8 +1,16 @@
-from typing import Dict, List
+import json
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional
+
+if TYPE_CHECKING:
+    import numpy as np
 
 class RiskScorer:
     """Calculates hallucination risk scores"""
     
+    HIGH_RISK = 60  # Minimum risk_score of each level
+    MEDIUM_RISK = 30
+    LOW_CONFIDENCE = 0.6  # Claims below this confidence count as low confidence
+    
     def __init__(self):
         self.weights = {
             'contradicted_claims': 0.40,
@@ -15,8 +23,16 @@ class RiskScorer:
                       claims_results: List[Dict], 
                       citations_results: List[Dict]) -> Dict:
         """Calculate overall hallucination risk"""
-        
-        if not claims_results:
+        accumulator = RiskAccumulator(self)
+        for result in claims_results:
+            accumulator.add_claim(result)
+        for result in citations_results:
+            accumulator.add_citation(result)
+        return accumulator.assessment()
+    
+    def assess(self, counts: Dict[str, int]) -> Dict:
+        """Risk assessment from RiskAccumulator counts"""
+        if not counts['claims']:
             return {
                 'risk_score': 0,
                 'risk_level': 'LOW',
@@ -24,15 +40,15 @@ class RiskScorer:
                 'recommendations': []
             }
         
-        # Count claim statuses
-        total_claims = len(claims_results)
-        contradicted = sum(1 for c in claims_results if c['status'] == 'CONTRADICTED')
-        unverifiable = sum(1 for c in claims_results if c['status'] == 'UNVERIFIABLE')
-        low_conf = sum(1 for c in claims_results if c.get('confidence', 1.0) < 0.6)
+        # Claim statuses
+        total_claims = counts['claims']
+        contradicted = counts['contradicted']
+        unverifiable = counts['unverifiable']
+        low_conf = counts['low_confidence']
         
-        # Count citation issues
-        invalid_cits = sum(1 for c in citations_results if c['status'] == 'INVALID')
-        total_cits = len(citations_results) if citations_results else 1
+        # Citation issues
+        invalid_cits = counts['invalid_citations']
+        total_cits = counts['citations'] or 1
         
         # Calculate weighted risk
         risk_score = 0
@@ -46,7 +62,7 @@ class RiskScorer:
             risk_score += (invalid_cits / total_cits) * self.weights['invalid_citations'] * 100
         
         risk_score = min(100, max(0, risk_score))
-        risk_level = 'HIGH' if risk_score >= 60 else 'MEDIUM' if risk_score >= 30 else 'LOW'
+        risk_level = 'HIGH' if risk_score >= self.HIGH_RISK else 'MEDIUM' if risk_score >= self.MEDIUM_RISK else 'LOW'
         
         # Identify factors
         factors = []
@@ -90,3 +106,163 @@ class RiskScorer:
                 'low_confidence_claims': low_conf
             }
         }
+    
+    def score_batch(self,
+                    batch: 'RiskBatch',
+                    weights: Optional[Dict[str, float]] = None,
+                    low_confidence: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Score every document of `batch` at once; same risk_score, risk_level
+        and breakdown as calculate_risk, one entry per document in each field
+        (risk_score and risk_level as lists of Python values, the breakdown
+        counts as arrays).
+        `weights` (merged over self.weights) and `low_confidence` re-score
+        stored outcomes under different settings without re-verifying.
+        """
+        import numpy as np
+        
+        weights = {**self.weights, **(weights or {})}
+        cutoff = self.LOW_CONFIDENCE if low_confidence is None else low_confidence
+        n = batch.documents
+        
+        def per_document(document: 'np.ndarray', mask: 'np.ndarray') -> 'np.ndarray':
+            return np.bincount(document[mask], minlength=n)
+        
+        claims = np.bincount(batch.claim_document, minlength=n)
+        contradicted = per_document(batch.claim_document, batch.claim_status == RiskBatch.CONTRADICTED)
+        unverifiable = per_document(batch.claim_document, batch.claim_status == RiskBatch.UNVERIFIABLE)
+        low_conf = per_document(batch.claim_document, batch.claim_confidence < cutoff)
+        citations = np.bincount(batch.citation_document, minlength=n)
+        invalid_cits = per_document(batch.citation_document, batch.citation_invalid)
+        
+        # Same operations in the same order as assess(), so scores match exactly
+        total_claims = np.maximum(claims, 1)
+        total_cits = np.maximum(citations, 1)
+        risk_score = (contradicted / total_claims) * weights['contradicted_claims'] * 100
+        risk_score += (unverifiable / total_claims) * weights['unverifiable_claims'] * 100
+        risk_score += (low_conf / total_claims) * weights['low_confidence'] * 100
+        risk_score += (invalid_cits / total_cits) * weights['invalid_citations'] * 100
+        risk_score = np.minimum(100, np.maximum(0, risk_score))
+        # Documents without claims score 0 (LOW), as in assess()
+        risk_score[claims == 0] = 0
+        
+        levels = (risk_score >= self.MEDIUM_RISK).astype(np.int8) + (risk_score >= self.HIGH_RISK)
+        names = ('LOW', 'MEDIUM', 'HIGH')
+        return {
+            'document_id': batch.document_ids,
+            # Python round, as in assess(): np.round differs at .x5 ties
+            'risk_score': [round(float(score), 1) for score in risk_score],
+            'risk_level': [names[level] for level in levels],
+            'contradicted_claims': contradicted,
+            'unverifiable_claims': unverifiable,
+            'invalid_citations': invalid_cits,
+            'low_confidence_claims': low_conf
+        }
+
+
+class RiskBatch:
+    """
+    Claim and citation outcomes of many verified documents as columnar
+    NumPy arrays (one row per claim or citation, tagged with its document
+    index), loaded once and scored by RiskScorer.score_batch.
+    """
+    
+    OTHER, SUPPORTED, CONTRADICTED, UNVERIFIABLE = range(4)
+    STATUS_CODES = {'SUPPORTED': SUPPORTED, 'CONTRADICTED': CONTRADICTED, 'UNVERIFIABLE': UNVERIFIABLE}
+    
+    def __init__(self,
+                 document_ids: 'np.ndarray',
+                 claim_document: 'np.ndarray',
+                 claim_status: 'np.ndarray',
+                 claim_confidence: 'np.ndarray',
+                 citation_document: 'np.ndarray',
+                 citation_invalid: 'np.ndarray'):
+        self.document_ids = document_ids
+        self.claim_document = claim_document
+        self.claim_status = claim_status
+        self.claim_confidence = claim_confidence
+        self.citation_document = citation_document
+        self.citation_invalid = citation_invalid
+    
+    @property
+    def documents(self) -> int:
+        return len(self.document_ids)
+    
+    @classmethod
+    def from_reports(cls, reports: Iterable[Dict], document_ids: Optional[Iterable[str]] = None) -> 'RiskBatch':
+        """From verify() reports (or anything with 'claims' and 'citations' result lists)"""
+        import numpy as np
+        
+        ids = iter(document_ids) if document_ids is not None else None
+        document_ids = []
+        claim_document, claim_status, claim_confidence = [], [], []
+        citation_document, citation_invalid = [], []
+        
+        for index, report in enumerate(reports):
+            document_ids.append(next(ids) if ids is not None else str(index))
+            for claim in report.get('claims', []):
+                claim_document.append(index)
+                claim_status.append(cls.STATUS_CODES.get(claim['status'], cls.OTHER))
+                claim_confidence.append(claim.get('confidence', 1.0))
+            for citation in report.get('citations', []):
+                citation_document.append(index)
+                citation_invalid.append(citation['status'] == 'INVALID')
+        
+        return cls(
+            np.array(document_ids, dtype=object),
+            np.array(claim_document, dtype=np.int64),
+            np.array(claim_status, dtype=np.int8),
+            np.array(claim_confidence, dtype=np.float64),
+            np.array(citation_document, dtype=np.int64),
+            np.array(citation_invalid, dtype=bool)
+        )
+    
+    @classmethod
+    def from_job_results(cls, lines: Iterable[str]) -> 'RiskBatch':
+        """From the JSONL lines of a batch job's results (failed documents are skipped)"""
+        rows = (json.loads(line) for line in lines)
+        completed = [row for row in rows if row.get('status') == 'completed']
+        return cls.from_reports(
+            (row['result'] for row in completed),
+            document_ids=(row['document_id'] for row in completed)
+        )
+
+
+class RiskAccumulator:
+    """
+    Running claim and citation counts behind a risk assessment.
+    Results can be added and removed one at a time, so a document whose
+    results change a few at a time (streamed results, an edited draft)
+    is re-scored without recounting every result.
+    """
+    
+    def __init__(self, scorer: Optional[RiskScorer] = None):
+        self.scorer = scorer or RiskScorer()
+        self.counts = {
+            'claims': 0,
+            'contradicted': 0,
+            'unverifiable': 0,
+            'low_confidence': 0,
+            'citations': 0,
+            'invalid_citations': 0
+        }
+    
+    def add_claim(self, result: Dict, count: int = 1):
+        """Count `result` (`count` times, e.g. for a repeated sentence)"""
+        self.counts['claims'] += count
+        self.counts['contradicted'] += count * (result['status'] == 'CONTRADICTED')
+        self.counts['unverifiable'] += count * (result['status'] == 'UNVERIFIABLE')
+        self.counts['low_confidence'] += count * (result.get('confidence', 1.0) < self.scorer.LOW_CONFIDENCE)
+    
+    def remove_claim(self, result: Dict, count: int = 1):
+        self.add_claim(result, -count)
+    
+    def add_citation(self, result: Dict, count: int = 1):
+        self.counts['citations'] += count
+        self.counts['invalid_citations'] += count * (result['status'] == 'INVALID')
+    
+    def remove_citation(self, result: Dict, count: int = 1):
+        self.add_citation(result, -count)
+    
+    def assessment(self) -> Dict:
+        return self.scorer.assess(self.counts)
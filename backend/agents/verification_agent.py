@@ -1,45 +1,444 @@
 import asyncio
-from typing import Dict, List
+import time
+import httpx
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 from agents.extraction_agent import ExtractionAgent
+from agents.extraction_executor import ExtractionExecutor
 from agents.reasoning_agent import ReasoningAgent
+from agents.nli_agent import NLIAgent
 from agents.citation_agent import CitationAgent
-from agents.risk_scorer import RiskScorer
+from agents.risk_scorer import RiskAccumulator, RiskScorer
 from tools.retrieval_tools import RetrievalTools
+from tools.http_client import create_http_client
+from utils.scheduler import current_priority
+from utils.citations import citation_key
+from utils.claim_clustering import ClaimIndex
+from utils.deadline import Deadline
+from utils.document_sessions import DocumentSession, content_hash
+from utils.metrics import metrics
 from config import config
 
 class VerificationAgent:
     """Main agent that orchestrates all sub-agents"""
     
-    def __init__(self):
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
+        # One pooled client shared by retrieval and citation checks
+        self._owns_http_client = http_client is None
+        self.http_client = http_client or create_http_client()
+        
         self.extractor = ExtractionAgent()
+        self.extraction = ExtractionExecutor(self.extractor)
         self.reasoner = ReasoningAgent()
-        self.citation_checker = CitationAgent()
+        self.nli = NLIAgent()
+        self.citation_checker = CitationAgent(client=self.http_client)
         self.risk_scorer = RiskScorer()
-        self.retriever = RetrievalTools()
+        self.retriever = RetrievalTools(client=self.http_client)
+        self.claim_index = ClaimIndex()
+    
+    async def warm_up(self):
+        """
+        Load spaCy/NLTK, the Gemini client, the NLI model and the local
+        evidence index (each is otherwise loaded on first use), off the event loop.
+        Raises if a required one cannot be loaded; NLI only disables itself
+        and an unreadable local index only leaves retrieval remote.
+        """
+        await asyncio.to_thread(self.extractor.load)
+        await asyncio.to_thread(self.reasoner.load)
+        await asyncio.to_thread(self.nli.load)
+        try:
+            await asyncio.to_thread(self.retriever.local_index.load)
+        except Exception as e:
+            print(f"Local index error: {e}")
+    
+    def loaded(self) -> Dict[str, bool]:
+        return {
+            'extraction': self.extractor.loaded,
+            'reasoning': self.reasoner.loaded,
+            'nli': self.nli.loaded,
+            'local_index': self.retriever.local_index.loaded
+        }
+    
+    async def aclose(self):
+        """Close caches and worker processes, and the HTTP client if this agent created it"""
+        await asyncio.to_thread(self.extraction.shutdown)
+        self.retriever.cache.close()
+        self.reasoner.verdicts.close()
+        self.citation_checker.resolver.cache.close()
+        if self._owns_http_client:
+            await self.http_client.aclose()
     
     async def verify(self, 
                     content: str,
-                    context: str = "") -> Dict:
+                    context: str = "",
+                    deadline: Optional[float] = None,
+                    timings: bool = False) -> Dict:
         """
         Main verification pipeline
         Returns: {claims, citations, risk_assessment}
+        With a `deadline` (seconds), each stage gets its share of the budget
+        (config.STAGE_BUDGETS); claims and citations not finished in time
+        come back as partial results marked `partial: True`, and those not
+        even extracted in time are left out (metadata.deadline.partial_extraction).
+        With `timings`, the report also carries per-stage, per-provider and
+        per-claim times and LLM token counts.
         """
+        budget = Deadline(deadline) if deadline else None
         
-        # Step 1: Extract claims and citations
-        claims = self.extractor.extract_claims(content)
-        citations = self.extractor.extract_citations(content)
+        with metrics.request() as request_timings:
+            # Step 1: Extract claims and citations (off the event loop)
+            with metrics.span('extraction'):
+                claims = await self._extract(self.extraction.extract_claims(content), budget)
+                citations = await self._extract(self.extraction.extract_citations(content), budget)
+            # Whatever was not extracted in time is left out of the report
+            partial_extraction = claims is None or citations is None
+            claims = claims if claims is not None else []
+            citations = citations if citations is not None else []
+            
+            # Steps 2 + 3: Verify each claim and check each citation (in parallel)
+            verified_claims, verified_citations = await asyncio.gather(
+                self._verify_claims_parallel(claims, budget),
+                self._check_citations_parallel(citations, budget)
+            )
+            
+            # Step 4: Calculate overall risk
+            with metrics.span('risk'):
+                report = self._build_report(claims, citations, verified_claims, verified_citations)
         
-        # Step 2: Verify each claim (in parallel)
-        verified_claims = await self._verify_claims_parallel(claims)
+        if timings:
+            report['timings'] = request_timings.summary()
+        if budget is not None:
+            report['metadata']['deadline'] = self._deadline_metadata(
+                budget, verified_claims, verified_citations, partial_extraction
+            )
+        return report
+    
+    async def verify_revision(self,
+                              session: DocumentSession,
+                              content: str,
+                              deadline: Optional[float] = None,
+                              timings: bool = False) -> Dict:
+        """
+        Verify a new revision of a session's document; same report as verify().
+        Sentences are keyed by content hash and citations by canonical
+        reference, so only new or changed ones are extracted and verified;
+        the rest reuse the previous revision's results (partial ones are
+        retried) and the risk assessment is updated by the difference.
+        """
+        async with session.lock:
+            budget = Deadline(deadline) if deadline else None
+            
+            with metrics.request() as request_timings:
+                with metrics.span('extraction'):
+                    sentences = await self.extraction.split_sentences(content)
+                    hashes = [content_hash(sentence) for sentence in sentences]
+                    reusable = {
+                        h for h, entry in session.sentences.items()
+                        if entry is None or not entry[0].get('partial')
+                    }
+                    changed = {}
+                    for position, (sentence, h) in enumerate(zip(sentences, hashes)):
+                        if h not in reusable and h not in changed:
+                            changed[h] = (position, sentence)
+                    new_claims = await self._extract(self.extraction.extract_claims_at(list(changed.values())), budget)
+                    citations = await self._extract(self.extraction.extract_citations(content), budget)
+                
+                # Changed sentences not extracted in time are left out of this
+                # report and not remembered, so the next revision extracts them
+                partial_extraction = new_claims is None or citations is None
+                unextracted = set(changed) if new_claims is None else set()
+                new_claims = new_claims if new_claims is not None else []
+                citations = citations if citations is not None else []
+                
+                groups = self._group_citations(citations)
+                new_references = [
+                    key for key in groups
+                    if key not in session.citations or session.citations[key].get('partial')
+                ]
+                verified_new, checked_new = await asyncio.gather(
+                    self._verify_claims_parallel(new_claims, budget),
+                    self._check_citations_parallel([citations[groups[key][0]] for key in new_references], budget)
+                )
+                
+                with metrics.span('risk'):
+                    entries = self._revision_claims(session, hashes, changed, new_claims, verified_new)
+                    references = {key: session.citations[key] for key in groups if key not in new_references}
+                    references.update(zip(new_references, checked_new))
+                    
+                    verified_claims = self._assemble_claims(sentences, hashes, entries)
+                    verified_citations = [None] * len(citations)
+                    for key, positions in groups.items():
+                        for position in positions:
+                            verified_citations[position] = self._fan_out(
+                                references[key], citations[position], key, len(positions)
+                            )
+                    
+                    claim_counts: Dict[str, int] = {}
+                    for h in hashes:
+                        if entries[h] is not None:
+                            claim_counts[h] = claim_counts.get(h, 0) + 1
+                    citation_counts = {key: len(positions) for key, positions in groups.items()}
+                    
+                    risk = session.risk or RiskAccumulator(self.risk_scorer)
+                    for h in set(session.claim_counts) | set(claim_counts):
+                        before, after = session.sentences.get(h), entries.get(h)
+                        if before is after and session.claim_counts.get(h) == claim_counts.get(h):
+                            continue
+                        if before is not None:
+                            risk.remove_claim(before[0], session.claim_counts.get(h, 0))
+                        if after is not None:
+                            risk.add_claim(after[0], claim_counts.get(h, 0))
+                    for key in set(session.citation_counts) | set(citation_counts):
+                        before, after = session.citations.get(key), references.get(key)
+                        if before is after and session.citation_counts.get(key) == citation_counts.get(key):
+                            continue
+                        if before is not None:
+                            risk.remove_citation(before, session.citation_counts.get(key, 0))
+                        if after is not None:
+                            risk.add_citation(after, citation_counts.get(key, 0))
+                    
+                    report = self._build_report(
+                        verified_claims, citations, verified_claims, verified_citations,
+                        risk_assessment=risk.assessment()
+                    )
+            
+            reused_claims = sum(1 for h in hashes if h not in changed and entries[h] is not None)
+            metrics.inc('session_claims_total', reused_claims, outcome='reused')
+            metrics.inc('session_claims_total', len(verified_claims) - reused_claims, outcome='verified')
+            
+            session.sentences = {h: entry for h, entry in entries.items() if h not in unextracted}
+            session.claim_counts = claim_counts
+            session.citations = references
+            session.citation_counts = citation_counts
+            session.risk = risk
+            session.revision += 1
+            session.updated_at = time.time()
+            
+            report['metadata']['session'] = {
+                **session.info(),
+                'reused_claims': reused_claims,
+                'verified_claims': len(verified_claims) - reused_claims,
+                'reused_citations': len(groups) - len(new_references),
+                'checked_citations': len(new_references)
+            }
+            if timings:
+                report['timings'] = request_timings.summary()
+            if budget is not None:
+                report['metadata']['deadline'] = self._deadline_metadata(
+                    budget, verified_claims, verified_citations, partial_extraction
+                )
+            session.report = report
+            return report
+    
+    def _revision_claims(self,
+                         session: DocumentSession,
+                         hashes: List[str],
+                         changed: Dict[str, Tuple[int, str]],
+                         new_claims: List[Dict],
+                         verified_new: List[Dict]) -> Dict[str, Optional[Tuple[Dict, str]]]:
+        """
+        Session entries for every sentence of the revision: the previous
+        entry if unchanged, else the new result (None if not a claim),
+        with `duplicate_of` kept as the representative sentence's hash
+        since claim ids move when sentences are inserted or removed.
+        """
+        entries = {h: session.sentences[h] for h in hashes if h not in changed}
+        entries.update(dict.fromkeys(changed))
         
-        # Step 3: Check each citation (in parallel)
-        verified_citations = await self._check_citations_parallel(citations)
+        id_hashes = {claim['id']: content_hash(claim['text']) for claim in new_claims}
+        for claim, result in zip(new_claims, verified_new):
+            h = id_hashes[claim['id']]
+            entries[h] = (result, id_hashes.get(result.get('duplicate_of'), h))
+        return entries
+    
+    def _assemble_claims(self,
+                         sentences: List[str],
+                         hashes: List[str],
+                         entries: Dict[str, Optional[Tuple[Dict, str]]]) -> List[Dict]:
+        """Claim results in document order, with this revision's ids"""
+        first_ids: Dict[str, str] = {}
+        for position, h in enumerate(hashes):
+            if entries[h] is not None:
+                first_ids.setdefault(h, f"claim_{position}")
         
-        # Step 4: Calculate overall risk
-        risk_assessment = self.risk_scorer.calculate_risk(
-            verified_claims, 
-            verified_citations
-        )
+        verified = []
+        for position, h in enumerate(hashes):
+            if entries[h] is None:
+                continue
+            result, representative = entries[h]
+            claim_id = f"claim_{position}"
+            result = dict(result, id=claim_id, text=sentences[position].strip())
+            result.pop('duplicate_of', None)
+            
+            target = first_ids.get(representative)
+            if target is not None and target != claim_id:
+                result['duplicate_of'] = target
+            verified.append(result)
+        return verified
+    
+    async def _extract(self, extraction, budget: Optional[Deadline]):
+        """Await an extraction step within the extraction budget; None if it overran"""
+        if budget is None:
+            return await extraction
+        try:
+            return await asyncio.wait_for(extraction, budget.remaining('extraction'))
+        except asyncio.TimeoutError:
+            return None
+    
+    def _deadline_metadata(self,
+                           budget: Deadline,
+                           verified_claims: List[Dict],
+                           verified_citations: List[Dict],
+                           partial_extraction: bool = False) -> Dict:
+        return {
+            'seconds': budget.seconds,
+            'elapsed': round(budget.elapsed(), 3),
+            'partial_extraction': partial_extraction,
+            'partial_claims': sum(1 for c in verified_claims if c.get('partial')),
+            'partial_citations': sum(1 for c in verified_citations if c.get('partial'))
+        }
+    
+    async def verify_stream(self,
+                            content: str,
+                            deadline: Optional[float] = None,
+                            timings: bool = False) -> AsyncIterator[Dict]:
+        """
+        Streaming variant of verify().
+        Yields an 'extracted' event as soon as extraction finishes, then a
+        'claim' or 'citation' event (with the running risk assessment) as
+        each one completes, and finally a 'summary' event shaped like the
+        verify() response. Claims are judged one by one here so each can be
+        emitted immediately; the verdict cache still applies.
+        `deadline` and `timings` work as in verify(): claims still running
+        when the reasoning budget runs out, and citations when the whole
+        deadline does, are emitted as partial results.
+        """
+        budget = Deadline(deadline) if deadline else None
+        
+        with metrics.request() as request_timings:
+            with metrics.span('extraction'):
+                claims = await self._extract(self.extraction.extract_claims(content), budget)
+                citations = await self._extract(self.extraction.extract_citations(content), budget)
+            partial_extraction = claims is None or citations is None
+            claims = claims if claims is not None else []
+            citations = citations if citations is not None else []
+            clusters = await self._cluster_claims(claims)
+            
+            yield {
+                'event': 'extracted',
+                'claims': [{'id': c['id'], 'text': c['text']} for c in claims],
+                'citations': citations
+            }
+            
+            # One verification per cluster of near-duplicate claims, reported for every member
+            tasks = {}
+            representatives = {}
+            for text, positions in clusters.items():
+                representatives[text] = dict(claims[positions[0]], text=text)
+                task = asyncio.create_task(
+                    self._in_document_order(positions[0], self._verify_single_claim(representatives[text]))
+                )
+                tasks[task] = ('claim', text)
+            
+            # One check per unique reference, reported for every occurrence
+            groups = self._group_citations(citations)
+            for key, positions in groups.items():
+                citation = citations[positions[0]]
+                task = asyncio.create_task(
+                    self._in_document_order(positions[0], self.citation_checker.check_citation(citation))
+                )
+                tasks[task] = ('citation', key)
+            
+            verified = {'claim': {}, 'citation': {}}
+            # Running risk, updated per result instead of recounted per event
+            risk = RiskAccumulator(self.risk_scorer)
+            pending = set(tasks)
+            stages = {'claim': 'reasoning', 'citation': 'citations'}
+            
+            try:
+                while pending:
+                    timeout = None
+                    if budget is not None:
+                        timeout = min(budget.remaining(stages[tasks[task][0]]) for task in pending)
+                    done, pending = await asyncio.wait(
+                        pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    
+                    # Work past its stage's deadline is cut off and reported as partial
+                    overdue = set()
+                    if budget is not None:
+                        overdue = {task for task in pending if budget.remaining(stages[tasks[task][0]]) <= 0}
+                        for task in overdue:
+                            task.cancel()
+                        pending -= overdue
+                    
+                    for task in list(done) + list(overdue):
+                        kind, ref = tasks[task]
+                        if kind == 'claim':
+                            result = (
+                                self._partial_claim_result(representatives[ref], 'reasoning')
+                                if task in overdue else task.result()
+                            )
+                            outcomes = [
+                                (position, self._spread(result, claims[position], representatives[ref]))
+                                for position in clusters[ref]
+                            ]
+                        else:
+                            result = (
+                                self._partial_citation_result(citations[groups[ref][0]])
+                                if task in overdue else task.result()
+                            )
+                            outcomes = [
+                                (position, self._fan_out(result, citations[position], ref, len(groups[ref])))
+                                for position in groups[ref]
+                            ]
+                        
+                        for position, result in outcomes:
+                            verified[kind][position] = result
+                            if kind == 'claim':
+                                risk.add_claim(result)
+                            else:
+                                risk.add_citation(result)
+                            
+                            yield {
+                                'event': kind,
+                                'result': result,
+                                'risk_assessment': risk.assessment()
+                            }
+            finally:
+                # Client went away or a check failed: stop the remaining work
+                for task in pending:
+                    task.cancel()
+            
+            verified_claims = [verified['claim'][i] for i in range(len(claims))]
+            verified_citations = [verified['citation'][i] for i in range(len(citations))]
+            report = self._build_report(
+                claims,
+                citations,
+                verified_claims,
+                verified_citations,
+                risk_assessment=risk.assessment()
+            )
+        
+        if timings:
+            report['timings'] = request_timings.summary()
+        if budget is not None:
+            report['metadata']['deadline'] = self._deadline_metadata(
+                budget, verified_claims, verified_citations, partial_extraction
+            )
+        yield {'event': 'summary', **report}
+    
+    def _build_report(self,
+                      claims: List[Dict],
+                      citations: List[Dict],
+                      verified_claims: List[Dict],
+                      verified_citations: List[Dict],
+                      risk_assessment: Optional[Dict] = None) -> Dict:
+        """Assemble the verification response, including the overall risk"""
+        if risk_assessment is None:
+            risk_assessment = self.risk_scorer.calculate_risk(
+                verified_claims, 
+                verified_citations
+            )
 
         return {
             'claims': verified_claims,
@@ -47,85 +446,322 @@ class VerificationAgent:
             'risk_assessment': risk_assessment,
             'metadata': {
                 'total_claims': len(claims),
+                'distinct_claims': sum(1 for c in verified_claims if 'duplicate_of' not in c),
                 'total_citations': len(citations),
+                'unique_citations': len({c['reference'] for c in verified_citations}),
                 'processed_at': self._get_timestamp()
             }
         }
     
-    async def _verify_claims_parallel(self, claims: List[Dict]) -> List[Dict]:
-        """Verify all claims in parallel"""
-        tasks = []
+    async def _verify_claims_parallel(self,
+                                      claims: List[Dict],
+                                      deadline: Optional[Deadline] = None) -> List[Dict]:
+        """
+        Verify one representative of each cluster of near-duplicate claims
+        and share its verdict with the other members, in document order.
+        """
+        clusters = await self._cluster_claims(claims)
+        representatives = [
+            dict(claims[positions[0]], text=text) for text, positions in clusters.items()
+        ]
+        results = await self._verify_distinct_claims(representatives, deadline)
+        
+        verified = [None] * len(claims)
+        for representative, positions, result in zip(representatives, clusters.values(), results):
+            for position in positions:
+                verified[position] = self._spread(result, claims[position], representative)
         
-        for claim in claims:
-            task = self._verify_single_claim(claim)
-            tasks.append(task)
+        return verified
+    
+    async def _cluster_claims(self, claims: List[Dict]) -> Dict[str, List[int]]:
+        """
+        Positions of the claims in each cluster, keyed by the wording the
+        cluster is verified as (first seen first). With clustering disabled
+        only identical sentences share a verdict.
+        """
+        texts = [claim['text'] for claim in claims]
+        if config.CLAIM_CLUSTERING_ENABLED and claims:
+            with metrics.span('clustering'):
+                texts = await asyncio.to_thread(
+                    self.claim_index.canonicalize,
+                    texts,
+                    [[entity for entity, _ in claim.get('entities', [])] for claim in claims]
+                )
+        
+        clusters: Dict[str, List[int]] = {}
+        for position, text in enumerate(texts):
+            clusters.setdefault(text, []).append(position)
+        return clusters
+    
+    def _spread(self, result: Dict, claim: Dict, representative: Dict) -> Dict:
+        """Copy a cluster representative's verdict onto one of its members"""
+        result = dict(result)
+        result['id'] = claim['id']
+        result['text'] = claim['text']
+        if claim['id'] != representative['id']:
+            result['duplicate_of'] = representative['id']
+        if claim['text'] != representative['text']:
+            result['verified_text'] = representative['text']
+        return result
+    
+    async def _verify_distinct_claims(self,
+                                      claims: List[Dict],
+                                      deadline: Optional[Deadline] = None) -> List[Dict]:
+        """
+        Verify all claims in parallel.
+        Provider calls are bounded by the shared scheduler, which serves
+        earlier claims first when a provider is saturated.
+        """
+        if not config.LLM_BATCH_JUDGING:
+            results = await self._within(
+                [
+                    self._in_document_order(position, self._verify_single_claim(claim))
+                    for position, claim in enumerate(claims)
+                ],
+                deadline.remaining('reasoning') if deadline else None
+            )
+            return [
+                result if result is not None else self._partial_claim_result(claim, 'reasoning')
+                for claim, result in zip(claims, results)
+            ]
+        
+        # Retrieve evidence for every claim, then judge them together
+        retrieved = await self._within(
+            [
+                self._in_document_order(position, self._retrieve_evidence(claim['text'], claim['id']))
+                for position, claim in enumerate(claims)
+            ],
+            deadline.remaining('retrieval') if deadline else None
+        )
+        
+        judged = [
+            (claim, outcome[0])
+            for claim, outcome in zip(claims, retrieved)
+            if outcome and outcome[0]
+        ]
+        verdicts = iter(await self._judge(
+            [(claim['text'], self._evidence_snippets(evidence)) for claim, evidence in judged],
+            deadline.remaining('reasoning') if deadline else None,
+            claim_ids=[claim['id'] for claim, _ in judged]
+        ))
+        
+        results = []
+        for claim, outcome in zip(claims, retrieved):
+            if outcome is None:
+                results.append(self._partial_claim_result(claim, 'retrieval'))
+                continue
+            
+            evidence, providers = outcome
+            verdict = next(verdicts) if evidence else None
+            if evidence and verdict is None:
+                results.append(self._partial_claim_result(claim, 'reasoning', providers))
+            else:
+                results.append(self._build_claim_result(claim, evidence, providers, verdict))
         
-        results = await asyncio.gather(*tasks)
         return results
     
+    async def _within(self, coros: List, timeout: Optional[float]) -> List:
+        """
+        Run coroutines concurrently; those not done within `timeout` seconds
+        are cancelled and reported as None.
+        """
+        if not coros:
+            return []
+        
+        tasks = [asyncio.ensure_future(coro) for coro in coros]
+        _, pending = await asyncio.wait(tasks, timeout=timeout)
+        
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        
+        return [None if task in pending else task.result() for task in tasks]
+    
+    async def _in_document_order(self, position: int, coro):
+        """Run `coro` with its document position as scheduling priority"""
+        current_priority.set(position)
+        return await coro
+    
     async def _verify_single_claim(self, claim: Dict) -> Dict:
         """Verify a single claim"""
         claim_text = claim['text']
         
         # Retrieve evidence
-        evidence = await self._retrieve_evidence(claim_text)
+        evidence, providers = await self._retrieve_evidence(claim_text, claim['id'])
         
         if not evidence:
+            return self._build_claim_result(claim, evidence, providers, None)
+        
+        # Judge the claim
+        reasoning = (await self._judge(
+            [(claim_text, self._evidence_snippets(evidence))], claim_ids=[claim['id']]
+        ))[0]
+        
+        return self._build_claim_result(claim, evidence, providers, reasoning)
+    
+    async def _judge(self,
+                     items: List[Tuple[str, List[str]]],
+                     timeout: Optional[float] = None,
+                     claim_ids: Optional[List[str]] = None) -> List[Optional[Dict]]:
+        """
+        Judge (claim, evidence_snippets) items.
+        The local NLI stage settles clear-cut claims; only the ambiguous
+        ones are escalated to the LLM. Items the LLM has not judged within
+        `timeout` seconds come back as None.
+        `claim_ids` (parallel to `items`) attribute the time to each claim.
+        """
+        claim_ids = claim_ids or [None] * len(items)
+        with metrics.span('nli', claims=filter(None, claim_ids)):
+            verdicts = await self.nli.prefilter(items)
+        escalate = [i for i, verdict in enumerate(verdicts) if verdict is None]
+        
+        if escalate:
+            escalated = [items[i] for i in escalate]
+            if config.LLM_BATCH_JUDGING:
+                judging = self.reasoner.judge_claims_batch(escalated)
+            else:
+                judging = asyncio.gather(*(
+                    self.reasoner.judge_claim(claim, snippets) for claim, snippets in escalated
+                ))
+            
+            with metrics.span('reasoning', claims=filter(None, (claim_ids[i] for i in escalate))):
+                try:
+                    llm_verdicts = await asyncio.wait_for(judging, timeout)
+                except asyncio.TimeoutError:
+                    # Batches that did finish are already in the verdict cache
+                    llm_verdicts = [
+                        await self.reasoner.cached_verdict(claim, snippets)
+                        for claim, snippets in escalated
+                    ]
+            
+            for i, verdict in zip(escalate, llm_verdicts):
+                verdicts[i] = verdict
+        
+        return verdicts
+    
+    def _evidence_snippets(self, evidence: List[Dict]) -> List[str]:
+        return [e.get('snippet') or e.get('title', '') for e in evidence]
+    
+    def _build_claim_result(self,
+                            claim: Dict,
+                            evidence: List[Dict],
+                            providers: Dict[str, str],
+                            reasoning: Optional[Dict]) -> Dict:
+        """Shape a claim verdict for the API response"""
+        if reasoning is None:
             return {
                 'id': claim['id'],
-                'text': claim_text,
+                'text': claim['text'],
                 'status': 'UNVERIFIABLE',
                 'confidence': 0.0,
                 'evidence': [],
                 'explanation': 'No evidence found',
+                'providers': providers,
                 'risk_flag': '🟠 Unverifiable'
             }
         
-        # Judge the claim
-        reasoning = await self.reasoner.judge_claim(
-            claim_text,
-            [e.get('snippet') or e.get('title', '') for e in evidence]
-        )
-        
         return {
             'id': claim['id'],
-            'text': claim_text,
+            'text': claim['text'],
             'status': reasoning.get('status', 'UNVERIFIABLE'),
             'confidence': reasoning.get('confidence', 0.0),
             'explanation': reasoning.get('explanation', ''),
             'best_evidence': reasoning.get('best_evidence', ''),
             'evidence_sources': [e.get('source', 'unknown') for e in evidence],
+            'providers': providers,
+            'judged_by': reasoning.get('judged_by', 'llm'),
             'risk_flag': self._get_risk_flag(reasoning.get('status', 'UNVERIFIABLE'))
         }
     
-    async def _retrieve_evidence(self, claim: str) -> List[Dict]:
-        """Retrieve evidence for a claim"""
-        evidence = []
-        
+    def _partial_claim_result(self,
+                              claim: Dict,
+                              stage: str,
+                              providers: Optional[Dict[str, str]] = None) -> Dict:
+        """Result for a claim cut off by the request deadline"""
+        return {
+            'id': claim['id'],
+            'text': claim['text'],
+            'status': 'UNVERIFIABLE',
+            'confidence': 0.0,
+            'evidence': [],
+            'explanation': f'Not verified: the {stage} deadline was reached',
+            'providers': providers or {},
+            'partial': True,
+            'risk_flag': self._get_risk_flag('UNVERIFIABLE')
+        }
+    
+    async def _retrieve_evidence(self,
+                                 claim: str,
+                                 claim_id: Optional[str] = None) -> Tuple[List[Dict], Dict[str, str]]:
+        """
+        Retrieve evidence for a claim from all providers concurrently.
+        Returns (evidence, provider outcomes).
+        """
         try:
-            # Search web
-            web_results = await self.retriever.search_web(claim, num_results=2)
-            evidence.extend(web_results)
-            
-            # Search papers
-            paper_results = await self.retriever.search_papers(claim, num_results=2)
-            evidence.extend(paper_results)
-        
+            with metrics.span('retrieval', claims=[claim_id] if claim_id else ()):
+                return await self.retriever.gather_evidence(
+                    claim, limit=config.MAX_EVIDENCE_PER_CLAIM
+                )
         except Exception as e:
             print(f"Evidence retrieval error: {e}")
-        
-        return evidence[:config.MAX_EVIDENCE_PER_CLAIM]
+            return [], {}
     
-    async def _check_citations_parallel(self, citations: List[Dict]) -> List[Dict]:
-        """Check all citations in parallel"""
-        tasks = []
+    async def _check_citations_parallel(self,
+                                        citations: List[Dict],
+                                        deadline: Optional[Deadline] = None) -> List[Dict]:
+        """
+        Check each unique reference once (in parallel) and fan the result
+        back out to every occurrence, in document order.
+        """
+        groups = self._group_citations(citations)
         
-        for citation in citations:
-            task = self.citation_checker.check_citation(citation)
-            tasks.append(task)
+        with metrics.span('citations'):
+            results = await self._within(
+                [
+                    self._in_document_order(
+                        positions[0], self.citation_checker.check_citation(citations[positions[0]])
+                    )
+                    for positions in groups.values()
+                ],
+                deadline.remaining('citations') if deadline else None
+            )
         
-        results = await asyncio.gather(*tasks)
-        return results
+        verified = [None] * len(citations)
+        for (key, positions), result in zip(groups.items(), results):
+            if result is None:
+                result = self._partial_citation_result(citations[positions[0]])
+            for position in positions:
+                verified[position] = self._fan_out(result, citations[position], key, len(positions))
+        
+        return verified
+    
+    def _partial_citation_result(self, citation: Dict) -> Dict:
+        """Result for a citation cut off by the request deadline"""
+        return {
+            'citation': citation['text'],
+            'status': 'UNKNOWN',
+            'issues': ['Not checked: the citations deadline was reached'],
+            'partial': True
+        }
+    
+    def _group_citations(self, citations: List[Dict]) -> Dict[str, List[int]]:
+        """Positions of every occurrence, keyed by canonical reference (first seen first)"""
+        groups: Dict[str, List[int]] = {}
+        for position, citation in enumerate(citations):
+            groups.setdefault(citation_key(citation), []).append(position)
+        return groups
+    
+    def _fan_out(self, result: Dict, citation: Dict, key: str, occurrences: int) -> Dict:
+        """Copy a reference's check result onto one of its occurrences"""
+        result = dict(result)
+        result['citation'] = citation['text']
+        result['reference'] = key
+        result['occurrences'] = occurrences
+        if 'start' in citation:
+            result['start'] = citation['start']
+            result['end'] = citation['end']
+        return result
     
     def _get_risk_flag(self, status: str) -> str:
         """Get visual risk flag for claim status"""
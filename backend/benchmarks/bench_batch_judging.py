@@ -0,0 +1,79 @@
+"""
+LLM calls and wall time for per-claim judging versus
+ReasoningAgent.judge_claims_batch, on a fake Gemini backend.
+The last run repeats the batch against a warm verdict cache.
+
+Run from backend/:
+    python -m benchmarks.bench_batch_judging --claims 200
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from agents.reasoning_agent import ReasoningAgent
+from benchmarks.fakes import FakeGenAIClient
+from utils.cache import TwoTierCache
+from utils.scheduler import ProviderScheduler
+
+
+def _items(count: int):
+    return [
+        (f"Claim number {i} states that a measurable fact holds for sample {i}.",
+         [f"Evidence snippet {j} for claim {i}. " * 6 for j in range(3)])
+        for i in range(count)
+    ]
+
+
+def _memory_cache(enabled: bool) -> TwoTierCache:
+    return TwoTierCache('verdicts', None, ttl=3600, stale_ttl=0,
+                        max_entries=100000, max_disk_entries=0, enabled=enabled)
+
+
+async def _run(mode: str, items, latency: float, max_parseable_batch: int,
+               verdicts: TwoTierCache):
+    client = FakeGenAIClient(latency=latency, max_parseable_batch=max_parseable_batch)
+    agent = ReasoningAgent(client=client, verdicts=verdicts)
+    # Measure call counts, not the production rate limit
+    agent.scheduler = ProviderScheduler({})
+
+    start = time.perf_counter()
+    if mode == "per_claim":
+        results = await asyncio.gather(*(agent.judge_claim(c, e) for c, e in items))
+    else:
+        results = await agent.judge_claims_batch(items)
+    elapsed = time.perf_counter() - start
+
+    assert len(results) == len(items)
+    return {
+        "llm_calls": client.calls,
+        "wall_s": round(elapsed, 3),
+        "supported": sum(1 for r in results if r["status"] == "SUPPORTED")
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--claims", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05, help="Fake LLM delay (s)")
+    parser.add_argument("--max-parseable-batch", type=int, default=None,
+                        help="Make larger batches return malformed JSON")
+    args = parser.parse_args()
+
+    items = _items(args.claims)
+    warm = _memory_cache(enabled=True)
+    report = {
+        "per_claim": asyncio.run(_run("per_claim", items, args.latency,
+                                      args.max_parseable_batch, _memory_cache(enabled=False))),
+        "batched": asyncio.run(_run("batched", items, args.latency,
+                                    args.max_parseable_batch, warm)),
+        "batched_cached": asyncio.run(_run("batched", items, args.latency,
+                                           args.max_parseable_batch, warm))
+    }
+    report["calls_saved"] = report["per_claim"]["llm_calls"] - report["batched"]["llm_calls"]
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
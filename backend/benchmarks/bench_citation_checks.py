@@ -0,0 +1,92 @@
+"""
+Provider requests and wall time for checking a reference-heavy paper:
+one check per citation occurrence versus one per unique reference
+(IEEE markers resolved against the bibliography), on the stub server.
+
+Run from backend/:
+    python -m benchmarks.bench_citation_checks --markers 200 --references 40
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from agents.citation_agent import CitationAgent
+from benchmarks.stub_server import StubServer
+from tools.doi_resolver import DOIResolver
+from tools.http_client import create_http_client
+from utils.cache import TwoTierCache
+from utils.citations import citation_key, resolve_references, scan_citations
+from utils.scheduler import ProviderScheduler
+
+
+def _paper(markers: int, references: int, base_url: str, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    body = " ".join(
+        f"Result {i} was reported earlier [{rng.randint(1, references)}]."
+        for i in range(markers)
+    )
+
+    entries = []
+    for n in range(1, references + 1):
+        if n % 3 == 0:
+            source = f"doi:10.1000/ref{n}"
+        elif n % 3 == 1:
+            source = f"Available: {base_url}/ref/{n}"
+        else:
+            source = "Journal of Results"
+        entries.append(f"[{n}] A. Author, \"Paper number {n},\" {source}, {2000 + n % 20}.")
+
+    return body + "\n\nReferences\n" + "\n".join(entries)
+
+
+async def _run(text: str, base_url: str, dedupe: bool):
+    async with create_http_client() as client:
+        # No DOI store: count what the dedup stage alone saves
+        resolver = DOIResolver(client=client, cache=TwoTierCache(
+            'doi', None, ttl=0, stale_ttl=0, max_entries=1, max_disk_entries=0, enabled=False
+        ))
+        resolver.crossref_url = base_url + "/works"
+        resolver.scheduler = ProviderScheduler({})
+        checker = CitationAgent(client=client, resolver=resolver)
+        checker.scheduler = ProviderScheduler({})
+
+        start = time.perf_counter()
+        citations = resolve_references(text, [c.to_dict() for c in scan_citations(text)])
+        if dedupe:
+            unique = {citation_key(c): c for c in reversed(citations)}
+            checks = list(unique.values())
+        else:
+            checks = citations
+        results = await asyncio.gather(*(checker.check_citation(c) for c in checks))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "citations": len(citations),
+        "checks": len(checks),
+        "valid": sum(1 for r in results if r["status"] == "VALID"),
+        "wall_s": round(elapsed, 3)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--markers", type=int, default=200)
+    parser.add_argument("--references", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.02, help="Stub provider delay (s)")
+    args = parser.parse_args()
+
+    report = {}
+    with StubServer(latency=args.latency) as stub:
+        text = _paper(args.markers, args.references, stub.base_url)
+        for mode, dedupe in (("per_occurrence", False), ("per_reference", True)):
+            before = stub.requests
+            report[mode] = asyncio.run(_run(text, stub.base_url, dedupe))
+            report[mode]["provider_requests"] = stub.requests - before
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
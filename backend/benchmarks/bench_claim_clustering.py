@@ -0,0 +1,102 @@
+"""
+Claim clustering: verifies batches of repetitive documents (a few facts,
+each restated in slightly different words) with near-duplicate
+clustering on and off, against one stub provider server and a fake
+Gemini client with caches disabled. Reports provider and LLM calls,
+claims actually verified, wall time, and the raw ClaimIndex throughput.
+
+Run from backend/ (needs en_core_web_sm and NLTK punkt):
+    python -m benchmarks.bench_claim_clustering --docs 5 --facts 20 --sentences 100
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from argparse import Namespace
+from contextlib import redirect_stdout
+from typing import Dict, List
+
+from benchmarks.bench_verify import PROVIDER_HOSTS, _build_agent
+from benchmarks.corpus import repetitive_document, synthetic_document
+from benchmarks.stub_server import StubServer
+from config import config
+from utils.claim_clustering import ClaimIndex
+
+
+async def _run_mode(stub: StubServer, documents: List[str], clustering: bool) -> Dict:
+    config.CLAIM_CLUSTERING_ENABLED = clustering
+    stubs = {name: stub for name in (*PROVIDER_HOSTS, "url_check")}
+    agent = _build_agent(stubs, Namespace(llm_latency=0.02, llm_error_rate=0.0, provider_limits=False))
+    try:
+        await agent.warm_up()
+        stub_requests = stub.requests
+
+        start = time.perf_counter()
+        reports = [await agent.verify(text) for text in documents]
+        wall = time.perf_counter() - start
+
+        return {
+            "claims": sum(r["metadata"]["total_claims"] for r in reports),
+            "verified_claims": sum(r["metadata"]["distinct_claims"] for r in reports),
+            "provider_requests": stub.requests - stub_requests,
+            "llm_calls": agent.reasoner.client.calls,
+            "wall_s": round(wall, 3)
+        }
+    finally:
+        await agent.aclose()
+        await agent.http_client.aclose()
+
+
+def _index_throughput(words: int) -> Dict:
+    """Sentences per second through ClaimIndex.canonicalize alone"""
+    from agents.extraction_agent import ExtractionAgent
+    texts = ExtractionAgent().split_sentences(synthetic_document(words, seed=3))
+    index = ClaimIndex()
+
+    start = time.perf_counter()
+    index.canonicalize(texts)
+    seconds = time.perf_counter() - start
+
+    return {"sentences": len(texts), "seconds": round(seconds, 3),
+            "sentences_per_sec": round(len(texts) / seconds), **index.stats()}
+
+
+async def _run(args) -> Dict:
+    documents = [repetitive_document(args.facts, args.sentences, seed=seed) for seed in range(args.docs)]
+    with StubServer(latency=args.latency) as stub:
+        report = {
+            "clustering_off": await _run_mode(stub, documents, False),
+            "clustering_on": await _run_mode(stub, documents, True)
+        }
+
+    off, on = report["clustering_off"], report["clustering_on"]
+    report["provider_request_reduction"] = round(1 - on["provider_requests"] / max(off["provider_requests"], 1), 3)
+    report["speedup"] = round(off["wall_s"] / on["wall_s"], 2)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=5, help="Documents, verified one after another")
+    parser.add_argument("--facts", type=int, default=20, help="Distinct facts per document")
+    parser.add_argument("--sentences", type=int, default=100, help="Sentences per document")
+    parser.add_argument("--latency", type=float, default=0.02, help="Stub provider delay (s)")
+    parser.add_argument("--index-words", type=int, default=100000, help="Words for the ClaimIndex throughput pass")
+    args = parser.parse_args()
+
+    config.EVIDENCE_CACHE_ENABLED = config.VERDICT_CACHE_ENABLED = config.DOI_CACHE_ENABLED = False
+    config.LOCAL_INDEX_ENABLED = False
+    # Tools print provider errors; keep stdout for the JSON report
+    with redirect_stdout(sys.stderr):
+        report = {
+            "docs": args.docs, "facts": args.facts, "sentences": args.sentences,
+            **asyncio.run(_run(args)),
+            "index": _index_throughput(args.index_words)
+        }
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
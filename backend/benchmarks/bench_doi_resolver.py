@@ -0,0 +1,79 @@
+"""
+CrossRef requests and wall time for resolving a paper's DOIs: one
+/works/{doi} GET per DOI versus DOIResolver's batched filter=doi:...
+lookups, then again from the local SQLite store in a fresh process state.
+
+Run from backend/:
+    python -m benchmarks.bench_doi_resolver --dois 400
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+from benchmarks.stub_server import StubServer
+from config import config
+from tools.doi_resolver import DOIResolver
+from tools.http_client import create_http_client
+from utils.cache import TwoTierCache
+from utils.scheduler import ProviderScheduler
+
+
+def _store(path: str) -> TwoTierCache:
+    return TwoTierCache('doi', path, ttl=config.DOI_REFRESH_INTERVAL,
+                        stale_ttl=config.DOI_CACHE_STALE_TTL, max_entries=100000,
+                        max_disk_entries=1000000)
+
+
+async def _per_doi(dois, base_url: str):
+    async with create_http_client() as client:
+        start = time.perf_counter()
+        responses = await asyncio.gather(*(client.get(f"{base_url}/works/{doi}") for doi in dois))
+        elapsed = time.perf_counter() - start
+    return {"found": sum(1 for r in responses if r.status_code == 200),
+            "wall_s": round(elapsed, 3)}
+
+
+async def _resolver(dois, base_url: str, path: str):
+    async with create_http_client() as client:
+        resolver = DOIResolver(client=client, cache=_store(path))
+        resolver.crossref_url = base_url + "/works"
+        # Measure request counts, not the production rate limit
+        resolver.scheduler = ProviderScheduler({})
+
+        start = time.perf_counter()
+        records = await asyncio.gather(*(resolver.resolve(doi) for doi in dois))
+        elapsed = time.perf_counter() - start
+        resolver.cache.close()
+
+    return {"found": sum(1 for r in records if r["found"]),
+            "wall_s": round(elapsed, 3)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dois", type=int, default=400)
+    parser.add_argument("--latency", type=float, default=0.05, help="Stub CrossRef delay (s)")
+    args = parser.parse_args()
+
+    # Every 10th DOI does not exist
+    dois = [f"10.1000/{'missing' if i % 10 == 0 else 'paper'}{i}" for i in range(args.dois)]
+
+    report = {}
+    with StubServer(latency=args.latency) as stub, tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "doi.sqlite3")
+        runs = (("per_doi", lambda: _per_doi(dois, stub.base_url)),
+                ("batched_cold", lambda: _resolver(dois, stub.base_url, path)),
+                ("batched_warm", lambda: _resolver(dois, stub.base_url, path)))
+        for mode, run in runs:
+            before = stub.requests
+            report[mode] = asyncio.run(run())
+            report[mode]["crossref_requests"] = stub.requests - before
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
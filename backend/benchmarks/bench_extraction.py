@@ -0,0 +1,63 @@
+"""
+Claim-extraction throughput (sentences/sec): the old per-sentence call
+through the full en_core_web_sm pipeline versus ExtractionAgent's
+batched nlp.pipe with unused components disabled.
+
+Run from backend/ (needs en_core_web_sm and NLTK punkt):
+    python -m benchmarks.bench_extraction --words 100000
+"""
+import argparse
+import json
+import time
+
+import spacy
+from nltk.tokenize import sent_tokenize
+
+from agents.extraction_agent import ExtractionAgent
+from benchmarks.corpus import synthetic_document
+
+
+def _legacy_extract(nlp, agent: ExtractionAgent, text: str) -> int:
+    claims = 0
+    for sentence in sent_tokenize(text):
+        doc = nlp(sentence)
+        if agent._is_factual_claim(sentence):
+            [(ent.text, ent.label_) for ent in doc.ents]
+            claims += 1
+    return claims
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--words", type=int, default=100000)
+    args = parser.parse_args()
+
+    text = synthetic_document(args.words)
+    sentences = len(sent_tokenize(text))
+    agent = ExtractionAgent()
+    full_pipeline = spacy.load("en_core_web_sm")
+
+    start = time.perf_counter()
+    legacy_claims = _legacy_extract(full_pipeline, agent, text)
+    legacy_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched_claims = len(agent.extract_claims(text))
+    batched_s = time.perf_counter() - start
+
+    assert legacy_claims == batched_claims
+
+    print(json.dumps({
+        "words": args.words,
+        "sentences": sentences,
+        "claims": batched_claims,
+        "per_sentence": {"seconds": round(legacy_s, 3),
+                         "sentences_per_sec": round(sentences / legacy_s, 1)},
+        "batched_pipe": {"seconds": round(batched_s, 3),
+                         "sentences_per_sec": round(sentences / batched_s, 1)},
+        "speedup": round(legacy_s / batched_s, 2)
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Claim-extraction throughput in one process versus the process-pool
+ExtractionExecutor, plus the worst event-loop stall seen meanwhile.
+
+Run from backend/ (needs en_core_web_sm and NLTK punkt):
+    python -m benchmarks.bench_extraction_pool --words 300000 --workers 4
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from agents.extraction_agent import ExtractionAgent
+from agents.extraction_executor import ExtractionExecutor
+from benchmarks.corpus import synthetic_document
+
+
+async def _max_loop_lag(stop: asyncio.Event, interval: float = 0.01) -> float:
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - start - interval)
+    return worst
+
+
+async def _measure(extract, text: str):
+    stop = asyncio.Event()
+    lag = asyncio.create_task(_max_loop_lag(stop))
+    await asyncio.sleep(0)  # Let the lag probe start ticking
+    start = time.perf_counter()
+    claims = await extract(text)
+    elapsed = time.perf_counter() - start
+    stop.set()
+    return claims, elapsed, await lag
+
+
+async def _run(text: str, workers: int):
+    agent = ExtractionAgent()
+    sentences = len(agent.split_sentences(text))
+
+    async def inline(doc):
+        return agent.extract_claims(doc)
+
+    executor = ExtractionExecutor(agent, workers=workers)
+    # Start the workers and load their models outside the timed run
+    await executor.extract_claims(synthetic_document(60000, seed=1))
+
+    report = {"sentences": sentences, "workers": workers}
+    baseline = None
+    for name, extract in (("single_process", inline), ("process_pool", executor.extract_claims)):
+        claims, elapsed, lag = await _measure(extract, text)
+        baseline = baseline or claims
+        assert [c["id"] for c in claims] == [c["id"] for c in baseline]
+        report[name] = {
+            "seconds": round(elapsed, 3),
+            "sentences_per_sec": round(sentences / elapsed, 1),
+            "max_loop_stall_ms": round(lag * 1000, 1)
+        }
+
+    executor.shutdown()
+    report["speedup"] = round(report["single_process"]["seconds"] / report["process_pool"]["seconds"], 2)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--words", type=int, default=300000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    report = asyncio.run(_run(synthetic_document(args.words), args.workers))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Per-request latency percentiles for CrossRef searches against a stub
+with a slow tail, with and without hedged requests.
+
+Run from backend/:
+    python -m benchmarks.bench_hedging --requests 400 --tail-rate 0.02
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.stub_server import StubServer
+from tools.http_client import create_http_client
+from tools.retrieval_tools import RetrievalTools
+from utils.hedging import Hedger
+from utils.scheduler import ProviderScheduler
+
+
+def _percentiles(samples):
+    ordered = sorted(samples)
+    pick = lambda pct: round(ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))] * 1000, 1)
+    return {"p50_ms": pick(50), "p95_ms": pick(95), "p99_ms": pick(99), "max_ms": pick(100)}
+
+
+async def _run(base_url: str, requests: int, hedged: bool, concurrency: int):
+    async with create_http_client() as client:
+        tools = RetrievalTools(client=client)
+        tools.crossref_url = base_url + "/works"
+        tools.scheduler = ProviderScheduler({})
+        tools.hedger = Hedger(providers=['crossref'] if hedged else [])
+
+        latencies = []
+        gate = asyncio.Semaphore(concurrency)
+
+        async def one(i: int):
+            async with gate:
+                start = time.perf_counter()
+                # Call the fetch directly: no cache, no breaker
+                await tools._fetch_crossref(f"query {i}", 2)
+                latencies.append(time.perf_counter() - start)
+
+        await asyncio.gather(*(one(i) for i in range(requests)))
+
+    return {**_percentiles(latencies), **tools.hedger.stats().get("crossref", {})}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.02, help="Typical stub delay (s)")
+    parser.add_argument("--tail-latency", type=float, default=1.0, help="Slow-tail stub delay (s)")
+    parser.add_argument("--tail-rate", type=float, default=0.02, help="Share of slow responses")
+    args = parser.parse_args()
+
+    report = {}
+    with StubServer(args.latency, args.tail_latency, args.tail_rate) as stub:
+        for mode, hedged in (("unhedged", False), ("hedged", True)):
+            before = stub.requests
+            report[mode] = asyncio.run(_run(stub.base_url, args.requests, hedged, args.concurrency))
+            report[mode]["stub_requests"] = stub.requests - before
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Per-request latency of a fresh httpx.AsyncClient per call (the old
+behaviour) versus the shared pooled client from tools/http_client.py.
+
+Run from backend/:
+    python -m benchmarks.bench_http_client --requests 500 --concurrency 20
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import List
+
+import httpx
+
+from benchmarks.stub_server import StubServer
+from tools.http_client import create_http_client
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+async def _run(url: str, total: int, concurrency: int, pooled: bool) -> List[float]:
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+    shared = create_http_client() if pooled else None
+
+    async def one(i: int):
+        async with semaphore:
+            start = time.perf_counter()
+            if pooled:
+                response = await shared.get(url, params={"query": f"claim {i}"})
+            else:
+                async with httpx.AsyncClient(timeout=15) as client:
+                    response = await client.get(url, params={"query": f"claim {i}"})
+            response.json()
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    try:
+        await asyncio.gather(*(one(i) for i in range(total)))
+    finally:
+        if shared:
+            await shared.aclose()
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.0, help="Stub server delay (s)")
+    args = parser.parse_args()
+
+    report = {}
+    with StubServer(latency=args.latency) as stub:
+        url = f"{stub.base_url}/works"
+        for name, pooled in (("fresh_client", False), ("pooled_client", True)):
+            wall = time.perf_counter()
+            samples = asyncio.run(_run(url, args.requests, args.concurrency, pooled))
+            report[name] = {
+                "requests": len(samples),
+                "p50_ms": round(statistics.median(samples), 2),
+                "p95_ms": round(percentile(samples, 95), 2),
+                "wall_s": round(time.perf_counter() - wall, 3)
+            }
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
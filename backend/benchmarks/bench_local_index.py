@@ -0,0 +1,93 @@
+"""
+Local evidence index: build throughput, on-disk size, and search latency
+(cold first query after opening, then warm percentiles) for a synthetic
+corpus of paper-like abstracts, a few of which state the benchmark facts.
+
+Run from backend/:
+    python -m benchmarks.bench_local_index --docs 200000
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from typing import Dict, Iterator, List
+
+from benchmarks.corpus import _PREDICATES, _SUBJECTS
+from tools.local_index import LocalIndex
+
+# Filler vocabulary; the common terms a MaxScore pass has to skip
+_WORDS = ("study analysis results data model observed sample measurement survey report "
+          "protein ocean climate energy tower history physics chemistry method review").split()
+
+
+def _percentiles(samples: List[float]) -> Dict:
+    ordered = sorted(samples)
+    pick = lambda pct: round(ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))] * 1000, 3)
+    return {"p50_ms": pick(50), "p95_ms": pick(95), "p99_ms": pick(99), "max_ms": pick(100)}
+
+
+def _abstracts(count: int, fact_rate: float, seed: int = 0) -> Iterator[Dict]:
+    rng = random.Random(seed)
+    for i in range(count):
+        words = " ".join(rng.choice(_WORDS) for _ in range(60))
+        if rng.random() < fact_rate:
+            words += f". {rng.choice(_SUBJECTS)} {rng.choice(_PREDICATES)}."
+        yield {"title": f"Paper {i}", "text": words, "url": f"https://doi.org/10.1000/bench{i}"}
+
+
+def _size_mb(path: str) -> float:
+    total = sum(os.path.getsize(os.path.join(root, name)) for root, _, files in os.walk(path) for name in files)
+    return round(total / 1024 / 1024, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=100000, help="Abstracts to index")
+    parser.add_argument("--fact-rate", type=float, default=0.02, help="Share of abstracts stating a fact")
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    queries = [f"{rng.choice(_SUBJECTS)} {rng.choice(_PREDICATES)}." for _ in range(args.queries)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        LocalIndex(tmp).rebuild(_abstracts(args.docs, args.fact_rate))
+        build = time.perf_counter() - start
+
+        index = LocalIndex(tmp)
+        start = time.perf_counter()
+        index.load()
+        load = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index.search(queries[0])
+        cold = time.perf_counter() - start
+
+        samples = []
+        hits = 0
+        for query in queries:
+            start = time.perf_counter()
+            results = index.search(query)
+            samples.append(time.perf_counter() - start)
+            hits += bool(results)
+
+        report = {
+            "docs": args.docs,
+            "build_s": round(build, 2),
+            "docs_per_sec": round(args.docs / build),
+            "index_mb": _size_mb(tmp),
+            "load_s": round(load, 3),
+            "cold_query_ms": round(cold * 1000, 3),
+            "warm_query": _percentiles(samples),
+            "queries_with_hits": hits,
+            **index.stats()
+        }
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
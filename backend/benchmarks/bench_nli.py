@@ -0,0 +1,79 @@
+"""
+NLI pre-filter throughput (pairs/sec) and escalation rate (share of
+claims still sent to the LLM) for one or more NLI models.
+
+Run from backend/ (needs transformers + torch):
+    python -m benchmarks.bench_nli --claims 200 \
+        --models cross-encoder/nli-deberta-v3-xsmall microsoft/deberta-large-mnli
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from agents.nli_agent import NLIAgent
+from config import config
+
+_FACTS = [
+    ("The Eiffel Tower was completed in {}.", 1889, "Construction of the Eiffel Tower finished in {}."),
+    ("Water boils at {} degrees Celsius at sea level.", 100, "At sea level, water reaches its boiling point at {} degrees Celsius."),
+    ("Mount Everest is {} metres tall.", 8849, "The summit of Mount Everest stands {} metres above sea level."),
+    ("Marie Curie won {} Nobel Prizes.", 2, "Marie Curie was awarded {} Nobel Prizes during her career.")
+]
+
+
+def _items(count: int, seed: int = 0):
+    """One third supported, one third contradicted, one third unrelated evidence"""
+    rng = random.Random(seed)
+    items = []
+    for i in range(count):
+        claim_tpl, value, evidence_tpl = rng.choice(_FACTS)
+        kind = i % 3
+        claim = claim_tpl.format(value if kind != 1 else value + rng.randint(1, 50))
+        if kind == 2:
+            evidence = ["The city council approved a new budget for public parks."]
+        else:
+            evidence = [evidence_tpl.format(value), "An unrelated sentence about the weather."]
+        items.append((claim, evidence))
+    return items
+
+
+async def _run(model: str, items):
+    agent = NLIAgent(model_name=model)
+    await agent.prefilter(items[:1])  # Load the model outside the timed run
+    if not agent.enabled:
+        return {"error": "model could not be loaded (is transformers installed?)"}
+
+    pairs = sum(len(evidence) for _, evidence in items)
+    start = time.perf_counter()
+    verdicts = await agent.prefilter(items)
+    elapsed = time.perf_counter() - start
+
+    escalated = sum(1 for v in verdicts if v is None)
+    return {
+        "pairs": pairs,
+        "seconds": round(elapsed, 3),
+        "pairs_per_sec": round(pairs / elapsed, 1),
+        "escalation_rate": round(escalated / len(items), 3),
+        "settled_supported": sum(1 for v in verdicts if v and v["status"] == "SUPPORTED"),
+        "settled_contradicted": sum(1 for v in verdicts if v and v["status"] == "CONTRADICTED")
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--claims", type=int, default=200)
+    parser.add_argument("--models", nargs="+", default=[config.NLI_MODEL])
+    args = parser.parse_args()
+
+    items = _items(args.claims)
+    report = {
+        "threshold": config.NLI_THRESHOLD,
+        "models": {model: asyncio.run(_run(model, items)) for model in args.models}
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Document sessions: re-verifying an edited report from scratch with
+verify() versus as a new session revision, after a one-sentence edit.
+Stub providers (one server) and a fake Gemini client; evidence and
+verdict caches are off, so reuse comes from the session alone.
+
+Run from backend/ (needs en_core_web_sm and NLTK punkt):
+    python -m benchmarks.bench_sessions --sentences 200
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from argparse import Namespace
+from contextlib import redirect_stdout
+from typing import Dict
+
+from agents.verification_agent import VerificationAgent
+from benchmarks.bench_verify import PROVIDER_HOSTS, _build_agent
+from benchmarks.corpus import _PREDICATES, _SUBJECTS
+from benchmarks.stub_server import StubServer
+from config import config
+from utils.document_sessions import DocumentSession
+
+
+def _report(sentences: int, seed: int = 0) -> list:
+    """Distinct claim sentences, so every one costs a verification"""
+    rng = random.Random(seed)
+    return [
+        f"{rng.choice(_SUBJECTS)} {rng.choice(_PREDICATES)} in study {i} of {rng.randint(1900, 2020)}."
+        for i in range(sentences)
+    ]
+
+
+async def _measure(stub: StubServer, agent: VerificationAgent, verify) -> Dict:
+    requests, calls = stub.requests, agent.reasoner.client.calls
+    start = time.perf_counter()
+    report = await verify()
+    return {
+        "wall_s": round(time.perf_counter() - start, 3),
+        "provider_requests": stub.requests - requests,
+        "llm_calls": agent.reasoner.client.calls - calls,
+        "risk_score": report["risk_assessment"]["risk_score"]
+    }
+
+
+async def _run(args) -> Dict:
+    sentences = _report(args.sentences)
+    original = " ".join(sentences)
+    edited_sentences = list(sentences)
+    edited_sentences[len(sentences) // 2] = "The Moon orbits the Earth every 27.3 days in study edit."
+    edited = " ".join(edited_sentences)
+
+    with StubServer(latency=args.latency) as stub:
+        stubs = {name: stub for name in (*PROVIDER_HOSTS, "url_check")}
+        agent = _build_agent(stubs, Namespace(llm_latency=0.02, llm_error_rate=0.0, provider_limits=False))
+        try:
+            await agent.warm_up()
+            session = DocumentSession()
+            first = await _measure(stub, agent, lambda: agent.verify_revision(session, original))
+            full = await _measure(stub, agent, lambda: agent.verify(edited))
+            revision = await _measure(stub, agent, lambda: agent.verify_revision(session, edited))
+        finally:
+            await agent.aclose()
+            await agent.http_client.aclose()
+
+    return {
+        "sentences": args.sentences,
+        "first_revision": first,
+        "edited_full_verify": full,
+        "edited_revision": revision,
+        "speedup": round(full["wall_s"] / revision["wall_s"], 1)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sentences", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.02, help="Stub provider delay (s)")
+    args = parser.parse_args()
+
+    config.EVIDENCE_CACHE_ENABLED = config.VERDICT_CACHE_ENABLED = config.DOI_CACHE_ENABLED = False
+    config.LOCAL_INDEX_ENABLED = False
+    # Keep every sentence its own claim cluster
+    config.CLAIM_CLUSTERING_ENABLED = False
+    with redirect_stdout(sys.stderr):
+        report = asyncio.run(_run(args))
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+In-flight coalescing: a burst of concurrent /api/verify-style requests
+that share their claims and citations (`--distinct` different documents
+spread over `--concurrency` requests), verified with singleflight on and
+off against one stub provider server and a fake Gemini client, caches
+disabled. Reports provider and LLM calls, wall time and coalescing counts.
+
+Run from backend/ (needs en_core_web_sm and NLTK punkt):
+    python -m benchmarks.bench_singleflight --concurrency 16 --distinct 2
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from argparse import Namespace
+from contextlib import redirect_stdout
+from typing import Dict, List
+
+from benchmarks.bench_verify import PROVIDER_HOSTS, _build_agent
+from benchmarks.corpus import synthetic_document
+from benchmarks.stub_server import StubServer
+from config import config
+from utils.singleflight import SingleFlight
+
+_CITATIONS = " See doi:10.1000/xyz123, https://example.org/report and Smith et al. (2020)."
+
+
+def _use_flights(agent, singleflight: SingleFlight):
+    for component in (agent.retriever, agent.citation_checker, agent.reasoner):
+        component.flights = singleflight
+
+
+async def _run_mode(stub: StubServer, documents: List[str], enabled: bool) -> Dict:
+    stubs = {name: stub for name in (*PROVIDER_HOSTS, "url_check")}
+    agent = _build_agent(stubs, Namespace(llm_latency=0.05, llm_error_rate=0.0, provider_limits=False))
+    singleflight = SingleFlight(enabled=enabled)
+    _use_flights(agent, singleflight)
+    try:
+        await agent.warm_up()
+        stub_requests = stub.requests
+
+        start = time.perf_counter()
+        reports = await asyncio.gather(*(agent.verify(text) for text in documents))
+        wall = time.perf_counter() - start
+
+        return {
+            "claims": sum(r["metadata"]["total_claims"] for r in reports),
+            "provider_requests": stub.requests - stub_requests,
+            "llm_calls": agent.reasoner.client.calls,
+            "wall_s": round(wall, 3),
+            "coalescing": singleflight.stats()
+        }
+    finally:
+        await agent.aclose()
+        await agent.http_client.aclose()
+
+
+async def _run(args) -> Dict:
+    distinct = [synthetic_document(args.words, seed=seed) + _CITATIONS for seed in range(args.distinct)]
+    documents = [distinct[i % args.distinct] for i in range(args.concurrency)]
+    with StubServer(latency=args.latency) as stub:
+        report = {
+            "singleflight_off": await _run_mode(stub, documents, False),
+            "singleflight_on": await _run_mode(stub, documents, True)
+        }
+
+    off, on = report["singleflight_off"], report["singleflight_on"]
+    report["provider_request_reduction"] = round(1 - on["provider_requests"] / max(off["provider_requests"], 1), 3)
+    report["llm_call_reduction"] = round(1 - on["llm_calls"] / max(off["llm_calls"], 1), 3)
+    report["speedup"] = round(off["wall_s"] / on["wall_s"], 2)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=16, help="Requests verified at the same time")
+    parser.add_argument("--distinct", type=int, default=2, help="Different documents among them")
+    parser.add_argument("--words", type=int, default=150, help="Words per document")
+    parser.add_argument("--latency", type=float, default=0.05, help="Stub provider delay (s)")
+    args = parser.parse_args()
+
+    config.EVIDENCE_CACHE_ENABLED = config.VERDICT_CACHE_ENABLED = config.DOI_CACHE_ENABLED = False
+    config.LOCAL_INDEX_ENABLED = False
+    # Tools print provider errors; keep stdout for the JSON report
+    with redirect_stdout(sys.stderr):
+        report = {
+            "concurrency": args.concurrency, "distinct": args.distinct, "words": args.words,
+            **asyncio.run(_run(args))
+        }
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
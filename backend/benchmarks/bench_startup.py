@@ -0,0 +1,107 @@
+"""
+Cold-start timings of the API, each in a fresh interpreter:
+importing main, until /api/health/live answers, until /api/health/ready
+answers 200, and until the first /api/verify completes (stub providers,
+fake Gemini client). Compares background warm-up with loading on first use.
+
+Run from backend/ (needs en_core_web_sm and NLTK punkt):
+    python -m benchmarks.bench_startup --runs 3
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+TEXT = (
+    "The Eiffel Tower was completed in 1889 in Paris. "
+    "Water boils at 100 degrees Celsius at sea level. See doi:10.1000/startup."
+)
+
+
+def _child():
+    """One cold start; prints its timings as JSON"""
+    start = time.perf_counter()
+    import main
+    imported = time.perf_counter() - start
+
+    from fastapi.testclient import TestClient
+    from benchmarks.fakes import FakeGenAIClient
+    from benchmarks.stub_server import StubServer
+
+    with StubServer() as stub, TestClient(main.app) as client:
+        assert client.get('/api/health/live').status_code == 200
+        live = time.perf_counter() - start
+
+        while client.get('/api/health/ready').status_code != 200:
+            if main.startup['status'] == 'failed':
+                raise RuntimeError(main.startup['error'])
+            time.sleep(0.01)
+        ready = time.perf_counter() - start
+
+        retriever = main.agent.retriever
+        retriever.serpapi_url = stub.base_url + '/search'
+        retriever.crossref_url = stub.base_url + '/works'
+        retriever.semantic_scholar_url = stub.base_url + '/graph/v1'
+        main.agent.citation_checker.resolver.crossref_url = stub.base_url + '/works'
+        main.agent.reasoner.client = FakeGenAIClient()
+
+        first = time.perf_counter()
+        response = client.post('/api/verify', json={'text': TEXT})
+        assert response.status_code == 200, response.text
+        first_request = time.perf_counter() - first
+        done = time.perf_counter() - start
+
+    print(json.dumps({
+        'import_s': imported,
+        'live_s': live,
+        'ready_s': ready,
+        'first_request_s': first_request,
+        'first_response_s': done
+    }))
+
+
+def _cold_start(warm_up: bool) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(
+            os.environ,
+            WARM_UP_ON_STARTUP='1' if warm_up else '0',
+            GOOGLE_API_KEY=os.environ.get('GOOGLE_API_KEY') or 'bench-key',
+            EVIDENCE_CACHE_PATH=os.path.join(tmp, 'evidence.sqlite3'),
+            VERDICT_CACHE_PATH=os.path.join(tmp, 'verdicts.sqlite3'),
+            DOI_CACHE_PATH=os.path.join(tmp, 'doi.sqlite3'),
+            JOB_RESULTS_DIR=os.path.join(tmp, 'jobs')
+        )
+        out = subprocess.run(
+            [sys.executable, '-W', 'ignore', '-m', 'benchmarks.bench_startup', '--child'],
+            env=env, capture_output=True, text=True, check=True
+        ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child()
+        return
+
+    report = {"runs": args.runs}
+    for name, warm_up in (("warm_up_on_startup", True), ("load_on_first_use", False)):
+        runs = [_cold_start(warm_up) for _ in range(args.runs)]
+        report[name] = {
+            key: round(statistics.median(run[key] for run in runs), 3)
+            for key in runs[0]
+        }
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""
+End-to-end VerificationAgent.verify on synthetic documents from small to
+very large, fully offline: each provider (SerpAPI, CrossRef, Semantic
+Scholar, URL checks) is its own stub server and Gemini is a fake client,
+all with configurable latency and error rates. Reports throughput,
+latency percentiles per document (each stage's slowest span, as claims
+run concurrently) and per claim, from the request timings, plus
+provider calls and errors, LLM tokens and peak traced memory.
+Sizes above medium take minutes with the configured provider concurrency.
+
+Run from backend/ (needs en_core_web_sm and NLTK punkt):
+    python -m benchmarks.bench_verify --sizes small,medium --docs 3
+    python -m benchmarks.bench_verify --error-rate 0.05 --provider crossref:latency=0.3,error_rate=0.2
+Add --output benchmarks/results.jsonl to append the run to a history file.
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from typing import Dict, List
+
+import httpx
+
+from agents.verification_agent import VerificationAgent
+from benchmarks.corpus import SIZES, synthetic_document
+from benchmarks.fakes import FakeGenAIClient, StubRoutingTransport
+from benchmarks.stub_server import StubServer
+from config import config
+from utils.circuit_breaker import breakers
+from utils.scheduler import ProviderScheduler
+
+# Real host of each stubbed provider; URL checks go to the 'url_check' stub
+PROVIDER_HOSTS = {
+    "serpapi": "serpapi.com",
+    "crossref": "api.crossref.org",
+    "semantic_scholar": "api.semanticscholar.org"
+}
+STUB_SETTINGS = ("latency", "jitter", "tail_latency", "tail_rate", "error_rate", "error_status")
+
+
+def _percentiles(samples: List[float]) -> Dict:
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+    pick = lambda pct: round(ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))] * 1000, 1)
+    return {"p50_ms": pick(50), "p95_ms": pick(95), "p99_ms": pick(99), "max_ms": pick(100)}
+
+
+def _stub_profiles(args) -> Dict[str, Dict]:
+    """Per-provider stub settings: the global flags, then any --provider overrides"""
+    base = {name: getattr(args, name) for name in STUB_SETTINGS}
+    profiles = {name: dict(base) for name in (*PROVIDER_HOSTS, "url_check")}
+
+    for override in args.provider:
+        name, _, settings = override.partition(":")
+        if name not in profiles:
+            raise SystemExit(f"Unknown provider '{name}' (choose from {', '.join(profiles)})")
+        for setting in filter(None, settings.split(",")):
+            key, _, value = setting.partition("=")
+            if key not in STUB_SETTINGS:
+                raise SystemExit(f"Unknown stub setting '{key}' (choose from {', '.join(STUB_SETTINGS)})")
+            profiles[name][key] = int(value) if key == "error_status" else float(value)
+
+    return profiles
+
+
+def _build_agent(stubs: Dict[str, StubServer], args) -> VerificationAgent:
+    transport = StubRoutingTransport(
+        {host: stubs[name].base_url for name, host in PROVIDER_HOSTS.items()},
+        default=stubs["url_check"].base_url,
+        limits=httpx.Limits(max_connections=config.HTTP_MAX_CONNECTIONS,
+                            max_keepalive_connections=config.HTTP_MAX_KEEPALIVE_CONNECTIONS)
+    )
+    agent = VerificationAgent(http_client=httpx.AsyncClient(transport=transport, timeout=config.API_TIMEOUT))
+    agent.reasoner.client = FakeGenAIClient(
+        latency=args.llm_latency, jitter=args.llm_latency / 2, error_rate=args.llm_error_rate
+    )
+
+    if not args.provider_limits:
+        # Keep the concurrency caps but not the requests/sec quotas,
+        # which would dominate every run
+        scheduler = ProviderScheduler({
+            name: {'concurrency': spec['concurrency']}
+            for name, spec in config.PROVIDER_LIMITS.items()
+        })
+        for component in (agent.retriever, agent.citation_checker,
+                          agent.citation_checker.resolver, agent.reasoner):
+            component.scheduler = scheduler
+    return agent
+
+
+async def _run_size(agent: VerificationAgent, documents: List[str], concurrency: int) -> Dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    reports = []
+
+    async def one(text: str):
+        async with semaphore:
+            reports.append(await agent.verify(text, timings=True))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(text) for text in documents))
+    wall = time.perf_counter() - start
+
+    claims = sum(len(r["claims"]) for r in reports)
+    stages: Dict[str, List[float]] = {}
+    claim_stages: Dict[str, List[float]] = {}
+    providers: Dict[str, Dict] = {}
+    tokens = {"prompt": 0, "completion": 0}
+
+    for report in reports:
+        timings = report["timings"]
+        for stage, entry in timings["stages"].items():
+            stages.setdefault(stage, []).append(entry["max_s"])
+        for per_claim in timings["claims"].values():
+            for stage, seconds in per_claim.items():
+                claim_stages.setdefault(stage[:-len("_s")], []).append(seconds)
+        for provider, entry in timings["providers"].items():
+            totals = providers.setdefault(provider, {"calls": 0, "errors": 0})
+            totals["calls"] += entry["calls"]
+            totals["errors"] += entry["errors"]
+        for kind in tokens:
+            tokens[kind] += timings["llm_tokens"][kind]
+
+    return {
+        "docs": len(documents),
+        "claims": claims,
+        "citations": sum(len(r["citations"]) for r in reports),
+        "unverifiable_claims": sum(1 for r in reports for c in r["claims"] if c["status"] == "UNVERIFIABLE"),
+        "wall_s": round(wall, 3),
+        "docs_per_sec": round(len(documents) / wall, 2),
+        "claims_per_sec": round(claims / wall, 1),
+        "request": _percentiles([r["timings"]["total_s"] for r in reports]),
+        "stages": {stage: _percentiles(samples) for stage, samples in stages.items()},
+        "claim_stages": {stage: _percentiles(samples) for stage, samples in claim_stages.items()},
+        "providers": providers,
+        "llm_tokens": tokens
+    }
+
+
+async def _peak_memory(agent: VerificationAgent, text: str) -> float:
+    """Peak traced Python memory (MB) while verifying one document"""
+    tracemalloc.start()
+    await agent.verify(text)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return round(peak / 1024 / 1024, 1)
+
+
+async def _run(args) -> Dict:
+    profiles = _stub_profiles(args)
+    stubs = {name: StubServer(**profile, seed=i) for i, (name, profile) in enumerate(profiles.items())}
+    for stub in stubs.values():
+        stub.start()
+
+    report = {"stub_profiles": profiles, "llm": {"latency": args.llm_latency, "error_rate": args.llm_error_rate}}
+    try:
+        for size in args.sizes:
+            breakers.breakers.clear()
+            documents = [synthetic_document(SIZES[size], seed=seed) for seed in range(args.docs)]
+            agent = _build_agent(stubs, args)
+            try:
+                # Load spaCy/NLTK outside the timed run
+                await agent.warm_up()
+                result = {"words": SIZES[size], **await _run_size(agent, documents, args.concurrency)}
+                if args.memory:
+                    result["peak_traced_mb"] = await _peak_memory(agent, documents[0])
+                result["circuits_opened"] = sum(b.opened for b in breakers.breakers.values())
+                report[size] = result
+            finally:
+                await agent.aclose()
+                await agent.http_client.aclose()
+    finally:
+        for stub in stubs.values():
+            stub.stop()
+
+    report["stub_requests"] = {name: stub.requests for name, stub in stubs.items()}
+    report["max_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    return report
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=lambda v: v.split(","), default=["small", "medium"],
+                        help=f"Comma-separated document sizes: {', '.join(f'{k} ({v} words)' for k, v in SIZES.items())}")
+    parser.add_argument("--docs", type=int, default=3, help="Documents per size")
+    parser.add_argument("--concurrency", type=int, default=1, help="Documents verified at once")
+    parser.add_argument("--latency", type=float, default=0.02, help="Stub provider delay (s)")
+    parser.add_argument("--jitter", type=float, default=0.01, help="Extra uniform stub delay, up to (s)")
+    parser.add_argument("--tail-latency", type=float, default=0.5, help="Slow-tail stub delay (s)")
+    parser.add_argument("--tail-rate", type=float, default=0.0, help="Share of slow stub responses")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of failed stub responses")
+    parser.add_argument("--error-status", type=int, default=503, help="HTTP status of failed responses")
+    parser.add_argument("--provider", action="append", default=[], metavar="NAME:KEY=VALUE,...",
+                        help="Per-provider stub overrides, e.g. crossref:latency=0.2,error_rate=0.1")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Fake Gemini delay (s)")
+    parser.add_argument("--llm-error-rate", type=float, default=0.0, help="Share of failed Gemini calls")
+    parser.add_argument("--cache", action="store_true", help="Use (fresh) evidence/verdict/DOI caches")
+    parser.add_argument("--provider-limits", action="store_true",
+                        help="Also apply the requests/sec quotas in config.PROVIDER_LIMITS")
+    parser.add_argument("--local-index", metavar="PATH",
+                        help="Query this local evidence index before the stub providers")
+    parser.add_argument("--no-memory", dest="memory", action="store_false", help="Skip the tracemalloc pass")
+    parser.add_argument("--output", help="Append the run as one JSON line to this file")
+    args = parser.parse_args()
+
+    unknown = [size for size in args.sizes if size not in SIZES]
+    if unknown:
+        parser.error(f"unknown size(s): {', '.join(unknown)}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config.EVIDENCE_CACHE_ENABLED = config.VERDICT_CACHE_ENABLED = config.DOI_CACHE_ENABLED = args.cache
+        config.EVIDENCE_CACHE_PATH = os.path.join(tmp, "evidence.sqlite3")
+        config.VERDICT_CACHE_PATH = os.path.join(tmp, "verdicts.sqlite3")
+        config.DOI_CACHE_PATH = os.path.join(tmp, "doi.sqlite3")
+        config.LOCAL_INDEX_ENABLED = bool(args.local_index)
+        config.LOCAL_INDEX_PATH = args.local_index or config.LOCAL_INDEX_PATH
+        # Tools print provider errors; keep stdout for the JSON report
+        with redirect_stdout(sys.stderr):
+            results = asyncio.run(_run(args))
+
+    run = {
+        "benchmark": "bench_verify",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "git_revision": _git_revision(),
+        "args": vars(args),
+        "results": results
+    }
+    if args.output:
+        with open(args.output, "a", encoding="utf-8") as f:
+            f.write(json.dumps(run) + "\n")
+
+    print(json.dumps(run, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Deterministic synthetic documents for benchmarks.
+"""
+import random
+
+_SUBJECTS = [
+    "The Eiffel Tower", "Water", "The human genome", "Mount Everest",
+    "The Pacific Ocean", "Albert Einstein", "The speed of light",
+    "Photosynthesis", "The Great Wall of China", "Marie Curie"
+]
+_PREDICATES = [
+    "was completed in 1889", "boils at 100 degrees Celsius at sea level",
+    "contains about 3 billion base pairs", "is 8,849 metres tall",
+    "covers roughly a third of the Earth's surface",
+    "published the theory of general relativity in 1915",
+    "is about 299,792 kilometres per second",
+    "converts sunlight into chemical energy",
+    "stretches for thousands of kilometres", "won two Nobel Prizes"
+]
+# Named document sizes (words) for end-to-end benchmarks
+SIZES = {
+    "small": 200,
+    "medium": 2000,
+    "large": 20000,
+    "xlarge": 100000
+}
+
+_CITATIONS = [
+    "Smith et al. (2020)", "[1]", "[2]", "https://example.org/report.",
+    "doi:10.1000/xyz123", "Jones (2019)"
+]
+
+
+def synthetic_document(words: int, seed: int = 0, citation_rate: float = 0.2) -> str:
+    """Roughly `words` words of claim-like sentences with sprinkled citations"""
+    rng = random.Random(seed)
+    sentences = []
+    count = 0
+
+    while count < words:
+        sentence = f"{rng.choice(_SUBJECTS)} {rng.choice(_PREDICATES)}"
+        if rng.random() < citation_rate:
+            sentence += f" according to {rng.choice(_CITATIONS)}"
+        sentence += "."
+        if rng.random() < 0.05:
+            sentence = f"Is it true that {sentence[:-1].lower()}?"
+        sentences.append(sentence)
+        count += len(sentence.split())
+
+    return " ".join(sentences)
+
+
+# Light rewordings of a sentence, as generated text tends to restate a fact
+_REWORDINGS = [
+    "{s}", "Notably, {l}", "Indeed, {l}", "In fact, {l}", "Actually, {l}", "{s}, remarkably"
+]
+
+
+def repetitive_document(facts: int, sentences: int, seed: int = 0) -> str:
+    """`sentences` sentences restating `facts` distinct facts in slightly different words"""
+    rng = random.Random(seed)
+    pool = [f"{rng.choice(_SUBJECTS)} {rng.choice(_PREDICATES)}" for _ in range(facts)]
+
+    out = []
+    for _ in range(sentences):
+        fact = rng.choice(pool)
+        lowered = fact[0].lower() + fact[1:] if fact.startswith("The ") else fact
+        out.append(rng.choice(_REWORDINGS).format(s=fact, l=lowered) + ".")
+
+    return " ".join(out)
@@ -0,0 +1,92 @@
+"""
+Injected fake clients that stand in for remote providers in benchmarks.
+"""
+import json
+import random
+import re
+import threading
+import time
+from types import SimpleNamespace
+from typing import Dict
+
+import httpx
+
+
+class FakeGenAIClient:
+    """
+    Mimics `genai.Client().models.generate_content` and counts calls.
+    Batched prompts ("Claim 0:", "Claim 1:", ...) get a JSON array back;
+    single-claim prompts get a JSON object. Batches larger than
+    `max_parseable_batch` get an unparseable reply to exercise fallbacks.
+    Calls take `latency` plus up to `jitter` seconds; an `error_rate` share
+    raise like an unavailable model would.
+    """
+
+    def __init__(self,
+                 latency: float = 0.0,
+                 max_parseable_batch: int = None,
+                 jitter: float = 0.0,
+                 error_rate: float = 0.0,
+                 seed: int = 0):
+        self.latency = latency
+        self.max_parseable_batch = max_parseable_batch
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.calls = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.models = SimpleNamespace(generate_content=self.generate_content)
+
+    def generate_content(self, model: str, contents: str):
+        with self._lock:
+            self.calls += 1
+            delay = self.latency + self._rng.uniform(0, self.jitter)
+            fail = self._rng.random() < self.error_rate
+        time.sleep(delay)
+        if fail:
+            raise RuntimeError("503 UNAVAILABLE: injected failure")
+
+        verdict = {
+            "status": "SUPPORTED",
+            "confidence": 0.9,
+            "explanation": "Stub verdict",
+            "best_evidence_idx": 0
+        }
+
+        ids = [int(i) for i in re.findall(r"^Claim (\d+):", contents, re.MULTILINE)]
+        if not ids:
+            return self._response(contents, json.dumps(verdict))
+
+        if self.max_parseable_batch and len(ids) > self.max_parseable_batch:
+            return self._response(contents, "[{\"id\": 0, \"status\": ")
+
+        return self._response(contents, "```json\n" + json.dumps([dict(verdict, id=i) for i in ids]) + "\n```")
+
+    def _response(self, contents: str, text: str):
+        # usage_metadata as the SDK reports it, at about 4 characters per token
+        usage = SimpleNamespace(
+            prompt_token_count=len(contents) // 4,
+            candidates_token_count=len(text) // 4
+        )
+        return SimpleNamespace(text=text, usage_metadata=usage)
+
+
+class StubRoutingTransport(httpx.AsyncBaseTransport):
+    """
+    Sends each request to a local stub server chosen by the request's host
+    (`routes` maps host -> stub base URL; anything else goes to `default`),
+    so agents keep their real provider URLs and nothing leaves the machine.
+    """
+
+    def __init__(self, routes: Dict[str, str], default: str, **transport_kwargs):
+        self.routes = {host: httpx.URL(url) for host, url in routes.items()}
+        self.default = httpx.URL(default)
+        self._transport = httpx.AsyncHTTPTransport(**transport_kwargs)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        target = self.routes.get(request.url.host, self.default)
+        request.url = request.url.copy_with(scheme=target.scheme, host=target.host, port=target.port)
+        return await self._transport.handle_async_request(request)
+
+    async def aclose(self):
+        await self._transport.aclose()
@@ -0,0 +1,180 @@
+"""
+Local stand-in for the external providers (SerpAPI, CrossRef,
+Semantic Scholar) so benchmarks run offline and deterministically.
+Latency (base + jitter, with an optional slow tail) and the share of
+failed responses are configurable; the random stream is seeded.
+"""
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 so clients can keep connections alive
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.count_request()
+        time.sleep(self.server.delay())
+        if self.server.fails():
+            self._send(self.server.error_status, {"error": "injected failure"})
+            return
+        parsed = urlparse(self.path)
+        query = parse_qs(parsed.query)
+        q = query.get("q", query.get("query", query.get("query.bibliographic", [""])))[0]
+        path = parsed.path
+
+        if path == "/search":
+            payload = {"organic_results": [
+                {"title": f"Result for {q}", "link": "https://example.org/a", "snippet": q}
+            ]}
+        elif path == "/works" and "filter" in query:
+            # filter=doi:a,doi:b; DOIs containing "missing" are not found,
+            # and one containing "rejected" fails the whole filter (as CrossRef
+            # does for a value it cannot parse)
+            dois = [f[len("doi:"):] for f in query["filter"][0].split(",") if f.startswith("doi:")]
+            if any("rejected" in doi for doi in dois):
+                self._send(400, {"status": "failed", "message": "Invalid filter value"})
+                return
+            payload = {"message": {"items": [
+                {"title": [f"Paper {doi}"], "DOI": doi} for doi in dois if "missing" not in doi
+            ]}}
+        elif path == "/works":
+            payload = {"message": {"items": [
+                {"title": [f"Paper about {q}"], "DOI": "10.1000/stub", "URL": "https://doi.org/10.1000/stub"}
+            ]}}
+        elif path.startswith("/works/"):
+            doi = path[len("/works/"):]
+            if "missing" in doi or "rejected" in doi:
+                self._send(404, {"status": "error", "message": "Resource not found."})
+                return
+            payload = {"message": {"title": [f"Paper {doi}"], "DOI": doi}}
+        elif path == "/graph/v1/paper/search":
+            payload = {"data": [
+                {"title": f"Scholar paper about {q}", "url": "https://example.org/s", "externalIds": {}}
+            ]}
+        else:
+            self._send(404, {"error": "not found"})
+            return
+
+        self._send(200, payload)
+
+    def do_HEAD(self):
+        self.server.count_request()
+        time.sleep(self.server.delay())
+        self.send_response(self.server.error_status if self.server.fails() else 200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _send(self, status: int, payload: dict):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Client gave up (e.g. a cancelled hedge)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _CountingServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops bursts of connects (1s SYN retry)
+    request_queue_size = 256
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.requests = 0
+        self.latency = 0.0
+        self.jitter = 0.0
+        self.tail_latency = 0.0
+        self.tail_rate = 0.0
+        self.error_rate = 0.0
+        self.error_status = 503
+        self.rng = random.Random(0)
+        self._lock = threading.Lock()
+
+    def count_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def delay(self) -> float:
+        """Base latency plus up to `jitter`, or tail_latency for a `tail_rate` share of requests"""
+        with self._lock:
+            slow = self.rng.random() < self.tail_rate
+            jitter = self.rng.uniform(0, self.jitter)
+        return self.tail_latency if slow else self.latency + jitter
+
+    def fails(self) -> bool:
+        """Whether this request gets an `error_status` response"""
+        with self._lock:
+            return self.rng.random() < self.error_rate
+
+
+class StubServer:
+    """
+    Threaded stub server; use as a context manager.
+    Requests take `latency` plus up to `jitter` seconds, except a
+    `tail_rate` share that take `tail_latency`; an `error_rate` share
+    are answered with `error_status`.
+    """
+
+    def __init__(self,
+                 latency: float = 0.0,
+                 tail_latency: float = 0.0,
+                 tail_rate: float = 0.0,
+                 jitter: float = 0.0,
+                 error_rate: float = 0.0,
+                 error_status: int = 503,
+                 seed: int = 0):
+        self.latency = latency
+        self.tail_latency = tail_latency
+        self.tail_rate = tail_rate
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.seed = seed
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def requests(self) -> int:
+        """Requests served so far"""
+        return self._server.requests
+
+    def start(self) -> str:
+        self._server = _CountingServer(("127.0.0.1", 0), _StubHandler)
+        self._server.latency = self.latency
+        self._server.tail_latency = self.tail_latency
+        self._server.tail_rate = self.tail_rate
+        self._server.jitter = self.jitter
+        self._server.error_rate = self.error_rate
+        self._server.error_status = self.error_status
+        self._server.rng = random.Random(self.seed)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
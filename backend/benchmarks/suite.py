@@ -0,0 +1,89 @@
+"""
+Runs every benchmark with quick settings, each in its own interpreter,
+and emits one JSON record (git revision, timestamp, each benchmark's
+report or error) so hot-path regressions can be tracked over time.
+
+Run from backend/ (needs en_core_web_sm and NLTK punkt):
+    python -m benchmarks.suite --output benchmarks/results.jsonl
+    python -m benchmarks.suite --only bench_verify bench_hedging
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+from benchmarks.bench_verify import _git_revision
+
+# (module, quick arguments); bench_nli needs the optional transformers package
+BENCHMARKS = [
+    ("bench_verify", ["--sizes", "small,medium", "--docs", "2"]),
+    ("bench_claim_clustering", ["--docs", "3", "--index-words", "20000"]),
+    ("bench_startup", ["--runs", "1"]),
+    ("bench_local_index", ["--docs", "20000"]),
+    ("bench_sessions", ["--sentences", "100"]),
+    ("bench_risk_batch", ["--docs", "20000"]),
+    ("bench_singleflight", ["--concurrency", "8"]),
+    ("bench_extraction", ["--words", "20000"]),
+    ("bench_extraction_pool", ["--words", "60000", "--workers", "2"]),
+    ("bench_citation_scan", ["--words", "200000"]),
+    ("bench_citation_checks", []),
+    ("bench_doi_resolver", []),
+    ("bench_http_client", []),
+    ("bench_hedging", []),
+    ("bench_batch_judging", []),
+    ("bench_nli", ["--claims", "50"])
+]
+
+
+def _run(module: str, arguments, timeout: float) -> dict:
+    start = time.perf_counter()
+    try:
+        completed = subprocess.run(
+            [sys.executable, "-W", "ignore", "-m", f"benchmarks.{module}", *arguments],
+            capture_output=True, text=True, timeout=timeout
+        )
+    except subprocess.TimeoutExpired:
+        return {"error": f"timed out after {timeout:.0f}s"}
+
+    seconds = round(time.perf_counter() - start, 1)
+    if completed.returncode != 0:
+        lines = completed.stderr.strip().splitlines()
+        return {"error": lines[-1] if lines else f"exit code {completed.returncode}", "seconds": seconds}
+
+    try:
+        report = json.loads(completed.stdout)
+    except ValueError:
+        return {"error": "output was not JSON", "seconds": seconds}
+    return {"report": report, "seconds": seconds}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", nargs="+", metavar="BENCHMARK",
+                        choices=[name for name, _ in BENCHMARKS], help="Run just these benchmarks")
+    parser.add_argument("--timeout", type=float, default=900, help="Per-benchmark limit (s)")
+    parser.add_argument("--output", help="Append the run as one JSON line to this file")
+    args = parser.parse_args()
+
+    run = {
+        "suite": "benchmarks",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "git_revision": _git_revision(),
+        "benchmarks": {}
+    }
+    for module, arguments in BENCHMARKS:
+        if args.only and module not in args.only:
+            continue
+        print(f"Running {module}...", file=sys.stderr)
+        run["benchmarks"][module] = _run(module, arguments, args.timeout)
+
+    if args.output:
+        with open(args.output, "a", encoding="utf-8") as f:
+            f.write(json.dumps(run) + "\n")
+
+    print(json.dumps(run, indent=2))
+
+
+if __name__ == "__main__":
+    main()
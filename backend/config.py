@@ -12,6 +12,7 @@ class Config:
     # Google Gemini / LLM
     GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY", "") 
     LLM_MODEL = "gemini-1.5-flash"
+    LLM_FALLBACK_MODELS = ["gemini-1.0-pro"]  # Tried in order if the model is unavailable
     
     # Search APIs
     SERPAPI_KEY = os.getenv("SERPAPI_KEY", "")
@@ -22,12 +23,156 @@ class Config:
     SEMANTIC_SCHOLAR_API_KEY = os.getenv("SEMANTIC_SCHOLAR_API_KEY", "")
     
     # Models
-    NLI_MODEL = "microsoft/deberta-large-mnli"  # Fast NLI model
+    # Local NLI pre-filter: settles clear-cut claims before Gemini.
+    # Needs `transformers` + `torch`; skipped when they are missing.
+    # Swap in a smaller model (e.g. cross-encoder/nli-deberta-v3-xsmall) for CPU speed.
+    NLI_ENABLED = True
+    NLI_MODEL = os.getenv("NLI_MODEL", "microsoft/deberta-large-mnli")
+    NLI_BATCH_SIZE = 32  # Pairs per inference batch
+    NLI_THRESHOLD = 0.9  # Min entailment/contradiction probability to skip the LLM
     
     # Timeouts
     API_TIMEOUT = 15
     SEARCH_TIMEOUT = 10
     LLM_TIMEOUT = 30
+    URL_CHECK_TIMEOUT = 5
+    
+    # Per-provider deadlines (seconds) for concurrent evidence retrieval
+    PROVIDER_DEADLINES = {
+        'web_search': 8,
+        'crossref': 8,
+        'semantic_scholar': 8
+    }
+    
+    # End-to-end deadline for /api/verify, split into ordered stage budgets
+    # (shares of the total). Claims still unfinished at their stage's
+    # deadline are returned as partial results.
+    REQUEST_DEADLINE = 30  # Seconds; requests may ask for less
+    REQUEST_MAX_DEADLINE = 300
+    STAGE_BUDGETS = {
+        'extraction': 0.1,
+        'retrieval': 0.45,
+        'reasoning': 0.35,
+        'citations': 0.1
+    }
+    
+    # Hedged requests: duplicate a provider call still unanswered after its
+    # recent p95 latency; the first answer wins. Not used for paid SerpAPI.
+    HEDGED_PROVIDERS = ['crossref', 'semantic_scholar']
+    HEDGE_PERCENTILE = 95
+    HEDGE_MIN_SAMPLES = 20  # Below this, HEDGE_DEFAULT_DELAY is used
+    HEDGE_DEFAULT_DELAY = 2.0  # Seconds
+    HEDGE_MIN_DELAY = 0.05  # Seconds
+    LATENCY_WINDOW = 500  # Recent responses kept per provider
+    
+    # Shared HTTP connection pool
+    HTTP_MAX_CONNECTIONS = 100  # Total open connections across all hosts
+    HTTP_MAX_KEEPALIVE_CONNECTIONS = 20  # Idle connections kept warm
+    HTTP_KEEPALIVE_EXPIRY = 30  # Seconds before an idle connection is dropped
+    HTTP2_ENABLED = True  # Used only when the `h2` package is installed
+    
+    # Provider scheduling: max in-flight requests, requests/sec and burst size.
+    # Shared across all requests so the process stays under provider quotas.
+    PROVIDER_LIMITS = {
+        'serpapi': {'concurrency': 5, 'rate': 5, 'burst': 10},
+        'crossref': {'concurrency': 10, 'rate': 40, 'burst': 50},
+        'semantic_scholar': {'concurrency': 2, 'rate': 1, 'burst': 5},
+        'gemini': {'concurrency': 4, 'rate': 2, 'burst': 4},
+        'url_check': {'concurrency': 20, 'rate': 50, 'burst': 50}
+    }
+    
+    # Circuit breakers: stop calling a provider that keeps failing
+    CIRCUIT_FAILURE_THRESHOLD = 5  # Consecutive failures before the circuit opens
+    CIRCUIT_RESET_TIMEOUT = 30  # Seconds open before a half-open probe
+    CIRCUIT_MAX_RESET_TIMEOUT = 600  # Cap as failed probes double the wait
+    CIRCUIT_AUTH_RESET_TIMEOUT = 3600  # Rejected credentials stay open longer
+    RATE_LIMIT_RETRIES = 3  # Retries of a 429 before it counts as a failure
+    RATE_LIMIT_BACKOFF_BASE = 1.0  # Seconds; doubles per retry, with full jitter
+    RATE_LIMIT_BACKOFF_MAX = 30.0
+    
+    # Batched claim judging: pack many claims into one LLM prompt
+    LLM_BATCH_JUDGING = True
+    LLM_BATCH_TOKEN_BUDGET = 6000  # Approx. prompt tokens per batched call
+    LLM_BATCH_MAX_CLAIMS = 20
+    
+    # Evidence cache: in-process LRU backed by SQLite
+    EVIDENCE_CACHE_ENABLED = True
+    EVIDENCE_CACHE_PATH = os.getenv("EVIDENCE_CACHE_PATH", "cache/evidence.sqlite3")
+    EVIDENCE_CACHE_TTL = 24 * 3600  # Seconds an entry is fresh
+    EVIDENCE_CACHE_STALE_TTL = 7 * 24 * 3600  # Then served stale while refreshing
+    EVIDENCE_CACHE_MAX_ENTRIES = 10000  # In-memory tier
+    EVIDENCE_CACHE_MAX_DISK_ENTRIES = 500000  # SQLite tier
+    
+    # LLM verdict cache, keyed on claim + evidence + model + prompt version
+    VERDICT_CACHE_ENABLED = True
+    VERDICT_CACHE_PATH = os.getenv("VERDICT_CACHE_PATH", "cache/verdicts.sqlite3")
+    VERDICT_CACHE_TTL = 30 * 24 * 3600
+    VERDICT_CACHE_MAX_ENTRIES = 20000  # In-memory tier
+    VERDICT_CACHE_MAX_DISK_ENTRIES = 1000000  # SQLite tier
+    
+    # CrossRef DOI metadata store; lookups are batched with filter=doi:a,doi:b
+    DOI_CACHE_ENABLED = True
+    DOI_CACHE_PATH = os.getenv("DOI_CACHE_PATH", "cache/doi_metadata.sqlite3")
+    DOI_REFRESH_INTERVAL = 7 * 24 * 3600  # Seconds before a record is re-fetched
+    DOI_CACHE_STALE_TTL = 365 * 24 * 3600  # Old records are served while refreshing
+    DOI_CACHE_MAX_ENTRIES = 20000  # In-memory tier
+    DOI_CACHE_MAX_DISK_ENTRIES = 1000000  # SQLite tier
+    DOI_BATCH_SIZE = 50  # DOIs per CrossRef filter request
+    DOI_BATCH_WINDOW = 0.02  # Seconds to wait for more DOIs before sending a batch
+    
+    # In-flight coalescing (utils/singleflight.py): concurrent identical
+    # provider and LLM calls share one request instead of each sending it
+    SINGLEFLIGHT_ENABLED = True
+    
+    # Local evidence index (tools/local_index.py): BM25 over on-disk corpora,
+    # queried before the remote providers; build it with the CLI
+    LOCAL_INDEX_ENABLED = True  # Used only if an index exists at LOCAL_INDEX_PATH
+    LOCAL_INDEX_PATH = os.getenv("LOCAL_INDEX_PATH", "data/local_index")
+    LOCAL_INDEX_MIN_SCORE = 0.6  # Normalized BM25; weaker local hits don't count as evidence
+    LOCAL_INDEX_MIN_HITS = 1  # Local hits that make the remote providers unnecessary
+    LOCAL_INDEX_BM25_K1 = 1.2
+    LOCAL_INDEX_BM25_B = 0.75
+    LOCAL_INDEX_SEGMENT_DOCS = 100000  # Max documents per on-disk segment
+    LOCAL_INDEX_SNIPPET_CHARS = 600
+    LOCAL_INDEX_RELOAD_INTERVAL = 5.0  # Seconds between checks for appended segments
+    
+    # Claim extraction (spaCy)
+    EXTRACTION_BATCH_SIZE = 256  # Sentences per nlp.pipe batch
+    # en_core_web_sm components whose output extraction never reads;
+    # its NER has its own tok2vec layer, so it still works without them
+    EXTRACTION_DISABLED_PIPES = ["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer"]
+    EXTRACTION_WORKERS = os.cpu_count() or 1  # Worker processes for large documents
+    EXTRACTION_PROCESS_MIN_SENTENCES = 2000  # Smaller documents stay in-process
+    EXTRACTION_CHUNK_SENTENCES = 1000  # Max sentences per worker task
+    
+    # Bulk verification jobs (/api/verify/batch)
+    JOB_WORKERS = 4  # Documents verified concurrently across all jobs
+    JOB_MAX_DOCUMENTS = 50000  # Per batch request
+    JOB_RESULTS_DIR = os.getenv("JOB_RESULTS_DIR", "cache/jobs")
+    JOB_MAX_RETAINED = 100  # Finished jobs kept available for polling
+    JOB_RETENTION = 24 * 3600  # Seconds a finished job stays available
+    JOB_EVICT_INTERVAL = 60  # Seconds between sweeps for expired jobs
+    
+    # Document sessions (/api/sessions): a re-submitted draft only extracts
+    # and verifies its new or changed sentences and citations
+    SESSION_MAX_ENTRIES = 1000
+    SESSION_TTL = 24 * 3600  # Seconds since the session was last used
+    
+    # Startup: models load in the background after the server starts
+    # (/api/health/ready turns 200 when done); off, they load on first use
+    WARM_UP_ON_STARTUP = os.getenv("WARM_UP_ON_STARTUP", "1") != "0"
+    
+    # Prometheus metrics (/metrics)
+    METRICS_PREFIX = "hallucination_agent"
+    METRICS_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30]  # Seconds
+    
+    # Near-duplicate claims (MinHash/LSH over normalized token shingles):
+    # one representative per cluster is verified and its verdict shared
+    CLAIM_CLUSTERING_ENABLED = True
+    CLAIM_CLUSTER_THRESHOLD = 0.7  # Min Jaccard similarity of token shingles
+    CLAIM_MINHASH_PERMUTATIONS = 64
+    CLAIM_LSH_BANDS = 16  # 4 rows per band: candidates from ~0.5 similarity
+    CLAIM_INDEX_MAX_ENTRIES = 50000  # Representatives remembered across documents
     
     # Agent Configuration
     SEARCH_BUDGET = 5  # Max searches per claim
@@ -0,0 +1,2 @@
+# Lets `python -m pytest` import backend modules (`from config import config`)
+# the same way the app does when run from backend/.
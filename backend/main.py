@@ -1,25 +1,128 @@
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Dict, List, Optional
+import asyncio
+import json
 import logging
+import time
+from collections import Counter
 from contextlib import asynccontextmanager
 
 from agents.verification_agent import VerificationAgent
+from agents.risk_scorer import RiskBatch
+from tools.http_client import create_http_client
+from utils.scheduler import scheduler
+from utils.circuit_breaker import breakers
+from utils.hedging import hedger
+from utils.singleflight import flights
+from utils.job_queue import JobQueue
+from utils.document_sessions import DocumentSession, SessionStore
+from utils.metrics import metrics
 from config import config
 
 # ---------------- LOGGING ----------------
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# ---------------- AGENT ----------------
+# Built in lifespan so it shares the pooled HTTP client
+agent: Optional[VerificationAgent] = None
+job_queue: Optional[JobQueue] = None
+sessions = SessionStore()
+
+# Warm-up progress reported by /api/health/ready
+startup = {'status': 'starting', 'started_at': time.monotonic(), 'warm_up_s': None, 'error': None}
+
+
+async def warm_up():
+    """Load models in the background so the server accepts connections at once"""
+    startup['status'] = 'warming_up'
+    start = time.perf_counter()
+    try:
+        await agent.warm_up()
+    except Exception as e:
+        logger.exception("Warm-up failed")
+        startup['status'] = 'failed'
+        startup['error'] = str(e)
+    else:
+        startup['status'] = 'ready'
+        logger.info(f"Warm-up finished in {time.perf_counter() - start:.2f}s")
+    startup['warm_up_s'] = round(time.perf_counter() - start, 3)
+
+
+def _cache_metrics():
+    caches = {
+        'evidence': agent.retriever.cache.stats(),
+        'verdicts': agent.reasoner.verdicts.stats(),
+        'doi': agent.citation_checker.resolver.cache.stats()
+    }
+    yield ('cache_lookups_total', 'counter', 'Cache lookups by result', [
+        ({'cache': name, 'result': result}, stats[key])
+        for name, stats in caches.items()
+        for result, key in (('hit', 'hits'), ('stale_hit', 'stale_hits'), ('miss', 'misses'))
+    ])
+    yield ('cache_memory_entries', 'gauge', 'Entries in the in-memory cache tier', [
+        ({'cache': name}, stats['memory_entries']) for name, stats in caches.items()
+    ])
+    claim_index = agent.claim_index.stats()
+    yield ('claims_merged_total', 'counter', 'Claims verified as an earlier near-duplicate', [
+        ({}, claim_index['merged'])
+    ])
+
+
+def _scheduler_metrics():
+    stats = scheduler.stats()
+    yield ('provider_in_flight', 'gauge', 'Provider requests holding a scheduler slot', [
+        ({'provider': name}, s['in_flight']) for name, s in stats.items()
+    ])
+    yield ('provider_queue_depth', 'gauge', 'Provider requests waiting for a scheduler slot', [
+        ({'provider': name}, s['queue_depth']) for name, s in stats.items()
+    ])
+
+
+def _singleflight_metrics():
+    stats = flights.stats()
+    yield ('singleflight_calls_total', 'counter', 'Provider and LLM calls by whether they started a request or joined one in flight', [
+        ({'group': group, 'result': result}, s[key])
+        for group, s in stats.items()
+        for result, key in (('started', 'calls'), ('coalesced', 'coalesced'))
+    ])
+    yield ('singleflight_in_flight', 'gauge', 'Distinct provider and LLM calls in flight', [
+        ({'group': group}, s['in_flight']) for group, s in stats.items()
+    ])
+
 # ---------------- LIFESPAN ----------------
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    global agent, job_queue
+    http_client = create_http_client()
+    # Cheap: models and SDK clients load in warm_up() or on first use
+    agent = VerificationAgent(http_client=http_client)
+    job_queue = JobQueue(agent.verify)
+    job_queue.start()
+    metrics.register('caches', _cache_metrics)
+    metrics.register('scheduler', _scheduler_metrics)
+    metrics.register('singleflight', _singleflight_metrics)
+    
+    warm_up_task = None
+    if config.WARM_UP_ON_STARTUP:
+        warm_up_task = asyncio.create_task(warm_up())
+    else:
+        startup['status'] = 'ready'
     logger.info("AI Hallucination & Citation Verification Agent started")
-    yield
-    logger.info("Agent shutdown")
+    try:
+        yield
+    finally:
+        if warm_up_task is not None:
+            warm_up_task.cancel()
+            await asyncio.gather(warm_up_task, return_exceptions=True)
+        await job_queue.stop()
+        await agent.aclose()
+        await http_client.aclose()
+        logger.info("Agent shutdown")
 
 # ---------------- APP ----------------
 app = FastAPI(
@@ -83,9 +186,6 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
         }
     )
 
-# ---------------- AGENT ----------------
-agent = VerificationAgent()
-
 # ---------------- REQUEST MODEL ----------------
 class VerifyRequest(BaseModel):
     text: str = Field(
@@ -94,6 +194,46 @@ class VerifyRequest(BaseModel):
         min_length=5,
         examples=["The Earth revolves around the Sun."]
     )
+    deadline: Optional[float] = Field(
+        None,
+        gt=0,
+        le=config.REQUEST_MAX_DEADLINE,
+        description="Seconds to spend before returning partial results "
+                    f"(default {config.REQUEST_DEADLINE})."
+    )
+    timings: bool = Field(
+        False,
+        description="Include per-stage, per-provider and per-claim timings and LLM token counts."
+    )
+
+
+class BatchDocument(BaseModel):
+    id: Optional[str] = Field(None, description="Caller-supplied document id.")
+    text: str = Field(..., min_length=5)
+
+
+class BatchVerifyRequest(BaseModel):
+    documents: List[BatchDocument] = Field(
+        ...,
+        min_length=1,
+        max_length=config.JOB_MAX_DOCUMENTS,
+        description="Documents to verify in one background job."
+    )
+
+
+class RiskRescoreRequest(BaseModel):
+    weights: Dict[str, float] = Field(
+        default_factory=dict,
+        description="Overrides of contradicted_claims, unverifiable_claims, "
+                    "invalid_citations and low_confidence."
+    )
+    low_confidence: Optional[float] = Field(
+        None, ge=0, le=1,
+        description="Confidence below which a claim counts as low confidence."
+    )
+    offset: int = Field(0, ge=0)
+    limit: int = Field(100, ge=0, le=10000)
+
 
 # ---------------- ROUTE ----------------
 
@@ -105,7 +245,11 @@ async def verify_content(request: VerifyRequest):
     """
     try:
         logger.info(f"Verifying content: {len(request.text)} chars")
-        result = await agent.verify(request.text)
+        result = await agent.verify(
+            request.text,
+            deadline=request.deadline or config.REQUEST_DEADLINE,
+            timings=request.timings
+        )
         return result
 
     except HTTPException:
@@ -115,6 +259,289 @@ async def verify_content(request: VerifyRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/verify/stream")
+async def verify_content_stream(request: VerifyRequest):
+    """
+    Streams verification progress as NDJSON (one JSON event per line):
+    'extracted', then 'claim' / 'citation' as each finishes, then 'summary'.
+    `deadline` and `timings` work as for /api/verify.
+    """
+    logger.info(f"Streaming verification: {len(request.text)} chars")
+
+    async def events():
+        try:
+            async for event in agent.verify_stream(
+                request.text,
+                deadline=request.deadline or config.REQUEST_DEADLINE,
+                timings=request.timings
+            ):
+                yield json.dumps(event) + "\n"
+        except Exception as e:
+            logger.exception("Streaming verification failed")
+            yield json.dumps({'event': 'error', 'detail': str(e)}) + "\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
+@app.post("/api/verify/batch", status_code=202)
+async def verify_batch(request: BatchVerifyRequest):
+    """
+    Queues many documents for background verification and returns a job ID.
+    Poll /api/jobs/{job_id} for progress.
+    """
+    job = job_queue.submit([doc.model_dump() for doc in request.documents])
+    logger.info(f"Queued batch job {job.id}: {job.total} documents")
+    return job.progress()
+
+
+@app.get("/api/jobs")
+async def job_queue_stats():
+    """
+    Worker count, queued documents and jobs by status.
+    """
+    return job_queue.stats()
+
+
+def _get_job(job_id: str):
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job '{job_id}'")
+    return job
+
+
+@app.get("/api/jobs/{job_id}")
+async def job_progress(job_id: str):
+    """
+    Progress counters for a batch job.
+    """
+    return _get_job(job_id).progress()
+
+
+@app.get("/api/jobs/{job_id}/results")
+async def job_results(job_id: str,
+                      offset: int = Query(0, ge=0),
+                      limit: int = Query(100, ge=1, le=10000)):
+    """
+    Finished document results, in completion order, paginated.
+    """
+    job = _get_job(job_id)
+    lines = list(job.iter_results(offset, limit))
+    return {
+        **job.progress(),
+        'offset': offset,
+        'results': [json.loads(line) for line in lines]
+    }
+
+
+def _rescore_job(job, request: RiskRescoreRequest) -> Dict:
+    batch = RiskBatch.from_job_results(job.iter_results())
+    scores = agent.risk_scorer.score_batch(batch, request.weights, request.low_confidence)
+    window = slice(request.offset, request.offset + request.limit)
+    return {
+        'documents': batch.documents,
+        'weights': {**agent.risk_scorer.weights, **request.weights},
+        'risk_levels': dict(Counter(scores['risk_level'])),
+        'mean_risk_score': round(sum(scores['risk_score']) / batch.documents, 1) if batch.documents else 0,
+        'offset': request.offset,
+        'results': [
+            {
+                'document_id': document_id,
+                'risk_score': float(score),
+                'risk_level': str(level),
+                'breakdown': {
+                    field: int(scores[field][i])
+                    for field in ('contradicted_claims', 'unverifiable_claims',
+                                  'invalid_citations', 'low_confidence_claims')
+                }
+            }
+            for i, document_id, score, level in zip(
+                range(batch.documents)[window], scores['document_id'][window],
+                scores['risk_score'][window], scores['risk_level'][window]
+            )
+        ]
+    }
+
+
+@app.post("/api/jobs/{job_id}/risk")
+async def job_risk(job_id: str, request: RiskRescoreRequest):
+    """
+    Re-scores every finished document of a job in one vectorized pass,
+    optionally under different risk weights, without re-verifying.
+    """
+    job = _get_job(job_id)
+    unknown = set(request.weights) - set(agent.risk_scorer.weights)
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown risk weights: {sorted(unknown)}")
+    return await asyncio.to_thread(_rescore_job, job, request)
+
+
+@app.get("/api/jobs/{job_id}/export")
+async def job_export(job_id: str):
+    """
+    Every finished document result as JSONL (one document per line).
+    """
+    job = _get_job(job_id)
+    return StreamingResponse(
+        job.iter_results(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{job.id}.jsonl"'}
+    )
+
+
+async def _verify_revision(session: DocumentSession, request: VerifyRequest):
+    try:
+        logger.info(f"Verifying revision {session.revision + 1} of session {session.id}: {len(request.text)} chars")
+        return await agent.verify_revision(
+            session,
+            request.text,
+            deadline=request.deadline or config.REQUEST_DEADLINE,
+            timings=request.timings
+        )
+    except Exception as e:
+        logger.exception("Verification failed")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def _get_session(session_id: str) -> DocumentSession:
+    session = sessions.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail=f"Unknown session '{session_id}'")
+    return session
+
+
+@app.get("/api/sessions")
+async def session_stats():
+    """
+    Open document sessions and the store's limits.
+    """
+    return sessions.stats()
+
+
+@app.post("/api/sessions", status_code=201)
+async def create_session(request: VerifyRequest):
+    """
+    Starts a document session and verifies its first revision.
+    Re-submit edits with PUT /api/sessions/{session_id}; the report's
+    metadata.session carries the session id.
+    """
+    return await _verify_revision(sessions.create(), request)
+
+
+@app.put("/api/sessions/{session_id}")
+async def update_session(session_id: str, request: VerifyRequest):
+    """
+    Verifies a new revision of the session's document. Only new or changed
+    sentences and citations are extracted and verified; unchanged ones
+    reuse the previous revision's results.
+    """
+    return await _verify_revision(_get_session(session_id), request)
+
+
+@app.get("/api/sessions/{session_id}")
+async def get_session(session_id: str):
+    """
+    The report of the session's latest revision.
+    """
+    session = _get_session(session_id)
+    return session.report or session.info()
+
+
+@app.delete("/api/sessions/{session_id}", status_code=204)
+async def delete_session(session_id: str):
+    """
+    Forgets a session and its stored results.
+    """
+    if not sessions.delete(session_id):
+        raise HTTPException(status_code=404, detail=f"Unknown session '{session_id}'")
+    return Response(status_code=204)
+
+
+@app.get("/api/health/live")
+async def health_live():
+    """
+    Liveness: the process is up and serving (even while warming up).
+    """
+    return {
+        'status': 'alive',
+        'uptime_s': round(time.monotonic() - startup['started_at'], 1)
+    }
+
+
+@app.get("/api/health/ready")
+async def health_ready():
+    """
+    Readiness: 200 once models are loaded, 503 while warming up or if
+    warm-up failed.
+    """
+    body = {
+        'status': startup['status'],
+        'warm_up_s': startup['warm_up_s'],
+        'loaded': agent.loaded() if agent else {}
+    }
+    if startup['error']:
+        body['error'] = startup['error']
+    return JSONResponse(
+        status_code=200 if startup['status'] == 'ready' else 503,
+        content=body
+    )
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """
+    Stage and provider latency histograms, cache lookups, concurrency and
+    LLM token counts in the Prometheus text format.
+    """
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/api/scheduler/stats")
+async def scheduler_stats():
+    """
+    Per-provider in-flight requests, queue depth and slot wait times.
+    """
+    return scheduler.stats()
+
+
+@app.get("/api/hedging/stats")
+async def hedging_stats():
+    """
+    Per-provider response-time percentiles, hedge delay and hedges sent/won.
+    """
+    return hedger.stats()
+
+
+@app.get("/api/circuits/stats")
+async def circuit_stats():
+    """
+    Per-provider circuit breaker state, failures and rejected calls.
+    """
+    return breakers.stats()
+
+
+@app.get("/api/singleflight/stats")
+async def singleflight_stats():
+    """
+    Per provider/LLM group: calls started, identical concurrent calls that
+    joined one already in flight instead, and calls in flight now.
+    """
+    return flights.stats()
+
+
+@app.get("/api/cache/stats")
+async def cache_stats():
+    """
+    Hit/miss counters for the evidence, verdict and DOI metadata caches,
+    and how many claims were merged into an earlier near-duplicate.
+    """
+    return {
+        'evidence': agent.retriever.cache.stats(),
+        'verdicts': agent.reasoner.verdicts.stats(),
+        'doi': agent.citation_checker.resolver.stats(),
+        'claim_index': agent.claim_index.stats()
+    }
+
+
 # ---------------- RUN ----------------
 if __name__ == "__main__":
     import uvicorn
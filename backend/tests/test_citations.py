@@ -0,0 +1,120 @@
+import re
+
+from utils.citations import (
+    canonical_doi, canonical_url, citation_key, parse_bibliography, resolve_references,
+    scan_citation_chunks, scan_citations, strip_trailing_punctuation
+)
+
+SAMPLE = (
+    "Smith et al. (2020) found the effect [1], later confirmed by Jones (2021). "
+    "The data are at https://example.org/data.csv, see also doi:10.1000/XYZ.123; "
+    "a preprint (DOI 10.5555/abc) disagrees [2]. Lee (1999) reviewed it [12]."
+)
+
+
+def _legacy_scan(text: str):
+    """(start, end, type) of the four regex passes the scanner replaced"""
+    spans = []
+    for kind, pattern, flags in (('apa', r'(\w+(?:\s+et al\.)?)\s*\((\d{4})\)', 0),
+                                 ('ieee', r'\[(\d+)\]', 0),
+                                 ('url', r'https?://[^\s]+', 0),
+                                 ('doi', r'(?:doi:\s*|doi\s+)([^\s]+)', re.IGNORECASE)):
+        for match in re.finditer(pattern, text, flags):
+            end = match.end()
+            if kind in ('url', 'doi'):
+                end = match.start() + len(strip_trailing_punctuation(match.group(0)))
+            spans.append((match.start(), end, kind))
+    return sorted(spans)
+
+
+def _spans(citations):
+    return [(c.start, c.end, c.type) for c in citations]
+
+
+def test_single_pass_matches_the_legacy_regexes():
+    found = list(scan_citations(SAMPLE))
+    assert _spans(found) == _legacy_scan(SAMPLE)
+    assert {c.type for c in found} == {'apa', 'ieee', 'url', 'doi'}
+    for citation in found:
+        assert SAMPLE[citation.start:citation.end] == citation.text
+
+
+def test_chunked_scan_matches_whole_text_scan():
+    text = SAMPLE * 20
+    whole = _spans(scan_citations(text))
+    for size in (7, 50, 100, 1000):
+        chunks = [text[i:i + size] for i in range(0, len(text), size)]
+        assert _spans(scan_citation_chunks(chunks)) == whole
+
+
+def test_citation_straddling_a_chunk_boundary():
+    url = "https://example.org/a/long/path"
+    text = "x " * 100 + url + " done"
+    split = text.index(url) + 10
+    found = list(scan_citation_chunks([text[:split], text[split:]]))
+    assert [(c.type, c.text, c.start) for c in found] == [('url', url, text.index(url))]
+
+
+def test_canonical_doi_strips_prefixes_case_and_punctuation():
+    for raw in ("10.1000/ABC", "doi:10.1000/abc", "DOI 10.1000/abc.", "https://doi.org/10.1000/Abc",
+                "http://dx.doi.org/10.1000/abc);"):
+        assert canonical_doi(raw) == "10.1000/abc"
+
+
+def test_canonical_url_normalizes_scheme_host_port_and_fragment():
+    assert canonical_url("HTTPS://Example.ORG:443/Path?q=1#top.") == "https://example.org/Path?q=1"
+    assert canonical_url("http://example.org:80") == "http://example.org/"
+    assert canonical_url("http://example.org:8080/a") == "http://example.org:8080/a"
+
+
+def test_citation_key_groups_repeated_references():
+    text = ("Per doi:10.1000/ABC and https://doi.org/10.1000/abc, also "
+            "https://Example.org/report#s2 and https://example.org/report. "
+            "Smith et al. (2020) agrees, as does smith  et al. (2020), unlike Smith (2021).")
+    keys = [citation_key(c.to_dict()) for c in scan_citations(text)]
+    assert keys == [
+        "doi:10.1000/abc", "doi:10.1000/abc",
+        "url:https://example.org/report", "url:https://example.org/report",
+        "apa:smith et al.:2020", "apa:smith et al.:2020", "apa:smith:2021"
+    ]
+
+
+PAPER = """Vaccines reduce severe illness [1], and masks reduce spread [2].
+The effect holds across cohorts [1] but not in [3].
+
+References
+[1] A. Smith, "Vaccine efficacy," Lancet, 2020. doi:10.1016/S0140-6736(20)30000-1
+[2] B. Jones, Masks and transmission, 2021. https://example.org/masks
+[3] C. Lee, Unpublished notes, 1999.
+"""
+
+
+def test_parse_bibliography_reads_numbered_entries():
+    start, entries = parse_bibliography(PAPER)
+    assert PAPER[start:].startswith("References")
+    assert set(entries) == {"1", "2", "3"}
+    assert entries["1"]["doi"] == "10.1016/s0140-6736(20)30000-1"
+    assert entries["1"]["year"] == 2020
+    assert entries["2"]["url"] == "https://example.org/masks"
+    assert "doi" not in entries["3"] and "url" not in entries["3"]
+
+
+def test_resolve_references_attaches_entries_to_markers():
+    citations = resolve_references(PAPER, [c.to_dict() for c in scan_citations(PAPER)])
+    markers = [c for c in citations if c['type'] == 'ieee']
+    # The reference list's own "[n]" labels are not citations
+    assert [c['reference_id'] for c in markers] == ["1", "2", "1", "3"]
+    assert all(c['start'] < PAPER.index("References") for c in markers)
+    # A marker and its entry's DOI elsewhere count as one reference
+    keys = {citation_key(c) for c in citations}
+    assert citation_key(markers[0]) == citation_key(markers[2]) == "doi:10.1016/s0140-6736(20)30000-1"
+    assert citation_key(markers[1]) == "url:https://example.org/masks"
+    assert citation_key(markers[3]).startswith("ref:c. lee")
+    assert len(keys) == 3
+
+
+def test_markers_without_a_bibliography_are_kept_unresolved():
+    text = "Shown in [4] and [5]."
+    citations = resolve_references(text, [c.to_dict() for c in scan_citations(text)])
+    assert [c['reference_id'] for c in citations] == ["4", "5"]
+    assert not any('entry' in c for c in citations)
@@ -0,0 +1,61 @@
+from utils.claim_clustering import ClaimIndex
+
+CLAIM = "X significantly increased blood pressure in elderly patients."
+
+
+def test_rewordings_share_one_representative():
+    index = ClaimIndex()
+    texts = [
+        CLAIM,
+        "In elderly patients, X significantly increased blood pressure.",
+        "Indeed, X significantly increased blood pressure in elderly patients."
+    ]
+    assert index.canonicalize(texts) == [CLAIM] * 3
+    assert index.stats()['merged'] == 2
+
+
+def test_antonyms_and_changed_qualifiers_are_not_merged():
+    index = ClaimIndex()
+    texts = [
+        CLAIM,
+        "X significantly decreased blood pressure in elderly patients.",
+        "X significantly increased blood pressure in young patients.",
+        "X significantly lowered blood pressure in elderly patients."
+    ]
+    assert index.canonicalize(texts) == texts
+    assert index.stats()['merged'] == 0
+
+
+def test_synonyms_and_dropped_modifiers_are_merged():
+    index = ClaimIndex()
+    claim = ("The new drug significantly increased systolic blood pressure "
+             "in elderly patients with chronic kidney disease.")
+    texts = [
+        claim,
+        claim.replace("increased", "raised"),
+        claim.replace("significantly ", ""),
+        claim.replace("chronic ", ""),
+        # Still kept apart however similar the rest is
+        claim.replace("increased", "decreased")
+    ]
+    assert index.canonicalize(texts) == [claim] * 4 + [texts[4]]
+    assert index.stats()['merged'] == 3
+    assert index.canonicalize([CLAIM, "X increased blood pressure in elderly patients."]) == [CLAIM] * 2
+
+
+def test_numbers_negation_and_entities_must_match():
+    index = ClaimIndex()
+    texts = [
+        "The Eiffel Tower was completed in 1889.",
+        "The Eiffel Tower was completed in 1887.",
+        "The Eiffel Tower was not completed in 1889."
+    ]
+    assert index.canonicalize(texts) == texts
+
+
+def test_representatives_persist_across_calls():
+    index = ClaimIndex()
+    index.canonicalize(["The Eiffel Tower was completed in 1889."])
+    assert index.canonicalize(["In 1889, the Eiffel Tower was completed."]) == [
+        "The Eiffel Tower was completed in 1889."
+    ]
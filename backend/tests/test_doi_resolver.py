@@ -0,0 +1,89 @@
+import asyncio
+
+import httpx
+
+from benchmarks.stub_server import StubServer
+from tools.doi_resolver import DOIResolver
+from utils.cache import TwoTierCache
+
+
+def _resolver(stub: StubServer, client: httpx.AsyncClient, ttl: float = 3600, stale_ttl: float = 0) -> DOIResolver:
+    cache = TwoTierCache('doi', path=None, ttl=ttl, stale_ttl=stale_ttl, max_entries=100, max_disk_entries=100)
+    resolver = DOIResolver(client=client, cache=cache)
+    resolver.crossref_url = f"{stub.base_url}/works"
+    return resolver
+
+
+async def _resolve_all(resolver: DOIResolver, dois):
+    return await asyncio.gather(*(resolver.resolve(doi) for doi in dois))
+
+
+def test_concurrent_dois_share_one_filter_request():
+    async def run():
+        with StubServer() as stub:
+            async with httpx.AsyncClient() as client:
+                resolver = _resolver(stub, client)
+                records = await _resolve_all(resolver, ["10.1000/a", "10.1000/b", "doi:10.1000/C"])
+                return records, resolver.requests, stub.requests
+
+    records, requests, served = asyncio.run(run())
+    assert [r['found'] for r in records] == [True, True, True]
+    assert records[2]['metadata']['doi'] == "10.1000/c"
+    assert requests == served == 1
+
+
+def test_missing_dois_are_not_found():
+    async def run():
+        with StubServer() as stub:
+            async with httpx.AsyncClient() as client:
+                resolver = _resolver(stub, client)
+                return await _resolve_all(resolver, ["10.1000/a", "10.1000/missing"])
+
+    found, missing = asyncio.run(run())
+    assert found['found'] and not missing['found']
+
+
+def test_rejected_value_only_fails_its_own_doi():
+    async def run():
+        with StubServer() as stub:
+            async with httpx.AsyncClient() as client:
+                resolver = _resolver(stub, client)
+                records = await _resolve_all(resolver, ["10.1000/a", "10.1000/rejected", "10.1000/b"])
+                return records, resolver.requests
+
+    records, requests = asyncio.run(run())
+    assert [r['found'] for r in records] == [True, False, True]
+    # The rejected batch, then one lookup per DOI
+    assert requests == 4
+
+
+def test_stored_records_are_reused():
+    async def run():
+        with StubServer() as stub:
+            async with httpx.AsyncClient() as client:
+                resolver = _resolver(stub, client)
+                first = await resolver.resolve("10.1000/a")
+                second = await resolver.resolve("https://doi.org/10.1000/A")
+                return first, second, resolver.requests
+
+    first, second, requests = asyncio.run(run())
+    assert first == second
+    assert requests == 1
+
+
+def test_stale_records_are_served_then_refreshed():
+    async def run():
+        with StubServer() as stub:
+            async with httpx.AsyncClient() as client:
+                resolver = _resolver(stub, client, ttl=0, stale_ttl=3600)
+                first = await resolver.resolve("10.1000/a")
+                stale = await resolver.resolve("10.1000/a")
+                served_stale = resolver.requests
+                await asyncio.sleep(0.3)
+                return first, stale, served_stale, resolver.requests, resolver.cache.stale_hits
+
+    first, stale, served_stale, requests, stale_hits = asyncio.run(run())
+    assert stale == first
+    assert served_stale == 1
+    assert requests == 2
+    assert stale_hits == 1
@@ -0,0 +1,74 @@
+import asyncio
+import json
+import os
+import time
+
+from utils.job_queue import JobQueue
+
+
+async def _verify(text: str):
+    if text == "boom":
+        raise RuntimeError("verification failed")
+    if text == "unserializable":
+        return {'claims': object()}
+    return {'claims': [], 'text': text}
+
+
+async def _finish(queue: JobQueue, job_id: str, timeout: float = 5):
+    """Poll like a client until the job is done"""
+    start = time.monotonic()
+    while queue.get(job_id).progress()['status'] != 'completed':
+        assert time.monotonic() - start < timeout
+        await asyncio.sleep(0.01)
+    return queue.get(job_id).progress()
+
+
+def test_submit_poll_and_export(tmp_path):
+    async def run():
+        queue = JobQueue(_verify, workers=2, results_dir=str(tmp_path))
+        queue.start()
+        try:
+            documents = [{'id': f"doc-{i}", 'text': f"text {i}"} for i in range(5)] + [{'id': 'bad', 'text': 'boom'}]
+            job = queue.submit(documents)
+            progress = await _finish(queue, job.id)
+            return job, progress, list(job.iter_results()), list(job.iter_results(2, 2))
+        finally:
+            await queue.stop()
+
+    job, progress, exported, page = asyncio.run(run())
+    assert (progress['completed'], progress['failed'], progress['pending']) == (5, 1, 0)
+    lines = [json.loads(line) for line in exported]
+    assert sorted(line['document_id'] for line in lines) == sorted([f"doc-{i}" for i in range(5)] + ['bad'])
+    assert next(line for line in lines if line['document_id'] == 'bad')['error'] == "verification failed"
+    assert page == exported[2:4]
+
+
+def test_unrecordable_result_fails_the_document_not_the_worker(tmp_path):
+    async def run():
+        queue = JobQueue(_verify, workers=1, results_dir=str(tmp_path))
+        queue.start()
+        try:
+            job = queue.submit([{'text': 'unserializable'}, {'text': 'fine'}, {'text': 'fine too'}])
+            return await _finish(queue, job.id)
+        finally:
+            await queue.stop()
+
+    progress = asyncio.run(run())
+    assert (progress['completed'], progress['failed']) == (2, 1)
+
+
+def test_expired_jobs_are_evicted_without_new_submissions(tmp_path):
+    async def run():
+        queue = JobQueue(_verify, workers=1, results_dir=str(tmp_path), retention=0.05, evict_interval=0.02)
+        queue.start()
+        try:
+            job = queue.submit([{'text': 'short'}])
+            await _finish(queue, job.id)
+            await asyncio.sleep(0.2)
+            return job, queue.get(job.id)
+        finally:
+            await queue.stop()
+
+    job, found = asyncio.run(run())
+    assert found is None
+    assert not os.path.exists(job.results_path)
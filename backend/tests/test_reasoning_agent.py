@@ -0,0 +1,51 @@
+import asyncio
+
+from agents.reasoning_agent import ReasoningAgent
+from benchmarks.fakes import FakeGenAIClient
+from config import config
+from utils.cache import TwoTierCache
+
+CLAIM = "The Eiffel Tower was completed in 1889."
+EVIDENCE = ["The Eiffel Tower opened in March 1889."]
+
+
+class _RetiredModelClient(FakeGenAIClient):
+    """Answers like FakeGenAIClient, except `retired` is no longer served"""
+
+    def __init__(self, retired: str):
+        super().__init__()
+        self.retired = retired
+        self.models_used = []
+
+    def generate_content(self, model: str, contents: str):
+        self.models_used.append(model)
+        if model == self.retired:
+            raise RuntimeError(f"404 NOT_FOUND: models/{model} is not found for API version v1beta")
+        return super().generate_content(model, contents)
+
+
+def _agent(client) -> ReasoningAgent:
+    verdicts = TwoTierCache('verdicts', path=None, ttl=3600, stale_ttl=0, max_entries=100, max_disk_entries=100)
+    return ReasoningAgent(client=client, verdicts=verdicts)
+
+
+def test_model_comes_from_config():
+    assert _agent(FakeGenAIClient()).model_name == config.LLM_MODEL
+
+
+def test_fallback_verdicts_are_stored_under_the_fallback_model():
+    async def run():
+        client = _RetiredModelClient(config.LLM_MODEL)
+        agent = _agent(client)
+        agent.fallback_models = ["gemini-fallback"]
+        verdict = await agent.judge_claim(CLAIM, EVIDENCE)
+        return agent, client, verdict
+
+    agent, client, verdict = asyncio.run(run())
+    assert verdict['status'] == "SUPPORTED"
+    assert client.models_used == [config.LLM_MODEL, "gemini-fallback"]
+    assert agent.model_name == "gemini-fallback"
+
+    cached = lambda model: asyncio.run(agent.verdicts.get(agent._verdict_key(CLAIM, EVIDENCE, model)))
+    assert cached("gemini-fallback") is not None
+    assert cached(config.LLM_MODEL) is None
@@ -0,0 +1,47 @@
+import random
+
+from agents.risk_scorer import RiskBatch, RiskScorer
+
+_STATUSES = ["SUPPORTED", "CONTRADICTED", "UNVERIFIABLE", "PARTIAL"]
+_CITATION_STATUSES = ["VALID", "INVALID", "UNKNOWN"]
+
+
+def _reports(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    return [
+        {
+            'claims': [
+                {'status': rng.choice(_STATUSES), 'confidence': round(rng.random(), 2)}
+                for _ in range(rng.randint(0, 30))
+            ],
+            'citations': [{'status': rng.choice(_CITATION_STATUSES)} for _ in range(rng.randint(0, 12))]
+        }
+        for _ in range(count)
+    ]
+
+
+def _assert_paths_agree(scorer: RiskScorer, reports, weights=None):
+    scores = scorer.score_batch(RiskBatch.from_reports(reports), weights)
+    for i, report in enumerate(reports):
+        expected = scorer.calculate_risk(report['claims'], report['citations'])
+        assert scores['risk_score'][i] == expected['risk_score']
+        assert type(scores['risk_score'][i]) is float
+        assert scores['risk_level'][i] == expected['risk_level']
+        for field, value in expected.get('breakdown', {}).items():
+            assert scores[field][i] == value
+
+
+def test_batch_scores_match_per_document_scores():
+    _assert_paths_agree(RiskScorer(), _reports(3000))
+
+
+def test_rescoring_matches_a_scorer_with_those_weights():
+    weights = {'contradicted_claims': 0.55, 'invalid_citations': 0.35, 'low_confidence': 0.05}
+    scorer = RiskScorer()
+    reports = _reports(1000, seed=1)
+    rescored = scorer.score_batch(RiskBatch.from_reports(reports), weights)
+
+    reweighted = RiskScorer()
+    reweighted.weights.update(weights)
+    _assert_paths_agree(reweighted, reports)
+    assert list(rescored['risk_score']) == list(reweighted.score_batch(RiskBatch.from_reports(reports))['risk_score'])
@@ -0,0 +1,202 @@
+import asyncio
+import httpx
+from typing import Dict, List, Optional
+from config import config
+from tools.http_client import create_http_client
+from utils.scheduler import scheduler
+from utils.cache import TwoTierCache, make_key
+from utils.circuit_breaker import breakers
+from utils.citations import canonical_doi
+
+class DOIResolver:
+    """
+    CrossRef metadata lookups backed by a local SQLite store.
+    DOIs requested at about the same time are coalesced into one
+    `filter=doi:a,doi:b,...` request; repeats resolve from the store, and
+    records older than DOI_REFRESH_INTERVAL are re-fetched in the background.
+    """
+
+    def __init__(self,
+                 client: Optional[httpx.AsyncClient] = None,
+                 cache: Optional[TwoTierCache] = None):
+        # Shared pooled client (injected from main.py lifespan)
+        self.client = client or create_http_client()
+        self.scheduler = scheduler
+        self.breakers = breakers
+        self.cache = cache or TwoTierCache(
+            'doi',
+            path=config.DOI_CACHE_PATH,
+            ttl=config.DOI_REFRESH_INTERVAL,
+            stale_ttl=config.DOI_CACHE_STALE_TTL,
+            max_entries=config.DOI_CACHE_MAX_ENTRIES,
+            max_disk_entries=config.DOI_CACHE_MAX_DISK_ENTRIES,
+            enabled=config.DOI_CACHE_ENABLED
+        )
+        self.crossref_url = "https://api.crossref.org/works"
+
+        self.requests = 0
+        self._pending: Dict[str, List[asyncio.Future]] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._batches = set()
+
+    async def resolve(self, doi: str) -> Dict:
+        """
+        {'found': True, 'metadata': {...}} or {'found': False}.
+        Raises if CrossRef cannot be reached and nothing is stored.
+        """
+        doi = canonical_doi(doi)
+        if not doi:
+            return {'found': False}
+
+        return await self.cache.get_or_fetch(
+            make_key('doi', doi),
+            lambda: self._enqueue(doi)
+        )
+
+    async def search(self, field: str, query: str) -> Optional[Dict]:
+        """
+        Metadata of CrossRef's top hit for a free-text works query
+        (`field` is e.g. 'query' or 'query.bibliographic'), or None.
+        """
+        record = await self.cache.get_or_fetch(
+            make_key('crossref_search', query, field=field),
+            lambda: self.breakers.call('crossref', lambda: self._fetch_search(field, query))
+        )
+        return record.get('metadata')
+
+    async def _fetch_search(self, field: str, query: str) -> Dict:
+        params = {
+            field: query,
+            'rows': 1,
+            'mailto': config.CROSSREF_EMAIL
+        }
+        items = await self._get_items(params)
+        if not items:
+            return {'found': False}
+
+        record = {'found': True, 'metadata': self._metadata(items[0])}
+        # The hit's DOI now resolves locally too
+        if record['metadata']['doi']:
+            await self.cache.set(make_key('doi', record['metadata']['doi']), record)
+        return record
+
+    async def _enqueue(self, doi: str) -> Dict:
+        """Wait for `doi` to be looked up in the next batch"""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.setdefault(doi, []).append(future)
+
+        if len(self._pending) >= config.DOI_BATCH_SIZE:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                config.DOI_BATCH_WINDOW, self._flush
+            )
+
+        return await future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._pending = self._pending, {}
+        if batch:
+            task = asyncio.create_task(self._lookup_batch(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _lookup_batch(self, batch: Dict[str, List[asyncio.Future]]):
+        # Values that are not DOIs would make CrossRef reject the whole filter
+        results = {doi: {'found': False} for doi in batch if not doi.startswith('10.')}
+        # Commas separate filter values, so such DOIs are fetched one by one
+        singles = [doi for doi in batch if doi not in results and ',' in doi]
+        filtered = [doi for doi in batch if doi not in results and ',' not in doi]
+
+        if filtered:
+            try:
+                results.update(await self.breakers.call(
+                    'crossref', lambda: self._fetch_batch(filtered)
+                ))
+            except httpx.HTTPStatusError as e:
+                if 400 <= e.response.status_code < 500 and e.response.status_code != 429:
+                    # One value CrossRef rejects fails the whole filter:
+                    # look each DOI up on its own so only that one fails
+                    singles.extend(filtered)
+                else:
+                    results.update((doi, e) for doi in filtered)
+            except Exception as e:
+                results.update((doi, e) for doi in filtered)
+
+        outcomes = await asyncio.gather(
+            *(self.breakers.call('crossref', lambda doi=doi: self._fetch_single(doi)) for doi in singles),
+            return_exceptions=True
+        )
+        results.update(zip(singles, outcomes))
+
+        for doi, futures in batch.items():
+            for future in futures:
+                if future.done():
+                    continue
+                if isinstance(results[doi], BaseException):
+                    future.set_exception(results[doi])
+                else:
+                    future.set_result(results[doi])
+
+    async def _fetch_batch(self, dois: List[str]) -> Dict[str, Dict]:
+        """One filter request for many DOIs; absent DOIs are recorded as not found"""
+        params = {
+            'filter': ','.join(f'doi:{doi}' for doi in dois),
+            'rows': len(dois),
+            'mailto': config.CROSSREF_EMAIL
+        }
+        items = await self._get_items(params)
+
+        records = {doi: {'found': False} for doi in dois}
+        for item in items:
+            doi = canonical_doi(item.get('DOI', ''))
+            if doi in records:
+                records[doi] = {'found': True, 'metadata': self._metadata(item)}
+        return records
+
+    async def _fetch_single(self, doi: str) -> Dict:
+        async with self.scheduler.slot('crossref'):
+            self.requests += 1
+            response = await self.client.get(
+                f"{self.crossref_url}/{doi}", timeout=config.API_TIMEOUT
+            )
+            if response.status_code == 404:
+                return {'found': False}
+            response.raise_for_status()
+            data = response.json()
+
+        return {'found': True, 'metadata': self._metadata(data.get('message', {}))}
+
+    async def _get_items(self, params: Dict) -> List[Dict]:
+        """CrossRef /works query (raises on failure so errors are never cached)"""
+        async with self.scheduler.slot('crossref'):
+            self.requests += 1
+            response = await self.client.get(
+                self.crossref_url, params=params, timeout=config.API_TIMEOUT
+            )
+            response.raise_for_status()
+            data = response.json()
+
+        return data.get('message', {}).get('items', [])
+
+    def _metadata(self, item: Dict) -> Dict:
+        """The fields citation checks report, from one CrossRef work"""
+        date_parts = (
+            item.get('issued') or item.get('published-online') or {}
+        ).get('date-parts') or [[None]]
+
+        return {
+            'title': (item.get('title') or [''])[0],
+            'authors': [a.get('family', '') for a in item.get('author', [])],
+            'year': date_parts[0][0],
+            'doi': canonical_doi(item.get('DOI', '')),
+            'venue': (item.get('container-title') or [''])[0],
+            'url': item.get('URL', '')
+        }
+
+    def stats(self) -> Dict:
+        return {'crossref_requests': self.requests, **self.cache.stats()}
@@ -0,0 +1,31 @@
+import httpx
+from config import config
+
+
+def _http2_available() -> bool:
+    """HTTP/2 needs the optional `h2` package (httpx[http2])"""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """
+    Create the long-lived HTTP client shared by every agent and tool.
+    httpx keeps a keep-alive pool per origin, so repeated calls to
+    SerpAPI / CrossRef / Semantic Scholar reuse warm connections.
+    Close it with `await client.aclose()` on shutdown.
+    """
+    limits = httpx.Limits(
+        max_connections=config.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=config.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=config.HTTP_KEEPALIVE_EXPIRY
+    )
+
+    return httpx.AsyncClient(
+        limits=limits,
+        timeout=config.API_TIMEOUT,
+        http2=config.HTTP2_ENABLED and _http2_available()
+    )
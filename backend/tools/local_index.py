@@ -0,0 +1,493 @@
+"""
+Offline evidence index: BM25 over local corpora (internal docs, paper
+abstract dumps), stored on disk as immutable, memory-mapped segments.
+
+Layout of an index directory:
+    meta.json              segments, document count, total token count
+    seg_000001/
+        lexicon.json       term -> [postings offset, document frequency]
+        postings.bin       uint32 document ids, then the matching term frequencies
+        lengths.bin        uint32 token count per document
+        docs.jsonl         stored documents (title, text, url, ...)
+        docs.idx           uint64 byte offset of each line in docs.jsonl
+
+Appends write a new segment and then swap meta.json, so a running server
+picks them up on its next reload without ever seeing a half-written one.
+One writer at a time.
+
+Run from backend/:
+    python -m tools.local_index build data/abstracts.jsonl docs/
+    python -m tools.local_index append more_notes.txt
+    python -m tools.local_index search "Water boils at 100 degrees Celsius"
+    python -m tools.local_index compact
+Inputs are JSONL files (one object per line with "text", "abstract" or
+"snippet", plus optional "title", "url", "doi", "year") or text files
+(.txt/.md, indexed by paragraph); directories are walked for both.
+"""
+import argparse
+import bisect
+import heapq
+import json
+import math
+import mmap
+import os
+import re
+import shutil
+import sys
+import threading
+import time
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from config import config
+from utils.claim_clustering import claim_tokens
+
+TEXT_SUFFIXES = (".txt", ".md")
+_VERSION = 1
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+class Segment:
+    """One immutable, memory-mapped segment"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        with open(path / "lexicon.json", encoding="utf-8") as f:
+            self.lexicon: Dict[str, List[int]] = json.load(f)
+
+        self._maps = []
+        postings = self._map("postings.bin", "I")
+        half = len(postings) // 2
+        self.doc_ids = postings[:half]
+        self.frequencies = postings[half:]
+        self.lengths = self._map("lengths.bin", "I")
+        self.offsets = self._map("docs.idx", "Q")
+        self.docs = self._map("docs.jsonl", None)
+
+    def _map(self, name: str, item_format: Optional[str]):
+        with open(self.path / name, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return memoryview(array(item_format or "B"))
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append(mapped)
+        view = memoryview(mapped)
+        return view.cast(item_format) if item_format else view
+
+    def __len__(self) -> int:
+        return len(self.lengths)
+
+    def postings(self, term: str) -> Tuple[memoryview, memoryview]:
+        offset, count = self.lexicon[term]
+        return self.doc_ids[offset:offset + count], self.frequencies[offset:offset + count]
+
+    def document(self, doc_id: int) -> Dict:
+        end = self.offsets[doc_id + 1] if doc_id + 1 < len(self.offsets) else len(self.docs)
+        return json.loads(bytes(self.docs[self.offsets[doc_id]:end]))
+
+    def documents(self) -> Iterator[Dict]:
+        for doc_id in range(len(self)):
+            yield self.document(doc_id)
+
+
+class LocalIndex:
+    """
+    Reader (and writer) for an on-disk BM25 index.
+    Segments are opened on first search (or by `load()` during warm-up)
+    and reopened when meta.json changes, checked at most every
+    `reload_interval` seconds.
+    """
+
+    def __init__(self,
+                 path: str = config.LOCAL_INDEX_PATH,
+                 k1: float = config.LOCAL_INDEX_BM25_K1,
+                 b: float = config.LOCAL_INDEX_BM25_B,
+                 reload_interval: float = config.LOCAL_INDEX_RELOAD_INTERVAL):
+        self.path = Path(path)
+        self.k1 = k1
+        self.b = b
+        self.reload_interval = reload_interval
+
+        # (meta.json mtime, meta, segments, per-segment BM25 length norms),
+        # swapped as a whole on reload
+        self._state: Optional[Tuple[float, Dict, List[Segment], List[array]]] = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+        self.searches = 0
+        self.reloads = 0
+
+    @property
+    def meta_path(self) -> Path:
+        return self.path / "meta.json"
+
+    def available(self) -> bool:
+        """Whether an index has been built at `path`"""
+        return self._state is not None or self.meta_path.exists()
+
+    @property
+    def loaded(self) -> bool:
+        return self._state is not None
+
+    def load(self):
+        """Open the segments if not open yet, or reopen them if meta.json changed"""
+        with self._lock:
+            self._checked = time.monotonic()
+            try:
+                mtime = self.meta_path.stat().st_mtime
+            except FileNotFoundError:
+                self._state = None
+                return
+            if self._state is not None and self._state[0] == mtime:
+                return
+
+            meta = _read_meta(self.path)
+            if meta.get("byteorder", sys.byteorder) != sys.byteorder:
+                raise RuntimeError(f"Local index {self.path} was built on a {meta['byteorder']}-endian machine")
+            segments = [Segment(self.path / s["name"]) for s in meta["segments"]]
+            average_length = meta["total_length"] / meta["documents"] if meta["documents"] else 1.0
+            norms = [
+                array("d", (self.k1 * (1 - self.b + self.b * length / average_length) for length in segment.lengths))
+                for segment in segments
+            ]
+            if self._state is not None:
+                self.reloads += 1
+            self._state = (mtime, meta, segments, norms)
+
+    def search(self, query: str, limit: int = 3) -> List[Dict]:
+        """
+        Top `limit` documents by BM25, as evidence items with a `score`:
+        the BM25 score divided by the IDF mass of the query's terms, so
+        ~1.0 means every term matched once in a document of average length.
+        """
+        if self._state is None or time.monotonic() - self._checked > self.reload_interval:
+            self.load()
+        state = self._state
+        if state is None:
+            return []
+
+        _, meta, segments, norms = state
+        total = meta["documents"]
+        terms = set(claim_tokens(query))
+        if not total or not terms:
+            return []
+        self.searches += 1
+
+        idf = {}
+        frequency = {}
+        for term in terms:
+            frequency[term] = sum(s.lexicon[term][1] for s in segments if term in s.lexicon)
+            idf[term] = math.log(1 + (total - frequency[term] + 0.5) / (frequency[term] + 0.5))
+        # Terms missing from the index count against the match too
+        query_weight = sum(idf.values())
+
+        scores = self._score([t for t in terms if frequency[t]], idf, segments, norms, limit)
+
+        results = []
+        for (position, doc_id), score in heapq.nlargest(limit, scores.items(), key=lambda item: item[1]):
+            document = segments[position].document(doc_id)
+            results.append({
+                'title': document.get("title", ""),
+                'url': document.get("url", ""),
+                'snippet': _passage(document.get("text", ""), terms, config.LOCAL_INDEX_SNIPPET_CHARS),
+                'doi': document.get("doi", ""),
+                'year': document.get("year", 0),
+                'score': round(score / query_weight, 3),
+                'source': 'local_index'
+            })
+        return results
+
+    def _score(self,
+               terms: List[str],
+               idf: Dict[str, float],
+               segments: List[Segment],
+               norms: List[array],
+               limit: int) -> Dict[Tuple[int, int], float]:
+        """
+        BM25 scores keyed by (segment position, document id), with MaxScore
+        pruning: rare terms are scanned first, and once the terms left could
+        not lift an unseen document into the top `limit` even together, they
+        only add to documents already scored (found by bisecting their
+        sorted postings) instead of scanning postings that cover most of
+        the corpus.
+        """
+        # A term adds less than idf * (k1 + 1) to any document
+        bounds = {term: idf[term] * (self.k1 + 1) for term in terms}
+        ordered = sorted(terms, key=bounds.get, reverse=True)
+        remaining = sum(bounds.values())
+        scores: Dict[Tuple[int, int], float] = {}
+
+        for i, term in enumerate(ordered):
+            if len(scores) >= limit and remaining < heapq.nlargest(limit, scores.values())[-1]:
+                self._score_candidates(ordered[i:], bounds, segments, norms, scores)
+                break
+
+            weight = bounds[term]
+            remaining -= weight
+            for position, segment in enumerate(segments):
+                if term not in segment.lexicon:
+                    continue
+                segment_norms = norms[position]
+                doc_ids, frequencies = segment.postings(term)
+                for doc_id, tf in zip(doc_ids, frequencies):
+                    key = (position, doc_id)
+                    scores[key] = scores.get(key, 0.0) + weight * tf / (tf + segment_norms[doc_id])
+
+        return scores
+
+    def _score_candidates(self,
+                          terms: List[str],
+                          bounds: Dict[str, float],
+                          segments: List[Segment],
+                          norms: List[array],
+                          scores: Dict[Tuple[int, int], float]):
+        for term in terms:
+            weight = bounds[term]
+            postings = {
+                position: segment.postings(term)
+                for position, segment in enumerate(segments) if term in segment.lexicon
+            }
+            for key in scores:
+                position, doc_id = key
+                if position not in postings:
+                    continue
+                doc_ids, frequencies = postings[position]
+                i = bisect.bisect_left(doc_ids, doc_id)
+                if i < len(doc_ids) and doc_ids[i] == doc_id:
+                    tf = frequencies[i]
+                    scores[key] += weight * tf / (tf + norms[position][doc_id])
+
+    def stats(self) -> Dict:
+        state = self._state
+        meta = state[1] if state else {}
+        return {
+            'documents': meta.get("documents", 0),
+            'segments': len(meta.get("segments", [])),
+            'searches': self.searches,
+            'reloads': self.reloads
+        }
+
+    # ---------------- Writing ----------------
+
+    def append(self, documents: Iterable[Dict], segment_docs: int = config.LOCAL_INDEX_SEGMENT_DOCS) -> int:
+        """Index `documents` as new segments, each published as soon as it is written"""
+        self.path.mkdir(parents=True, exist_ok=True)
+        meta = _read_meta(self.path) if self.meta_path.exists() else _empty_meta()
+        return self._write(meta, documents, segment_docs, publish_each=True)
+
+    def rebuild(self, documents: Iterable[Dict], segment_docs: int = config.LOCAL_INDEX_SEGMENT_DOCS) -> int:
+        """Replace the index contents with `documents`, published in one swap at the end"""
+        self.path.mkdir(parents=True, exist_ok=True)
+        old = _read_meta(self.path) if self.meta_path.exists() else _empty_meta()
+        meta = _empty_meta()
+        meta["next_segment"] = old["next_segment"]
+
+        added = self._write(meta, documents, segment_docs, publish_each=False)
+        for segment in old["segments"]:
+            shutil.rmtree(self.path / segment["name"], ignore_errors=True)
+        return added
+
+    def compact(self, segment_docs: int = config.LOCAL_INDEX_SEGMENT_DOCS) -> int:
+        """Merge all segments into as few as possible"""
+        meta = _read_meta(self.path)
+        segments = [Segment(self.path / s["name"]) for s in meta["segments"]]
+        return self.rebuild((document for segment in segments for document in segment.documents()), segment_docs)
+
+    def _write(self, meta: Dict, documents: Iterable[Dict], segment_docs: int, publish_each: bool) -> int:
+        added = 0
+        batch: List[Dict] = []
+        for document in documents:
+            batch.append(document)
+            if len(batch) >= segment_docs:
+                added += self._add_segment(meta, batch, publish_each)
+                batch = []
+        if batch or not meta["segments"]:
+            added += self._add_segment(meta, batch, publish_each)
+
+        if not publish_each:
+            _write_meta(self.path, meta)
+        return added
+
+    def _add_segment(self, meta: Dict, documents: List[Dict], publish: bool) -> int:
+        name = f"seg_{meta['next_segment']:06d}"
+        total_length = _write_segment(self.path / name, documents)
+
+        meta["next_segment"] += 1
+        meta["segments"].append({"name": name, "documents": len(documents), "total_length": total_length})
+        meta["documents"] += len(documents)
+        meta["total_length"] += total_length
+        if publish:
+            _write_meta(self.path, meta)
+        return len(documents)
+
+
+def _passage(text: str, terms: set, chars: int) -> str:
+    """The sentence sharing the most query terms, plus what follows it, up to `chars`"""
+    if len(text) <= chars:
+        return text
+    sentences = _SENTENCE_END.split(text)
+    best = max(range(len(sentences)), key=lambda i: len(terms.intersection(claim_tokens(sentences[i]))))
+    return " ".join(sentences[best:])[:chars]
+
+
+def _empty_meta() -> Dict:
+    return {"version": _VERSION, "byteorder": sys.byteorder, "next_segment": 1,
+            "segments": [], "documents": 0, "total_length": 0}
+
+
+def _read_meta(path: Path) -> Dict:
+    with open(path / "meta.json", encoding="utf-8") as f:
+        meta = json.load(f)
+    if meta.get("version") != _VERSION:
+        raise RuntimeError(f"Local index {path} has version {meta.get('version')}; rebuild it")
+    return meta
+
+
+def _write_meta(path: Path, meta: Dict):
+    """Atomic swap: readers see the old or the new segment list, never a partial one"""
+    tmp = path / "meta.json.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(tmp, path / "meta.json")
+
+
+def _write_segment(path: Path, documents: List[Dict]) -> int:
+    """Write one segment; returns its total token count"""
+    path.mkdir(parents=True)
+    postings: Dict[str, List[Tuple[int, int]]] = {}
+    lengths = array("I")
+    offsets = array("Q")
+
+    with open(path / "docs.jsonl", "wb") as docs:
+        for doc_id, document in enumerate(documents):
+            tokens = claim_tokens(f"{document.get('title', '')} {document.get('text', '')}")
+            for term, tf in Counter(tokens).items():
+                postings.setdefault(term, []).append((doc_id, tf))
+            lengths.append(len(tokens))
+            offsets.append(docs.tell())
+            docs.write(json.dumps(document, ensure_ascii=False).encode("utf-8") + b"\n")
+
+    lexicon = {}
+    doc_ids = array("I")
+    frequencies = array("I")
+    for term in sorted(postings):
+        lexicon[term] = [len(doc_ids), len(postings[term])]
+        for doc_id, tf in postings[term]:
+            doc_ids.append(doc_id)
+            frequencies.append(tf)
+
+    with open(path / "postings.bin", "wb") as f:
+        doc_ids.tofile(f)
+        frequencies.tofile(f)
+    with open(path / "lengths.bin", "wb") as f:
+        lengths.tofile(f)
+    with open(path / "docs.idx", "wb") as f:
+        offsets.tofile(f)
+    with open(path / "lexicon.json", "w", encoding="utf-8") as f:
+        json.dump(lexicon, f, ensure_ascii=False)
+
+    return sum(lengths)
+
+
+# ---------------- Input files ----------------
+
+def read_documents(paths: Iterable[str]) -> Iterator[Dict]:
+    """Documents from JSONL and text files (directories are walked)"""
+    for raw in paths:
+        path = Path(raw)
+        files = sorted(
+            p for p in path.rglob("*")
+            if p.is_file() and (p.suffix == ".jsonl" or p.suffix in TEXT_SUFFIXES)
+        ) if path.is_dir() else [path]
+
+        for file in files:
+            if file.suffix == ".jsonl":
+                yield from _jsonl_documents(file)
+            else:
+                yield from _text_documents(file)
+
+
+def _jsonl_documents(path: Path) -> Iterator[Dict]:
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                print(f"Skipping {path}:{number}: not JSON")
+                continue
+
+            text = record.get("text") or record.get("abstract") or record.get("snippet") or ""
+            if not text and not record.get("title"):
+                continue
+            doi = record.get("doi", "")
+            document = {
+                "title": record.get("title", ""),
+                "text": text,
+                "url": record.get("url") or (f"https://doi.org/{doi}" if doi else "")
+            }
+            if doi:
+                document["doi"] = doi
+            if record.get("year"):
+                document["year"] = record["year"]
+            yield document
+
+
+def _text_documents(path: Path) -> Iterator[Dict]:
+    """One document per paragraph (blank-line separated)"""
+    text = path.read_text(encoding="utf-8", errors="replace")
+    url = path.resolve().as_uri()
+    for paragraph in text.split("\n\n"):
+        paragraph = " ".join(paragraph.split())
+        if paragraph:
+            yield {"title": path.stem, "text": paragraph, "url": url}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--index", default=config.LOCAL_INDEX_PATH, help="Index directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    for name, help_text in (("build", "Replace the index with these inputs"),
+                            ("append", "Add these inputs as new segments")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("inputs", nargs="+", help="JSONL/text files or directories")
+        command.add_argument("--segment-docs", type=int, default=config.LOCAL_INDEX_SEGMENT_DOCS,
+                             help="Max documents per segment")
+
+    search = commands.add_parser("search", help="Query the index")
+    search.add_argument("query")
+    search.add_argument("--limit", type=int, default=5)
+
+    commands.add_parser("compact", help="Merge all segments")
+    commands.add_parser("stats", help="Document and segment counts")
+    args = parser.parse_args()
+
+    index = LocalIndex(args.index)
+    start = time.perf_counter()
+
+    if args.command in ("build", "append"):
+        documents = read_documents(args.inputs)
+        write = index.rebuild if args.command == "build" else index.append
+        count = write(documents, args.segment_docs)
+        print(f"Indexed {count} documents in {time.perf_counter() - start:.1f}s")
+    elif args.command == "compact":
+        count = index.compact()
+        print(f"Compacted {count} documents in {time.perf_counter() - start:.1f}s")
+    elif args.command == "search":
+        index.load()
+        start = time.perf_counter()
+        results = index.search(args.query, args.limit)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+        print(f"{len(results)} results in {elapsed:.2f} ms", file=sys.stderr)
+        return
+
+    index.load()
+    print(json.dumps(index.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
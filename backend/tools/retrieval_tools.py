@@ -1,133 +1,293 @@
 import httpx
 import asyncio
-from typing import List, Dict
+from typing import Awaitable, Callable, List, Dict, Optional, Tuple
 from config import config
+from tools.http_client import create_http_client
+from tools.local_index import LocalIndex
+from utils.scheduler import scheduler
+from utils.cache import TwoTierCache, make_key
+from utils.circuit_breaker import CircuitOpenError, breakers
+from utils.error_inspector import describe_error
+from utils.hedging import hedger
+from utils.singleflight import flights
+from utils.metrics import metrics
 
 class RetrievalTools:
     """Tools for retrieving evidence from web and academic sources"""
     
-    def __init__(self):
+    def __init__(self,
+                 client: Optional[httpx.AsyncClient] = None,
+                 cache: Optional[TwoTierCache] = None,
+                 local_index: Optional[LocalIndex] = None):
+        # Shared pooled client (injected from main.py lifespan)
+        self.client = client or create_http_client()
+        # Offline BM25 index, consulted before any remote provider
+        self.local_index = local_index or LocalIndex(config.LOCAL_INDEX_PATH)
+        self.scheduler = scheduler
+        self.breakers = breakers
+        # Slow CrossRef/Semantic Scholar responses get a duplicate request
+        self.hedger = hedger
+        # Identical searches already in flight are shared, not repeated
+        self.flights = flights
+        self.cache = cache or TwoTierCache(
+            'evidence',
+            path=config.EVIDENCE_CACHE_PATH,
+            ttl=config.EVIDENCE_CACHE_TTL,
+            stale_ttl=config.EVIDENCE_CACHE_STALE_TTL,
+            max_entries=config.EVIDENCE_CACHE_MAX_ENTRIES,
+            max_disk_entries=config.EVIDENCE_CACHE_MAX_DISK_ENTRIES,
+            enabled=config.EVIDENCE_CACHE_ENABLED
+        )
         self.serpapi_key = config.SERPAPI_KEY
+        self.serpapi_url = "https://serpapi.com/search"
         self.crossref_url = "https://api.crossref.org/works"
         self.semantic_scholar_url = "https://api.semanticscholar.org/graph/v1"
     
     async def search_web(self, query: str, num_results: int = 3) -> List[Dict]:
         """Search general web for evidence"""
         try:
-            url = "https://serpapi.com/search"
-            params = {
-                "q": query,
-                "api_key": self.serpapi_key,
-                "num": num_results,
-                "engine": "google"
-            }
-            
-            async with httpx.AsyncClient(timeout=config.SEARCH_TIMEOUT) as client:
-                response = await client.get(url, params=params)
-                data = response.json()
-            
-            results = []
-            for item in data.get("organic_results", [])[:num_results]:
-                results.append({
-                    'title': item.get('title'),
-                    'url': item.get('link'),
-                    'snippet': item.get('snippet'),
-                    'source': 'web_search'
-                })
-            
-            return results
+            return await self._query_web(query, num_results)
         
         except Exception as e:
-            print(f"Web search error: {e}")
+            print(f"Web search error: {describe_error(e)}")
             return []
     
+    async def _query(self, provider: str, key: str, fetch: Callable[[], Awaitable[List[Dict]]]) -> List[Dict]:
+        """A coalesced, cached call through `provider`'s breaker; raises on failure"""
+        return await self.flights.do(provider, key, lambda: self.cache.get_or_fetch(
+            key,
+            lambda: self.breakers.call(provider, fetch)
+        ))
+    
+    async def _query_web(self, query: str, num_results: int) -> List[Dict]:
+        return await self._query(
+            'serpapi', make_key('serpapi', query, num=num_results),
+            lambda: self._fetch_web(query, num_results)
+        )
+    
+    async def _fetch_web(self, query: str, num_results: int) -> List[Dict]:
+        """Call SerpAPI (raises on failure so errors are never cached)"""
+        params = {
+            "q": query,
+            "api_key": self.serpapi_key,
+            "num": num_results,
+            "engine": "google"
+        }
+        
+        response = await self.hedger.run('serpapi', lambda: self._get(
+            self.serpapi_url, params=params, timeout=config.SEARCH_TIMEOUT
+        ), slot=lambda: self.scheduler.slot('serpapi'))
+        data = response.json()
+        
+        results = []
+        for item in data.get("organic_results", [])[:num_results]:
+            results.append({
+                'title': item.get('title'),
+                'url': item.get('link'),
+                'snippet': item.get('snippet'),
+                'source': 'web_search'
+            })
+        
+        return results
+    
+    async def _get(self, url: str, **kwargs) -> httpx.Response:
+        """GET that raises on an error status (inside the scheduler slot)"""
+        response = await self.client.get(url, **kwargs)
+        response.raise_for_status()
+        return response
+    
     async def search_papers(self, query: str, num_results: int = 3) -> List[Dict]:
-        """Search academic papers (CrossRef + Semantic Scholar)"""
+        """Search academic papers (CrossRef + Semantic Scholar, concurrently)"""
+        crossref_results, scholar_results = await asyncio.gather(
+            self._query_crossref(query, num_results),
+            self._query_semantic_scholar(query, num_results),
+            return_exceptions=True
+        )
+        
         results = []
+        for name, provider_results in (('CrossRef', crossref_results),
+                                       ('Semantic Scholar', scholar_results)):
+            if isinstance(provider_results, Exception):
+                print(f"{name} error: {describe_error(provider_results)}")
+            else:
+                results.extend(provider_results)
+        
+        return results[:num_results]
+    
+    async def gather_evidence(self, query: str, limit: int = 3) -> Tuple[List[Dict], Dict[str, str]]:
+        """
+        Query the local index first; with at least config.LOCAL_INDEX_MIN_HITS
+        strong hits the remote providers are skipped, otherwise they are
+        all queried concurrently to make up the rest.
+        Returns as soon as `limit` usable results exist, cancelling the
+        stragglers, together with each provider's outcome:
+        ok / empty / timeout / error / cancelled / circuit_open / skipped.
+        """
+        local = []
+        providers = {}
+        if config.LOCAL_INDEX_ENABLED and self.local_index.available():
+            local = await self._search_local(query, limit)
+            providers['local_index'] = 'ok' if local else 'empty'
+        
+        searches = {
+            'web_search': ('serpapi', lambda: self._query_web(query, 2)),
+            'crossref': ('crossref', lambda: self._query_crossref(query, 2)),
+            'semantic_scholar': ('semantic_scholar', lambda: self._query_semantic_scholar(query, 2))
+        }
+        
+        if local and len(local) >= min(config.LOCAL_INDEX_MIN_HITS, limit):
+            providers.update({name: 'skipped' for name in searches})
+            return local[:limit], providers
+        
+        results = {}
+        deadlines = {name: config.PROVIDER_DEADLINES.get(name, config.API_TIMEOUT) for name in searches}
+        providers.update({name: 'cancelled' for name in searches})
+        tasks = {}
+        for name, (breaker, search) in searches.items():
+            # Skip providers whose circuit is open instead of waiting on them
+            if self.breakers.get(breaker).is_open():
+                providers[name] = 'circuit_open'
+                continue
+            
+            task = asyncio.create_task(asyncio.wait_for(search(), deadlines[name]))
+            tasks[task] = name
+        
+        pending = set(tasks)
+        found = len(local)
         
-        # CrossRef
         try:
-            crossref_results = await self._search_crossref(query, num_results)
-            results.extend(crossref_results)
-        except Exception as e:
-            print(f"CrossRef error: {e}")
+            while pending and found < limit:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                
+                for task in done:
+                    name = tasks[task]
+                    try:
+                        items = task.result()
+                    except asyncio.TimeoutError:
+                        # wait_for cancels the call before httpx's own timeout
+                        # fires, so the breaker never saw it fail: count it here
+                        breaker = searches[name][0]
+                        self.breakers.get(breaker).record_failure('TIMEOUT', f"no answer within {deadlines[name]}s")
+                        providers[name] = 'timeout'
+                        continue
+                    except CircuitOpenError:
+                        # Opened by another request while this one was queued
+                        providers[name] = 'circuit_open'
+                        continue
+                    except Exception as e:
+                        print(f"{name} error: {describe_error(e)}")
+                        providers[name] = 'error'
+                        continue
+                    
+                    usable = [item for item in items if item.get('snippet') or item.get('title')]
+                    results[name] = usable
+                    providers[name] = 'ok' if usable else 'empty'
+                    found += len(usable)
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
         
-        # Semantic Scholar
+        # Keep a stable provider order regardless of who answered first
+        evidence = local + [item for name in searches for item in results.get(name, [])]
+        return evidence[:limit], providers
+    
+    async def _search_local(self, query: str, limit: int) -> List[Dict]:
+        """Local index hits scoring at least config.LOCAL_INDEX_MIN_SCORE"""
         try:
-            scholar_results = await self._search_semantic_scholar(query, num_results)
-            results.extend(scholar_results)
+            with metrics.provider_call('local_index'):
+                hits = await asyncio.to_thread(self.local_index.search, query, limit)
         except Exception as e:
-            print(f"Semantic Scholar error: {e}")
-        
-        return results[:num_results]
+            print(f"Local index error: {e}")
+            return []
+        return [hit for hit in hits if hit['score'] >= config.LOCAL_INDEX_MIN_SCORE]
     
     async def _search_crossref(self, query: str, limit: int = 3) -> List[Dict]:
         """Search CrossRef API"""
         try:
-            params = {
-                'query': query,
-                'rows': limit,
-                'mailto': config.CROSSREF_EMAIL
-            }
-            
-            async with httpx.AsyncClient(timeout=config.API_TIMEOUT) as client:
-                response = await client.get(self.crossref_url, params=params)
-                data = response.json()
-            
-            results = []
-            for item in data.get('message', {}).get('items', [])[:limit]:
-                results.append({
-                    'title': item.get('title', ['']) if isinstance(item.get('title'), list) else item.get('title', ''),
-                    'authors': [a.get('family', '') for a in item.get('author', [])],
-                    'year': item.get('published-online', {}).get('date-parts', []),
-                    'journal': item.get('container-title', ''),
-                    'doi': item.get('DOI', ''),
-                    'url': item.get('URL', ''),
-                    'source': 'crossref'
-                })
-            
-            return results
+            return await self._query_crossref(query, limit)
         except Exception as e:
-            print(f"CrossRef error: {e}")
+            print(f"CrossRef error: {describe_error(e)}")
             return []
     
+    async def _query_crossref(self, query: str, limit: int) -> List[Dict]:
+        return await self._query(
+            'crossref', make_key('crossref', query, rows=limit),
+            lambda: self._fetch_crossref(query, limit)
+        )
+    
+    async def _fetch_crossref(self, query: str, limit: int) -> List[Dict]:
+        params = {
+            'query': query,
+            'rows': limit,
+            'mailto': config.CROSSREF_EMAIL
+        }
+        
+        response = await self.hedger.run('crossref', lambda: self._get(
+            self.crossref_url, params=params, timeout=config.API_TIMEOUT
+        ), slot=lambda: self.scheduler.slot('crossref'))
+        data = response.json()
+        
+        results = []
+        for item in data.get('message', {}).get('items', [])[:limit]:
+            results.append({
+                'title': (item.get('title') or [''])[0] if isinstance(item.get('title'), list) else item.get('title', ''),
+                'authors': [a.get('family', '') for a in item.get('author', [])],
+                'year': item.get('published-online', {}).get('date-parts', []),
+                'journal': item.get('container-title', ''),
+                'doi': item.get('DOI', ''),
+                'url': item.get('URL', ''),
+                'source': 'crossref'
+            })
+        
+        return results
+    
     async def _search_semantic_scholar(self, query: str, limit: int = 3) -> List[Dict]:
         """Search Semantic Scholar API"""
         try:
-            url = f"{self.semantic_scholar_url}/paper/search"
-            params = {'query': query, 'limit': limit}
-            
-            headers = {}
-            if config.SEMANTIC_SCHOLAR_API_KEY:
-                headers['x-api-key'] = config.SEMANTIC_SCHOLAR_API_KEY
-            
-            async with httpx.AsyncClient(timeout=config.API_TIMEOUT) as client:
-                response = await client.get(url, params=params, headers=headers)
-                data = response.json()
-            
-            results = []
-            for item in data.get('data', [])[:limit]:
-                results.append({
-                    'title': item.get('title', ''),
-                    'authors': [a.get('name', '') for a in item.get('authors', [])],
-                    'year': item.get('year', 0),
-                    'venue': item.get('venue', ''),
-                    'doi': item.get('externalIds', {}).get('DOI', ''),
-                    'url': item.get('url', ''),
-                    'source': 'semantic_scholar'
-                })
-            
-            return results
+            return await self._query_semantic_scholar(query, limit)
         except Exception as e:
-            print(f"Semantic Scholar error: {e}")
+            print(f"Semantic Scholar error: {describe_error(e)}")
             return []
     
+    async def _query_semantic_scholar(self, query: str, limit: int) -> List[Dict]:
+        return await self._query(
+            'semantic_scholar', make_key('semantic_scholar', query, limit=limit),
+            lambda: self._fetch_semantic_scholar(query, limit)
+        )
+    
+    async def _fetch_semantic_scholar(self, query: str, limit: int) -> List[Dict]:
+        url = f"{self.semantic_scholar_url}/paper/search"
+        params = {'query': query, 'limit': limit}
+        
+        headers = {}
+        if config.SEMANTIC_SCHOLAR_API_KEY:
+            headers['x-api-key'] = config.SEMANTIC_SCHOLAR_API_KEY
+        
+        response = await self.hedger.run('semantic_scholar', lambda: self._get(
+            url, params=params, headers=headers, timeout=config.API_TIMEOUT
+        ), slot=lambda: self.scheduler.slot('semantic_scholar'))
+        data = response.json()
+        
+        results = []
+        for item in data.get('data', [])[:limit]:
+            results.append({
+                'title': item.get('title', ''),
+                'authors': [a.get('name', '') for a in item.get('authors', [])],
+                'year': item.get('year', 0),
+                'venue': item.get('venue', ''),
+                'doi': (item.get('externalIds') or {}).get('DOI', ''),
+                'url': item.get('url', ''),
+                'source': 'semantic_scholar'
+            })
+        
+        return results
+    
     async def check_url(self, url: str) -> Dict:
         """Check if URL is accessible"""
         try:
-            async with httpx.AsyncClient(timeout=5) as client:
-                response = await client.head(url, allow_redirects=True)
-                status = response.status_code
+            status = await self.flights.do('url_check', url, lambda: self._head_status(url))
             
             return {
                 'url': url,
@@ -141,6 +301,13 @@ class RetrievalTools:
                 'error': str(e)
             }
     
+    async def _head_status(self, url: str) -> int:
+        async with self.scheduler.slot('url_check'):
+            response = await self.client.head(
+                url, follow_redirects=True, timeout=config.URL_CHECK_TIMEOUT
+            )
+            return response.status_code
+    
     async def validate_citation(self, citation: Dict) -> Dict:
         """Validate a citation by searching for it"""
         query = f"{citation.get('author', '')} {citation.get('year', '')}"
@@ -0,0 +1,269 @@
+import asyncio
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+# (value, fresh_until, stale_until)
+Entry = Tuple[Any, float, float]
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase, drop surrounding punctuation and collapse whitespace"""
+    query = re.sub(r"\s+", " ", query.lower()).strip()
+    return query.strip(" .,;:!?\"'")
+
+
+def make_key(provider: str, query: str, **params) -> str:
+    """Stable cache key for a provider call"""
+    raw = json.dumps(
+        [provider, normalize_query(query), params],
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class LRUCache:
+    """Bounded in-process tier; least recently used entries are evicted first"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Entry]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Entry]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: str, entry: Entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteStore:
+    """
+    On-disk tier; trims least recently accessed rows beyond `max_entries`.
+    Opening a store with a different `version` discards its old entries.
+    """
+
+    EVICT_EVERY = 100  # Writes between size checks
+
+    def __init__(self, path: str, max_entries: int, version: Optional[str] = None):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._writes = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " fresh_until REAL NOT NULL,"
+            " stale_until REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)"
+        )
+        if version is not None:
+            self._check_version(version)
+        self._conn.commit()
+
+    def _check_version(self, version: str):
+        row = self._conn.execute(
+            "SELECT value FROM meta WHERE name = 'version'"
+        ).fetchone()
+        if row is None or row[0] != version:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('version', ?)", (version,)
+            )
+
+    def get(self, key: str) -> Optional[Entry]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, fresh_until, stale_until FROM entries WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            self._conn.execute(
+                "UPDATE entries SET accessed_at = ? WHERE key = ?",
+                (time.time(), key)
+            )
+            self._conn.commit()
+
+        return json.loads(row[0]), row[1], row[2]
+
+    def set(self, key: str, entry: Entry):
+        value, fresh_until, stale_until = entry
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                (key, json.dumps(value), fresh_until, stale_until, time.time())
+            )
+            self._writes += 1
+            if self._writes % self.EVICT_EVERY == 0:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        now = time.time()
+        self._conn.execute("DELETE FROM entries WHERE stale_until < ?", (now,))
+        self._conn.execute(
+            "DELETE FROM entries WHERE key IN ("
+            " SELECT key FROM entries ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class TwoTierCache:
+    """
+    In-process LRU in front of a SQLite store, with TTLs.
+    Entries are fresh for `ttl` seconds, then served stale for up to
+    `stale_ttl` more while a background fetch refreshes them.
+    Cached values are shared; callers must not mutate them.
+    Changing `version` invalidates everything stored on disk.
+    """
+
+    def __init__(self,
+                 name: str,
+                 path: Optional[str],
+                 ttl: float,
+                 stale_ttl: float,
+                 max_entries: int,
+                 max_disk_entries: int,
+                 enabled: bool = True,
+                 version: Optional[str] = None):
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.enabled = enabled
+        self.memory = LRUCache(max_entries)
+        self.disk = (
+            SQLiteStore(path, max_disk_entries, version)
+            if (enabled and path) else None
+        )
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self._refreshing = {}
+
+    async def get_or_fetch(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value for `key`, calling `fetch` only on a miss"""
+        if not self.enabled:
+            return await fetch()
+
+        entry = await self._lookup(key)
+        now = time.time()
+
+        if entry is not None:
+            value, fresh_until, stale_until = entry
+            if now < fresh_until:
+                self.hits += 1
+                return value
+            if now < stale_until:
+                self.stale_hits += 1
+                self._refresh_in_background(key, fetch)
+                return value
+
+        self.misses += 1
+        value = await fetch()
+        await self.set(key, value)
+        return value
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for `key` (fresh or stale), or None"""
+        if not self.enabled:
+            return None
+
+        entry = await self._lookup(key)
+        if entry is not None:
+            value, fresh_until, stale_until = entry
+            now = time.time()
+            if now < fresh_until:
+                self.hits += 1
+                return value
+            if now < stale_until:
+                self.stale_hits += 1
+                return value
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: Any):
+        if not self.enabled:
+            return
+
+        now = time.time()
+        entry = (value, now + self.ttl, now + self.ttl + self.stale_ttl)
+        self.memory.set(key, entry)
+        if self.disk is not None:
+            await asyncio.to_thread(self.disk.set, key, entry)
+
+    async def _lookup(self, key: str) -> Optional[Entry]:
+        entry = self.memory.get(key)
+        if entry is None and self.disk is not None:
+            entry = await asyncio.to_thread(self.disk.get, key)
+            if entry is not None:
+                self.memory.set(key, entry)
+        return entry
+
+    def _refresh_in_background(self, key: str, fetch: Callable[[], Awaitable[Any]]):
+        if key in self._refreshing:
+            return
+
+        async def refresh():
+            try:
+                await self.set(key, await fetch())
+            except Exception as e:
+                print(f"{self.name} cache refresh error: {e}")
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.create_task(refresh())
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses,
+            'hit_rate': round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+            'memory_entries': len(self.memory)
+        }
+
+    def close(self):
+        if self.disk is not None:
+            self.disk.close()
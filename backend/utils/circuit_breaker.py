@@ -0,0 +1,187 @@
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from config import config
+from utils.error_inspector import analyze_error, describe_error
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider whose circuit is open"""
+
+    def __init__(self, provider: str, retry_in: float):
+        super().__init__(f"{provider} circuit open; retrying in {retry_in:.0f}s")
+        self.provider = provider
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    Closed -> open after `failure_threshold` consecutive failures (or at
+    once on bad credentials). While open, calls fail fast; after the reset
+    timeout one half-open probe is let through. A failed probe re-opens the
+    circuit for twice as long, up to `max_reset_timeout`.
+    """
+
+    def __init__(self, name: str,
+                 failure_threshold: int = config.CIRCUIT_FAILURE_THRESHOLD,
+                 reset_timeout: float = config.CIRCUIT_RESET_TIMEOUT,
+                 max_reset_timeout: float = config.CIRCUIT_MAX_RESET_TIMEOUT):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+
+        self.state = 'closed'
+        self.failures = 0
+        self.reset_timeout = reset_timeout
+        self.opened_until = 0.0
+        self.last_error: Optional[str] = None
+        self._probing = False
+
+        self.rejected = 0
+        self.opened = 0
+
+    def is_open(self) -> bool:
+        """True while calls would be rejected (does not start a probe)"""
+        if self.state == 'open':
+            return time.monotonic() < self.opened_until
+        return self.state == 'half_open' and self._probing
+
+    def allow(self) -> bool:
+        """Whether a call may go ahead now; may start the half-open probe"""
+        if self.state == 'open' and time.monotonic() >= self.opened_until:
+            self.state = 'half_open'
+
+        if self.state == 'half_open' and not self._probing:
+            self._probing = True
+            return True
+
+        if self.state == 'closed':
+            return True
+
+        self.rejected += 1
+        return False
+
+    def retry_in(self) -> float:
+        return max(0.0, self.opened_until - time.monotonic())
+
+    def record_success(self):
+        if self.state != 'closed':
+            logger.info(f"{self.name} circuit closed")
+        self.state = 'closed'
+        self.failures = 0
+        self.reset_timeout = self.base_reset_timeout
+        self._probing = False
+
+    def record_failure(self, error_type: str, detail: str = ""):
+        """`detail` is served on /api/circuits/stats: never put URLs or keys in it"""
+        self.failures += 1
+        self.last_error = f"{error_type}: {detail}"[:200]
+
+        if self.state == 'half_open':
+            self._probing = False
+            self._open(min(self.reset_timeout * 2, self.max_reset_timeout))
+        elif error_type == 'API_KEY_ERROR':
+            # Retrying will not fix credentials
+            self._open(config.CIRCUIT_AUTH_RESET_TIMEOUT)
+        elif self.failures >= self.failure_threshold:
+            self._open(self.reset_timeout)
+
+    def release_probe(self):
+        """A probe ended without an outcome (e.g. cancelled); allow another"""
+        self._probing = False
+
+    def _open(self, timeout: float):
+        self.state = 'open'
+        self.reset_timeout = timeout
+        self.opened_until = time.monotonic() + timeout
+        self.opened += 1
+        logger.warning(f"{self.name} circuit open for {timeout:.0f}s ({self.last_error})")
+
+    def stats(self) -> Dict:
+        return {
+            'state': 'open' if self.is_open() else self.state,
+            'consecutive_failures': self.failures,
+            'retry_in_s': round(self.retry_in(), 1),
+            'times_opened': self.opened,
+            'rejected': self.rejected,
+            'last_error': self.last_error
+        }
+
+
+class CircuitBreakers:
+    """
+    One breaker per provider, plus retry of rate-limited calls with
+    exponential backoff and full jitter. Errors are classified with
+    utils.error_inspector.analyze_error.
+    """
+
+    def __init__(self,
+                 retries: int = config.RATE_LIMIT_RETRIES,
+                 backoff_base: float = config.RATE_LIMIT_BACKOFF_BASE,
+                 backoff_max: float = config.RATE_LIMIT_BACKOFF_MAX):
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, provider: str) -> CircuitBreaker:
+        if provider not in self.breakers:
+            self.breakers[provider] = CircuitBreaker(provider)
+        return self.breakers[provider]
+
+    async def call(self, provider: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Run `fetch` through `provider`'s breaker; raises CircuitOpenError while open"""
+        breaker = self.get(provider)
+
+        if not breaker.allow():
+            raise CircuitOpenError(provider, breaker.retry_in())
+
+        attempt = 0
+        while True:
+            try:
+                result = await fetch()
+            except asyncio.CancelledError:
+                breaker.release_probe()
+                raise
+            except Exception as e:
+                analysis = analyze_error(e)
+                error_type = analysis['type']
+
+                if error_type == 'RATE_LIMIT' and attempt < self.retries:
+                    await self._backoff(provider, attempt, e)
+                    attempt += 1
+                    continue
+
+                if analysis['fixable'] or error_type == 'CLIENT_ERROR':
+                    # The caller's request was at fault, not the provider
+                    breaker.release_probe()
+                else:
+                    breaker.record_failure(error_type, describe_error(e))
+                raise
+
+            breaker.record_success()
+            return result
+
+    async def _backoff(self, provider: str, attempt: int, error: Exception):
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+        # Honour Retry-After when the provider sends one
+        response = getattr(error, 'response', None)
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after and retry_after.isdigit():
+            delay = min(self.backoff_max, float(retry_after))
+
+        logger.info(f"{provider} rate limited; retry {attempt + 1} in {delay:.2f}s")
+        await asyncio.sleep(delay)
+
+    def stats(self) -> Dict:
+        return {name: breaker.stats() for name, breaker in self.breakers.items()}
+
+
+breakers = CircuitBreakers()
@@ -0,0 +1,253 @@
+import re
+from urllib.parse import urlsplit, urlunsplit
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Punctuation that ends a sentence rather than a URL or DOI
+_TRAILING = '.,;:!?\'"]>}'
+_DOI_HOSTS = ('doi.org', 'dx.doi.org')
+_DOI_PREFIX = re.compile(r'^(?:https?://(?:dx\.)?doi\.org/|doi:\s*|doi\s+)', re.IGNORECASE)
+
+
+def strip_trailing_punctuation(text: str) -> str:
+    """Drop sentence punctuation glued to the end of a URL or DOI"""
+    while text:
+        last = text[-1]
+        if last in _TRAILING:
+            text = text[:-1]
+        elif last == ')' and text.count(')') > text.count('('):
+            # Unbalanced: the paren wraps the citation, e.g. "(see https://x.org)"
+            text = text[:-1]
+        else:
+            break
+    return text
+
+
+def canonical_doi(raw: str) -> str:
+    """'DOI 10.1000/ABC.' / 'https://doi.org/10.1000/abc' -> '10.1000/abc'"""
+    doi = _DOI_PREFIX.sub('', raw.strip())
+    # DOIs are case-insensitive
+    return strip_trailing_punctuation(doi).lower()
+
+
+def canonical_url(raw: str) -> str:
+    """Trim punctuation, lowercase scheme and host, drop fragments and default ports"""
+    url = strip_trailing_punctuation(raw.strip())
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return url
+
+    host = (parts.hostname or '').lower()
+    if parts.port and not (
+        (parts.scheme == 'http' and parts.port == 80) or
+        (parts.scheme == 'https' and parts.port == 443)
+    ):
+        host = f"{host}:{parts.port}"
+
+    return urlunsplit((parts.scheme.lower(), host, parts.path or '/', parts.query, ''))
+
+
+def citation_key(citation: Dict) -> str:
+    """Identity of the reference a citation points to; equal keys are checked once"""
+    citation_type = citation.get('type', 'unknown')
+
+    if citation_type == 'doi':
+        return f"doi:{canonical_doi(citation.get('doi', ''))}"
+    if citation_type == 'url':
+        url = canonical_url(citation.get('url', ''))
+        # A doi.org link is the same reference as the bare DOI
+        if urlsplit(url).hostname in _DOI_HOSTS:
+            return f"doi:{canonical_doi(url)}"
+        return f"url:{url}"
+    if citation_type == 'apa':
+        author = ' '.join(citation.get('author', '').lower().split())
+        return f"apa:{author}:{citation.get('year', '')}"
+    if citation_type == 'ieee':
+        # Resolved markers share a key with their entry's DOI/URL elsewhere in the text
+        entry = citation.get('entry')
+        if entry and entry.get('doi'):
+            return f"doi:{entry['doi']}"
+        if entry and entry.get('url'):
+            return f"url:{entry['url']}"
+        if entry:
+            return f"ref:{' '.join(entry['text'].lower().split())}"
+        return f"ieee:{citation.get('reference_id', '')}"
+
+    return f"{citation_type}:{citation.get('text', '')}"
+
+
+# Every citation style in one alternation, so the text is walked once.
+# Alternatives are tried left to right at each position: a URL or DOI
+# swallows any "[n]" or "(year)" inside it instead of reporting it twice.
+_CITATION_PATTERN = re.compile(
+    r'(?P<url>https?://[^\s]+)'
+    r'|(?P<doi>(?i:doi:\s*|doi\s+)(?P<doi_id>[^\s]+))'
+    r'|\[(?P<ieee_id>\d+)\]'
+    r'|(?P<apa_author>\b\w+(?:\s+et al\.)?)\s*\((?P<apa_year>\d{4})\)'
+)
+
+# A match must end this far before a chunk boundary to be final; anything
+# closer is rescanned together with the next chunk
+_CHUNK_LOOKAHEAD = 64
+# Longest citation that can straddle a chunk boundary
+_MAX_CARRY = 4096
+
+
+class Citation:
+    """One citation occurrence; `start`/`end` are character offsets into the document"""
+
+    __slots__ = ('type', 'text', 'start', 'end', 'author', 'year', 'reference_id', 'url', 'doi')
+
+    def __init__(self, type: str, text: str, start: int, end: int,
+                 author: Optional[str] = None, year: Optional[int] = None,
+                 reference_id: Optional[str] = None,
+                 url: Optional[str] = None, doi: Optional[str] = None):
+        self.type = type
+        self.text = text
+        self.start = start
+        self.end = end
+        self.author = author
+        self.year = year
+        self.reference_id = reference_id
+        self.url = url
+        self.doi = doi
+
+    def to_dict(self) -> Dict:
+        """The dict shape the agents and the API use"""
+        return {
+            name: getattr(self, name)
+            for name in self.__slots__
+            if getattr(self, name) is not None
+        }
+
+
+def _to_citation(match: "re.Match", offset: int) -> Citation:
+    start = offset + match.start()
+
+    if match.group('url'):
+        url = strip_trailing_punctuation(match.group('url'))
+        return Citation('url', url, start, start + len(url), url=canonical_url(url))
+
+    if match.group('doi'):
+        cited = strip_trailing_punctuation(match.group('doi'))
+        return Citation('doi', cited, start, start + len(cited),
+                        doi=canonical_doi(match.group('doi_id')))
+
+    if match.group('ieee_id'):
+        return Citation('ieee', match.group(0), start, offset + match.end(),
+                        reference_id=match.group('ieee_id'))
+
+    return Citation('apa', match.group(0), start, offset + match.end(),
+                    author=match.group('apa_author'), year=int(match.group('apa_year')))
+
+
+def scan_citations(text: str, offset: int = 0) -> Iterator[Citation]:
+    """Citations in `text`, in document order"""
+    for match in _CITATION_PATTERN.finditer(text):
+        yield _to_citation(match, offset)
+
+
+def scan_citation_chunks(chunks: Iterable[str]) -> Iterator[Citation]:
+    """
+    Same output as scan_citations("".join(chunks)) while holding only one
+    chunk (plus a short carry-over) in memory at a time.
+    """
+    carry, offset = '', 0
+
+    for chunk in chunks:
+        buffer = carry + chunk
+        final_before = len(buffer) - _CHUNK_LOOKAHEAD
+        resume = 0
+
+        for match in _CITATION_PATTERN.finditer(buffer):
+            if match.end() > final_before:
+                break
+            yield _to_citation(match, offset)
+            resume = match.end()
+
+        # Rescan the unfinished tail with the next chunk, within bounds
+        resume = max(resume, len(buffer) - _MAX_CARRY)
+        resume = max(0, min(resume, final_before))
+        carry = buffer[resume:]
+        offset += resume
+
+    yield from scan_citations(carry, offset)
+
+
+_REFERENCES_HEADING = re.compile(
+    r'^[ \t]*(?:#+[ \t]*)?(?:\d+\.?[ \t]*)?'
+    r'(?:references|bibliography|works cited|literature cited)[ \t]*:?[ \t]*$',
+    re.IGNORECASE | re.MULTILINE
+)
+# "[3] A. Author, ..." or "3. A. Author, ..." at the start of a line
+_ENTRY_START = re.compile(r'^[ \t]*(?:\[(\d+)\]|(\d+)\.)[ \t]+', re.MULTILINE)
+_YEAR = re.compile(r'\b(?:1[89]|20)\d{2}\b')
+
+
+def parse_bibliography(text: str) -> Tuple[int, Dict[str, Dict]]:
+    """
+    Find the numbered reference list at the end of a document.
+    Returns (offset where the list starts, {reference_id: entry}); the
+    offset is len(text) when there is none. Each entry has its `text`
+    and, when present, a canonical `doi` and `url` and the `year`.
+    """
+    headings = list(_REFERENCES_HEADING.finditer(text))
+    if headings:
+        start = headings[-1].start()
+        markers = list(_ENTRY_START.finditer(text, headings[-1].end()))
+    else:
+        # No heading: accept a trailing run of "[1] ... [2] ..." lines
+        markers = [m for m in _ENTRY_START.finditer(text) if m.group(1)]
+        firsts = [i for i, m in enumerate(markers) if m.group(1) == '1']
+        if not firsts:
+            return len(text), {}
+        markers = markers[firsts[-1]:]
+        if [m.group(1) for m in markers] != [str(n) for n in range(1, len(markers) + 1)]:
+            return len(text), {}
+        start = markers[0].start()
+
+    entries = {}
+    for marker, following in zip(markers, markers[1:] + [None]):
+        body = text[marker.end():following.start() if following else len(text)]
+        entries[marker.group(1) or marker.group(2)] = _parse_entry(' '.join(body.split()))
+
+    return start, entries
+
+
+def _parse_entry(body: str) -> Dict:
+    entry = {'text': body}
+
+    for citation in scan_citations(body):
+        if citation.type == 'doi' and 'doi' not in entry:
+            entry['doi'] = citation.doi
+        elif citation.type == 'url' and 'url' not in entry:
+            if urlsplit(citation.url).hostname in _DOI_HOSTS:
+                entry.setdefault('doi', canonical_doi(citation.url))
+            else:
+                entry['url'] = citation.url
+
+    year = _YEAR.search(body)
+    if year:
+        entry['year'] = int(year.group(0))
+
+    return entry
+
+
+def resolve_references(text: str, citations: List[Dict]) -> List[Dict]:
+    """
+    Attach each IEEE marker's bibliography entry (as `entry`) and drop the
+    "[n]" labels of the reference list itself.
+    """
+    start, entries = parse_bibliography(text)
+
+    resolved = []
+    for citation in citations:
+        if citation['type'] == 'ieee':
+            if citation['start'] >= start:
+                continue
+            entry = entries.get(citation['reference_id'])
+            if entry is not None:
+                citation['entry'] = entry
+        resolved.append(citation)
+
+    return resolved
@@ -0,0 +1,173 @@
+import hashlib
+import re
+import struct
+import threading
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from config import config
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:[.,][0-9]+)*")
+_STOPWORDS = frozenset(
+    "a an the of in on at to by for from and or is are was were be been being "
+    "it its this that these those with as "
+    # discourse markers that restate rather than change a claim
+    "also actually indeed notably really remarkably fact".split()
+)
+_NEGATIONS = frozenset(("not", "no", "never", "none", "neither", "nor", "without"))
+# Words that say which way something changed: "increased" and "decreased"
+# differ in one token, so similarity alone would merge them
+_DIRECTIONS = {
+    **dict.fromkeys((
+        "increase increased increases increasing rise rises rose risen rising "
+        "raise raised raises raising grow grows grew grown growing gain gained gains "
+        "boost boosted boosts improve improved improves improving higher more greater"
+    ).split(), "up"),
+    **dict.fromkeys((
+        "decrease decreased decreases decreasing fall falls fell fallen falling "
+        "drop dropped drops dropping reduce reduced reduces reducing lower lowered lowers "
+        "lowering decline declined declines declining worsen worsened worsens less fewer smaller"
+    ).split(), "down")
+}
+
+
+def claim_tokens(text: str) -> List[str]:
+    """Lowercased word and number tokens, stopwords and fillers dropped ("n't" becomes "not")"""
+    text = text.lower().replace("n't", " not")
+    return [token for token in _TOKEN.findall(text) if token not in _STOPWORDS]
+
+
+def claim_shingles(tokens: List[str]) -> FrozenSet[str]:
+    """Token unigrams plus bigrams, so word order still counts for something"""
+    return frozenset(tokens) | frozenset(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+def _guard(tokens: List[str], entities: Iterable[str]) -> Tuple:
+    """Numbers, negation, direction of change and named entities must match exactly for two claims to be merged"""
+    return (
+        tuple(sorted({t for t in tokens if any(ch.isdigit() for ch in t)})),
+        any(t in _NEGATIONS for t in tokens),
+        tuple(sorted({_DIRECTIONS[t] for t in tokens if t in _DIRECTIONS})),
+        tuple(sorted({re.sub(r"^the\s+", "", e.lower().strip()) for e in entities}))
+    )
+
+
+class MinHasher:
+    """
+    MinHash signatures over `num_perm` independent 32-bit hash functions,
+    all read from one SHAKE-128 digest per shingle.
+    """
+
+    def __init__(self, num_perm: int):
+        self.num_perm = num_perm
+        self._format = f"<{num_perm}I"
+
+    def signature(self, shingles: FrozenSet[str]) -> Tuple[int, ...]:
+        hashes = [
+            struct.unpack(self._format, hashlib.shake_128(s.encode()).digest(self.num_perm * 4))
+            for s in shingles
+        ]
+        return tuple(map(min, zip(*hashes)))
+
+
+class ClaimIndex:
+    """
+    Maps near-duplicate claims to one representative wording.
+    MinHash/LSH finds candidates among claims with the same numbers,
+    negation, direction of change and named entities; a candidate is
+    accepted only if the exact Jaccard similarity of the token shingles
+    reaches `threshold`, so a synonym or a dropped modifier still merges
+    while an antonym or a changed date or place never inherits a verdict.
+    Representatives are remembered across documents (least recently used
+    evicted first), so a restated fact in a later document is verified as
+    the earlier wording and hits the evidence and verdict caches.
+    """
+
+    def __init__(self,
+                 threshold: float = config.CLAIM_CLUSTER_THRESHOLD,
+                 num_perm: int = config.CLAIM_MINHASH_PERMUTATIONS,
+                 bands: int = config.CLAIM_LSH_BANDS,
+                 max_entries: int = config.CLAIM_INDEX_MAX_ENTRIES):
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.max_entries = max_entries
+        self.hasher = MinHasher(bands * self.rows)
+
+        # representative text -> (shingles, LSH bucket keys)
+        self._entries: "OrderedDict[str, Tuple[FrozenSet[str], List[Tuple]]]" = OrderedDict()
+        self._buckets: Dict[Tuple, Set[str]] = {}
+        self._lock = threading.Lock()
+
+        self.lookups = 0
+        self.merged = 0
+
+    def canonicalize(self,
+                     texts: List[str],
+                     entities: Optional[List[Iterable[str]]] = None) -> List[str]:
+        """
+        The wording each claim should be verified as (its own text if new).
+        `entities` holds each claim's named-entity texts, parallel to `texts`.
+        """
+        entities = entities or [()] * len(texts)
+        with self._lock:
+            return [self._canonical(text, ents) for text, ents in zip(texts, entities)]
+
+    def _canonical(self, text: str, entities: Iterable[str]) -> str:
+        self.lookups += 1
+        if text in self._entries:
+            self._entries.move_to_end(text)
+            return text
+
+        tokens = claim_tokens(text)
+        shingles = claim_shingles(tokens)
+        if not shingles:
+            return text
+
+        signature = self.hasher.signature(shingles)
+        guard = _guard(tokens, entities)
+        keys = [
+            (band, guard, signature[band * self.rows:(band + 1) * self.rows])
+            for band in range(self.bands)
+        ]
+
+        best: Optional[str] = None
+        best_score = self.threshold
+        candidates = set().union(*(self._buckets.get(key, ()) for key in keys))
+        for candidate in candidates:
+            score = jaccard(shingles, self._entries[candidate][0])
+            if score >= best_score:
+                best, best_score = candidate, score
+
+        if best is not None:
+            self.merged += 1
+            self._entries.move_to_end(best)
+            return best
+
+        self._add(text, shingles, keys)
+        return text
+
+    def _add(self, text: str, shingles: FrozenSet[str], keys: List[Tuple]):
+        self._entries[text] = (shingles, keys)
+        for key in keys:
+            self._buckets.setdefault(key, set()).add(text)
+
+        while len(self._entries) > self.max_entries:
+            old_text, (_, old_keys) = self._entries.popitem(last=False)
+            for key in old_keys:
+                bucket = self._buckets.get(key)
+                if bucket is not None:
+                    bucket.discard(old_text)
+                    if not bucket:
+                        del self._buckets[key]
+
+    def stats(self) -> Dict:
+        return {
+            'lookups': self.lookups,
+            'merged': self.merged,
+            'representatives': len(self._entries)
+        }
@@ -0,0 +1,34 @@
+import time
+from typing import Dict, Optional
+
+from config import config
+
+
+class Deadline:
+    """
+    End-to-end time budget for one request, split into ordered stages.
+    Each stage must finish by its cumulative share of the total, so time a
+    stage leaves unused carries over to the stages after it.
+    """
+
+    def __init__(self, seconds: float, budgets: Optional[Dict[str, float]] = None):
+        budgets = budgets or config.STAGE_BUDGETS
+        total = sum(budgets.values())
+
+        self.seconds = seconds
+        self.start = time.monotonic()
+        self.end = self.start + seconds
+        self.stage_ends = {}
+
+        elapsed_share = 0.0
+        for stage, share in budgets.items():
+            elapsed_share += share / total
+            self.stage_ends[stage] = self.start + seconds * elapsed_share
+
+    def remaining(self, stage: Optional[str] = None) -> float:
+        """Seconds left until `stage` (or the whole request) must be done"""
+        end = self.stage_ends.get(stage, self.end) if stage else self.end
+        return max(0.0, end - time.monotonic())
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.start
@@ -0,0 +1,89 @@
+import asyncio
+import hashlib
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from config import config
+
+
+def content_hash(text: str) -> str:
+    """Key of a sentence or reference, insensitive to surrounding whitespace"""
+    return hashlib.blake2b(text.strip().encode(), digest_size=16).hexdigest()
+
+
+class DocumentSession:
+    """
+    The last verified revision of one document, so the next revision
+    only has to verify what changed.
+    """
+
+    def __init__(self):
+        self.id = uuid.uuid4().hex
+        self.revision = 0
+
+        # sentence hash -> (claim result, hash of the sentence it was verified
+        # as a duplicate of), or None if the sentence is not a claim
+        self.sentences: Dict[str, Optional[Tuple[Dict, str]]] = {}
+        self.claim_counts: Dict[str, int] = {}  # sentence hash -> claims in the revision
+        # canonical reference -> check result
+        self.citations: Dict[str, Dict] = {}
+        self.citation_counts: Dict[str, int] = {}  # reference -> occurrences in the revision
+
+        self.risk: Any = None  # agents.risk_scorer.RiskAccumulator of the revision
+        self.report: Optional[Dict] = None
+        self.created_at = self.updated_at = self.used_at = time.time()
+        # Revisions of one session are verified one at a time
+        self.lock = asyncio.Lock()
+
+    def info(self) -> Dict:
+        return {
+            'session_id': self.id,
+            'revision': self.revision,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
+        }
+
+
+class SessionStore:
+    """Document sessions, least recently used evicted first and expired after `ttl` idle seconds"""
+
+    def __init__(self,
+                 max_entries: int = config.SESSION_MAX_ENTRIES,
+                 ttl: float = config.SESSION_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._sessions: "OrderedDict[str, DocumentSession]" = OrderedDict()
+
+    def create(self) -> DocumentSession:
+        session = DocumentSession()
+        self._sessions[session.id] = session
+        self._expire()
+        while len(self._sessions) > self.max_entries:
+            self._sessions.popitem(last=False)
+        return session
+
+    def get(self, session_id: str) -> Optional[DocumentSession]:
+        self._expire()
+        session = self._sessions.get(session_id)
+        if session is not None:
+            session.used_at = time.time()
+            self._sessions.move_to_end(session_id)
+        return session
+
+    def delete(self, session_id: str) -> bool:
+        return self._sessions.pop(session_id, None) is not None
+
+    def stats(self) -> Dict:
+        self._expire()
+        return {'sessions': len(self._sessions), 'max_entries': self.max_entries, 'ttl': self.ttl}
+
+    def _expire(self):
+        # Sessions are ordered by last use, so expired ones are at the front
+        cutoff = time.time() - self.ttl
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if session.used_at >= cutoff or session.lock.locked():
+                break
+            self._sessions.popitem(last=False)
@@ -1,5 +1,18 @@
+def describe_error(error: Exception) -> str:
+    """
+    Exception type and HTTP status only. Safe to store, log and serve:
+    str() of an HTTP error includes the request URL, and with it any API
+    key sent in the query string.
+    """
+    status = getattr(getattr(error, "response", None), "status_code", None)
+    name = type(error).__name__
+    return f"{name} (HTTP {status})" if status is not None else name
+
+
 def analyze_error(error: Exception) -> dict:
     msg = str(error)
+    # HTTP errors (httpx.HTTPStatusError) carry the response status
+    status = getattr(getattr(error, "response", None), "status_code", None)
 
     if "models/gemini" in msg and "not found" in msg:
         return {
@@ -15,13 +28,27 @@ def analyze_error(error: Exception) -> dict:
             "fixable": False
         }
 
-    if "429" in msg:
+    if status == 429 or (status is None and "429" in msg):
         return {
             "type": "RATE_LIMIT",
             "action": "Apply backoff or skip this provider",
             "fixable": False
         }
 
+    if status in (401, 403):
+        return {
+            "type": "API_KEY_ERROR",
+            "action": "Disable this provider until its credentials are fixed",
+            "fixable": False
+        }
+
+    if status is not None and 400 <= status < 500:
+        return {
+            "type": "CLIENT_ERROR",
+            "action": "Request rejected; do not retry it",
+            "fixable": False
+        }
+
     return {
         "type": "UNKNOWN",
         "action": "Log and continue",
@@ -0,0 +1,119 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, AsyncContextManager, Awaitable, Callable, Dict, Optional
+
+from config import config
+
+
+class LatencyTracker:
+    """Recent successful response times for one provider"""
+
+    def __init__(self, window: int = config.LATENCY_WINDOW):
+        self.samples = deque(maxlen=window)
+
+    def record(self, seconds: float):
+        self.samples.append(seconds)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+    def hedge_delay(self) -> float:
+        """How long to wait before sending a duplicate request"""
+        if len(self.samples) < config.HEDGE_MIN_SAMPLES:
+            return config.HEDGE_DEFAULT_DELAY
+        return max(config.HEDGE_MIN_DELAY, self.percentile(config.HEDGE_PERCENTILE))
+
+
+class Hedger:
+    """
+    Hedged requests: if a call has not answered within its provider's
+    recent p95 latency, an identical call is sent and the first successful
+    answer wins; the loser is cancelled. Only ~5% of calls are duplicated.
+    """
+
+    def __init__(self, providers=config.HEDGED_PROVIDERS):
+        self.providers = set(providers)
+        self.trackers: Dict[str, LatencyTracker] = {}
+        self.hedged: Dict[str, int] = {}
+        self.hedge_wins: Dict[str, int] = {}
+
+    def tracker(self, provider: str) -> LatencyTracker:
+        if provider not in self.trackers:
+            self.trackers[provider] = LatencyTracker()
+        return self.trackers[provider]
+
+    async def run(self,
+                  provider: str,
+                  request: Callable[[], Awaitable[Any]],
+                  slot: Optional[Callable[[], AsyncContextManager]] = None) -> Any:
+        """
+        Await `request()`, hedging it when `provider` is configured for it.
+        Each attempt, the hedge included, runs inside its own `slot()`
+        (a scheduler slot), so hedges count against concurrency and rate limits.
+        """
+        tracker = self.tracker(provider)
+        if provider not in self.providers:
+            return await self._timed(tracker, request, slot)
+
+        primary = asyncio.ensure_future(self._timed(tracker, request, slot))
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=tracker.hedge_delay())
+            if done:
+                return primary.result()
+
+            self.hedged[provider] = self.hedged.get(provider, 0) + 1
+            backup = asyncio.ensure_future(self._timed(tracker, request, slot))
+            tasks.add(backup)
+
+            error = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is backup:
+                            self.hedge_wins[provider] = self.hedge_wins.get(provider, 0) + 1
+                        return task.result()
+                    error = task.exception()
+
+            # Both attempts failed
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _timed(self,
+                     tracker: LatencyTracker,
+                     request: Callable[[], Awaitable[Any]],
+                     slot: Optional[Callable[[], AsyncContextManager]] = None) -> Any:
+        if slot is None:
+            return await self._measure(tracker, request)
+        async with slot():
+            # Timed once the slot is held: queueing is not provider latency
+            return await self._measure(tracker, request)
+
+    async def _measure(self, tracker: LatencyTracker, request: Callable[[], Awaitable[Any]]) -> Any:
+        start = time.monotonic()
+        result = await request()
+        tracker.record(time.monotonic() - start)
+        return result
+
+    def stats(self) -> Dict:
+        return {
+            provider: {
+                'p50_ms': round((tracker.percentile(50) or 0) * 1000, 1),
+                'p95_ms': round((tracker.percentile(95) or 0) * 1000, 1),
+                'samples': len(tracker.samples),
+                'hedge_delay_ms': round(tracker.hedge_delay() * 1000, 1),
+                'hedged': self.hedged.get(provider, 0),
+                'hedge_wins': self.hedge_wins.get(provider, 0)
+            }
+            for provider, tracker in self.trackers.items()
+        }
+
+
+hedger = Hedger()
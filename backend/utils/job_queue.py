@@ -0,0 +1,202 @@
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Iterator, List, Optional
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+
+class Job:
+    """A batch of documents; per-document results are appended to a JSONL file"""
+
+    def __init__(self, documents: List[Dict], results_dir: str):
+        self.id = uuid.uuid4().hex
+        self.total = len(documents)
+        self.documents = documents
+        self.results_path = os.path.join(results_dir, f"{self.id}.jsonl")
+
+        self.completed = 0
+        self.failed = 0
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def status(self) -> str:
+        if self.finished_at is not None:
+            return 'completed'
+        if self.started_at is not None:
+            return 'running'
+        return 'queued'
+
+    def record(self, index: int, result: Optional[Dict], error: Optional[str]):
+        """Append one document's outcome (runs on a worker thread)"""
+        line = {
+            'index': index,
+            'document_id': self.documents[index].get('id') or str(index),
+            'status': 'failed' if error else 'completed'
+        }
+        if error:
+            line['error'] = error
+        else:
+            line['result'] = result
+
+        with self._lock:
+            with open(self.results_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(line) + '\n')
+
+    def iter_results(self, offset: int = 0, limit: Optional[int] = None) -> Iterator[str]:
+        """Yield stored JSONL lines in completion order"""
+        if not os.path.exists(self.results_path):
+            return
+
+        with open(self.results_path, encoding='utf-8') as f:
+            for i, line in enumerate(f):
+                if i < offset:
+                    continue
+                if limit is not None and i >= offset + limit:
+                    break
+                yield line
+
+    def progress(self) -> Dict:
+        done = self.completed + self.failed
+        elapsed = (self.finished_at or time.time()) - (self.started_at or time.time())
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'total': self.total,
+            'completed': self.completed,
+            'failed': self.failed,
+            'pending': self.total - done,
+            'progress': round(done / self.total, 4) if self.total else 1.0,
+            'docs_per_sec': round(done / elapsed, 2) if elapsed > 0 else 0.0,
+            'created_at': self.created_at
+        }
+
+
+class JobQueue:
+    """
+    In-process queue of document verifications.
+    A fixed pool of workers pulls documents from every job, so all jobs
+    share the same agent, caches and provider rate limits. Finished jobs
+    are forgotten after `retention` seconds or beyond `max_retained`.
+    """
+
+    def __init__(self,
+                 verify: Callable[[str], Awaitable[Dict]],
+                 workers: int = config.JOB_WORKERS,
+                 results_dir: str = config.JOB_RESULTS_DIR,
+                 max_retained: int = config.JOB_MAX_RETAINED,
+                 retention: float = config.JOB_RETENTION,
+                 evict_interval: float = config.JOB_EVICT_INTERVAL):
+        self.verify = verify
+        self.workers = workers
+        self.results_dir = results_dir
+        self.max_retained = max_retained
+        self.retention = retention
+        self.evict_interval = evict_interval
+
+        self.jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self):
+        os.makedirs(self.results_dir, exist_ok=True)
+        self._queue = asyncio.Queue()
+        self._tasks = [
+            asyncio.create_task(self._worker())
+            for _ in range(self.workers)
+        ]
+        self._tasks.append(asyncio.create_task(self._evict_periodically()))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def submit(self, documents: List[Dict]) -> Job:
+        """Queue a batch of {'id', 'text'} documents and return its job"""
+        job = Job(documents, self.results_dir)
+        self.jobs[job.id] = job
+        self._evict_finished()
+
+        for index in range(len(documents)):
+            self._queue.put_nowait((job, index))
+
+        if not documents:
+            job.started_at = job.finished_at = time.time()
+
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.jobs.get(job_id)
+
+    def stats(self) -> Dict:
+        return {
+            'workers': self.workers,
+            'queued_documents': self._queue.qsize() if self._queue else 0,
+            'jobs': {status: sum(1 for j in self.jobs.values() if j.status == status)
+                     for status in ('queued', 'running', 'completed')}
+        }
+
+    async def _worker(self):
+        while True:
+            job, index = await self._queue.get()
+            try:
+                await self._run_one(job, index)
+            finally:
+                self._queue.task_done()
+
+    async def _run_one(self, job: Job, index: int):
+        if job.started_at is None:
+            job.started_at = time.time()
+
+        result, error = None, None
+        try:
+            result = await self.verify(job.documents[index]['text'])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            error = str(e)
+
+        try:
+            await asyncio.to_thread(job.record, index, result, error)
+        except Exception:
+            # The document counts as failed; the worker keeps going
+            logger.exception(f"Could not record document {index} of job {job.id}")
+            error = error or 'result could not be recorded'
+
+        if error:
+            job.failed += 1
+        else:
+            job.completed += 1
+
+        if job.completed + job.failed == job.total:
+            job.finished_at = time.time()
+            # Texts are no longer needed once every document is done
+            job.documents = [{'id': d.get('id')} for d in job.documents]
+
+    async def _evict_periodically(self):
+        # Expired jobs go even when nothing new is submitted
+        while True:
+            await asyncio.sleep(self.evict_interval)
+            self._evict_finished()
+
+    def _evict_finished(self):
+        """Forget finished jobs past `retention`, then the oldest beyond `max_retained`"""
+        finished = [j for j in self.jobs.values() if j.status == 'completed']
+        expired = [j for j in finished if time.time() - j.finished_at > self.retention]
+        kept = [j for j in finished if j not in expired]
+        for job in expired + kept[:max(0, len(kept) - self.max_retained)]:
+            del self.jobs[job.id]
+            if os.path.exists(job.results_path):
+                os.remove(job.results_path)
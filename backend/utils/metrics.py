@@ -0,0 +1,245 @@
+import asyncio
+import math
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from config import config
+
+Labels = Tuple[Tuple[str, str], ...]
+
+# (name, type, help, [(labels, value), ...]) as returned by collectors
+Family = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+
+class RequestTimings:
+    """Spans recorded while serving one request; returned as the `timings` block"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.stages: Dict[str, List[float]] = {}  # stage -> [count, total, max]
+        self.providers: Dict[str, List[float]] = {}  # provider -> [count, total, max, errors]
+        self.claims: Dict[str, Dict[str, float]] = {}
+        self.tokens = {'prompt': 0, 'completion': 0}
+
+    def add_stage(self, stage: str, seconds: float, claims: Iterable[str] = ()):
+        self._add(self.stages.setdefault(stage, [0, 0.0, 0.0]), seconds)
+        for claim_id in claims:
+            per_claim = self.claims.setdefault(claim_id, {})
+            per_claim[f'{stage}_s'] = per_claim.get(f'{stage}_s', 0.0) + seconds
+
+    def add_provider_call(self, provider: str, seconds: float, error: bool):
+        entry = self.providers.setdefault(provider, [0, 0.0, 0.0, 0])
+        self._add(entry, seconds)
+        entry[3] += error
+
+    def _add(self, entry: List[float], seconds: float):
+        entry[0] += 1
+        entry[1] += seconds
+        entry[2] = max(entry[2], seconds)
+
+    def summary(self) -> Dict:
+        return {
+            'total_s': round(time.perf_counter() - self.start, 4),
+            'stages': {
+                stage: {'count': count, 'total_s': round(total, 4), 'max_s': round(worst, 4)}
+                for stage, (count, total, worst) in self.stages.items()
+            },
+            'providers': {
+                provider: {'calls': count, 'total_s': round(total, 4),
+                           'max_s': round(worst, 4), 'errors': errors}
+                for provider, (count, total, worst, errors) in self.providers.items()
+            },
+            'claims': {
+                claim_id: {stage: round(seconds, 4) for stage, seconds in stages.items()}
+                for claim_id, stages in self.claims.items()
+            },
+            'llm_tokens': dict(self.tokens)
+        }
+
+
+# Timings of the request being served (None outside VerificationAgent.verify)
+current_timings: ContextVar[Optional[RequestTimings]] = ContextVar("current_timings", default=None)
+
+
+class Histogram:
+    """Cumulative-bucket histogram, one series per label set"""
+
+    def __init__(self, buckets: List[float]):
+        self.buckets = sorted(buckets) + [math.inf]
+        self.series: Dict[Labels, List[float]] = {}  # labels -> [bucket counts..., count, sum]
+
+    def observe(self, labels: Labels, value: float):
+        counts = self.series.get(labels)
+        if counts is None:
+            counts = self.series[labels] = [0] * len(self.buckets) + [0, 0.0]
+
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[i] += 1
+        counts[-2] += 1
+        counts[-1] += value
+
+
+class Metrics:
+    """
+    In-process pipeline metrics rendered in the Prometheus text format.
+    Stage spans and provider calls feed latency histograms (and the
+    current request's RequestTimings); gauges such as cache counters and
+    scheduler concurrency are read from registered collectors at scrape time.
+    """
+
+    def __init__(self,
+                 prefix: str = config.METRICS_PREFIX,
+                 buckets: List[float] = config.METRICS_BUCKETS):
+        self.prefix = prefix
+        self.buckets = buckets
+        self._lock = threading.Lock()
+
+        self._help: Dict[str, Tuple[str, str]] = {}
+        self._histograms: Dict[str, Histogram] = {}
+        self._values: Dict[str, Dict[Labels, float]] = {}
+        self._collectors: Dict[str, Callable[[], Iterable[Family]]] = {}
+
+        self._define('request_seconds', 'histogram', 'End-to-end verification time')
+        self._define('requests_total', 'counter', 'Verifications by outcome')
+        self._define('requests_in_flight', 'gauge', 'Verifications in progress')
+        self._define('stage_seconds', 'histogram', 'Time spent in each pipeline stage')
+        self._define('provider_request_seconds', 'histogram', 'Provider call time while holding a scheduler slot')
+        self._define('llm_tokens_total', 'counter', 'LLM tokens used, by model and kind')
+        self._define('session_claims_total', 'counter', 'Claims in document session revisions, reused or verified')
+
+    def _define(self, name: str, kind: str, help_text: str):
+        self._help[name] = (kind, help_text)
+        if kind == 'histogram':
+            self._histograms[name] = Histogram(self.buckets)
+        else:
+            self._values[name] = {}
+
+    def observe(self, name: str, value: float, **labels):
+        with self._lock:
+            self._histograms[name].observe(tuple(sorted(labels.items())), value)
+
+    def inc(self, name: str, value: float = 1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._values[name]
+            series[key] = series.get(key, 0) + value
+
+    def register(self, name: str, collector: Callable[[], Iterable[Family]]):
+        """Add (or replace) a collector read at scrape time"""
+        self._collectors[name] = collector
+
+    @contextmanager
+    def request(self):
+        """Count and time one verification; yields its RequestTimings"""
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        self.inc('requests_in_flight')
+        outcome = 'error'
+        try:
+            yield timings
+            outcome = 'ok'
+        finally:
+            current_timings.reset(token)
+            self.inc('requests_in_flight', -1)
+            self.inc('requests_total', outcome=outcome)
+            self.observe('request_seconds', time.perf_counter() - timings.start)
+
+    @contextmanager
+    def span(self, stage: str, claims: Iterable[str] = ()):
+        """Time a pipeline stage; `claims` are the ids of the claims it worked on"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.observe('stage_seconds', elapsed, stage=stage)
+            timings = current_timings.get()
+            if timings is not None:
+                timings.add_stage(stage, elapsed, claims)
+
+    @contextmanager
+    def provider_call(self, provider: str):
+        """Time one call to `provider`; cancelled calls (lost hedges, deadlines) are labelled so"""
+        start = time.perf_counter()
+        outcome = 'error'
+        try:
+            yield
+            outcome = 'ok'
+        except asyncio.CancelledError:
+            outcome = 'cancelled'
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            self.observe('provider_request_seconds', elapsed, provider=provider, outcome=outcome)
+            timings = current_timings.get()
+            if timings is not None:
+                timings.add_provider_call(provider, elapsed, outcome == 'error')
+
+    def record_tokens(self, model: str, usage):
+        """Count tokens from a Gemini response's `usage_metadata` (if any)"""
+        prompt = getattr(usage, 'prompt_token_count', None) or 0
+        completion = getattr(usage, 'candidates_token_count', None) or 0
+        self.inc('llm_tokens_total', prompt, model=model, kind='prompt')
+        self.inc('llm_tokens_total', completion, model=model, kind='completion')
+
+        timings = current_timings.get()
+        if timings is not None:
+            timings.tokens['prompt'] += prompt
+            timings.tokens['completion'] += completion
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        lines: List[str] = []
+
+        with self._lock:
+            for name, (kind, help_text) in self._help.items():
+                full_name = f'{self.prefix}_{name}'
+                lines.append(f'# HELP {full_name} {help_text}')
+                lines.append(f'# TYPE {full_name} {kind}')
+
+                if kind == 'histogram':
+                    histogram = self._histograms[name]
+                    for labels, counts in histogram.series.items():
+                        for bound, count in zip(histogram.buckets, counts):
+                            bucket_labels = labels + (('le', _number(bound)),)
+                            lines.append(f'{full_name}_bucket{_labels(bucket_labels)} {count}')
+                        lines.append(f'{full_name}_count{_labels(labels)} {counts[-2]}')
+                        lines.append(f'{full_name}_sum{_labels(labels)} {_number(counts[-1])}')
+                else:
+                    for labels, value in self._values[name].items():
+                        lines.append(f'{full_name}{_labels(labels)} {_number(value)}')
+
+        for collector in list(self._collectors.values()):
+            for name, kind, help_text, samples in collector():
+                full_name = f'{self.prefix}_{name}'
+                lines.append(f'# HELP {full_name} {help_text}')
+                lines.append(f'# TYPE {full_name} {kind}')
+                for labels, value in samples:
+                    lines.append(f'{full_name}{_labels(tuple(sorted(labels.items())))} {_number(value)}')
+
+        return '\n'.join(lines) + '\n'
+
+
+def _labels(labels: Labels) -> str:
+    if not labels:
+        return ''
+    escaped = (
+        (key, str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"'))
+        for key, value in labels
+    )
+    return '{' + ','.join(f'{key}="{value}"' for key, value in escaped) + '}'
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+metrics = Metrics()
@@ -0,0 +1,139 @@
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from config import config
+from utils.metrics import metrics
+
+# Document position of the claim/citation being processed.
+# Lower values are served first when a provider is saturated.
+current_priority: ContextVar[int] = ContextVar("current_priority", default=0)
+
+
+class TokenBucket:
+    """Token-bucket rate limiter: `rate` requests/sec with bursts up to `burst`"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class ProviderLimiter:
+    """Concurrency slots for one provider, granted in priority order"""
+
+    def __init__(self, name: str, concurrency: int, rate: Optional[float] = None, burst: int = 1):
+        self.name = name
+        self.concurrency = concurrency
+        self.bucket = TokenBucket(rate, burst) if rate else None
+
+        self.in_flight = 0
+        self._waiters = []
+        self._seq = itertools.count()
+
+        self.completed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    async def acquire(self, priority: int = 0):
+        start = time.monotonic()
+
+        if self.in_flight < self.concurrency and not self.queue_depth:
+            self.in_flight += 1
+        else:
+            future = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._waiters, (priority, next(self._seq), future))
+            try:
+                await future
+            except asyncio.CancelledError:
+                # The slot may have been handed over just before cancellation
+                if future.done() and not future.cancelled():
+                    self.release()
+                raise
+
+        if self.bucket:
+            try:
+                await self.bucket.acquire()
+            except asyncio.CancelledError:
+                self.release()
+                raise
+
+        wait = time.monotonic() - start
+        self.completed += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+    def release(self):
+        # Hand the slot straight to the highest-priority live waiter
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+
+        self.in_flight -= 1
+
+    def stats(self) -> Dict:
+        return {
+            'concurrency': self.concurrency,
+            'rate_per_sec': self.bucket.rate if self.bucket else None,
+            'in_flight': self.in_flight,
+            'queue_depth': self.queue_depth,
+            'acquired': self.completed,
+            'avg_wait_ms': round(self.total_wait / self.completed * 1000, 2) if self.completed else 0.0,
+            'max_wait_ms': round(self.max_wait * 1000, 2)
+        }
+
+
+class ProviderScheduler:
+    """Per-provider concurrency and rate limits shared by every request"""
+
+    def __init__(self, limits: Dict[str, Dict]):
+        self.limiters = {
+            name: ProviderLimiter(name, **spec)
+            for name, spec in limits.items()
+        }
+
+    @asynccontextmanager
+    async def slot(self, provider: str):
+        """
+        Hold one request slot for `provider` for the duration of the block.
+        Time spent inside the block is recorded as a provider call.
+        """
+        limiter = self.limiters.get(provider)
+        if limiter is not None:
+            await limiter.acquire(current_priority.get())
+
+        try:
+            with metrics.provider_call(provider):
+                yield
+        finally:
+            if limiter is not None:
+                limiter.release()
+
+    def stats(self) -> Dict:
+        return {name: limiter.stats() for name, limiter in self.limiters.items()}
+
+
+scheduler = ProviderScheduler(config.PROVIDER_LIMITS)
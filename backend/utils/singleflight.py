@@ -0,0 +1,131 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from config import config
+
+
+class Call:
+    """One in-flight call and how many callers are waiting on it"""
+
+    def __init__(self, task: asyncio.Future):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    In-flight request coalescing: the first caller for a (group, key)
+    starts the call, and callers arriving before it finishes await the same
+    result or exception instead of repeating it. Nothing is kept once the
+    call finishes (that is the caches' job), so the results are fresh.
+    Results are shared between callers; callers must not mutate them.
+    A call is cancelled only when every caller waiting on it is cancelled.
+    """
+
+    def __init__(self, enabled: bool = config.SINGLEFLIGHT_ENABLED):
+        self.enabled = enabled
+        self._calls: Dict[Tuple[str, str], Call] = {}
+        self.calls: Dict[str, int] = {}
+        self.coalesced: Dict[str, int] = {}
+
+    async def do(self, group: str, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Await `fn()`, or the identical call already in flight for `key`"""
+        if not self.enabled:
+            return await fn()
+        return await self.wait(self.start(group, key, fn))
+
+    def start(self, group: str, key: str, fn: Callable[[], Awaitable[Any]]) -> Call:
+        """
+        The in-flight call for `key`, starting `fn()` if there is none.
+        Registers synchronously, so calls started now and awaited later
+        are already visible to concurrent callers.
+        """
+        call = self._join(group, key)
+        if call is None:
+            call = self._lead(group, key, asyncio.ensure_future(fn()))
+        return call
+
+    def start_many(self, group: str, keys: List[str], fn: Callable[[], Awaitable[List[Any]]]) -> List[Call]:
+        """
+        Calls for several keys answered by one `fn()` that returns their
+        results in `keys` order (a batched request). Keys already in flight
+        join those calls instead. The batch is cancelled once every call it
+        leads has been cancelled.
+        """
+        batch = asyncio.ensure_future(fn())
+        calls, led = [], []
+        for position, key in enumerate(keys):
+            call = self._join(group, key)
+            if call is None:
+                call = self._lead(group, key, asyncio.ensure_future(self._nth(batch, position)))
+                led.append(call.task)
+            calls.append(call)
+
+        def abandon(_):
+            if all(task.cancelled() for task in led):
+                batch.cancel()
+
+        for task in led:
+            task.add_done_callback(abandon)
+        if not led:
+            batch.cancel()
+        return calls
+
+    @staticmethod
+    async def _nth(batch: asyncio.Future, position: int) -> Any:
+        # Shielded: the batch also answers the other keys in it
+        return (await asyncio.shield(batch))[position]
+
+    def _join(self, group: str, key: str) -> Optional[Call]:
+        call = self._calls.get((group, key)) if self.enabled else None
+        if call is not None:
+            self.coalesced[group] = self.coalesced.get(group, 0) + 1
+        return call
+
+    def _lead(self, group: str, key: str, task: asyncio.Future) -> Call:
+        call = Call(task)
+        if self.enabled:
+            flight = (group, key)
+            self.calls[group] = self.calls.get(group, 0) + 1
+            self._calls[flight] = call
+            task.add_done_callback(lambda _: self._finish(flight, call))
+        return call
+
+    def in_flight(self, group: str, key: str) -> bool:
+        return self.enabled and (group, key) in self._calls
+
+    async def wait(self, call: Call) -> Any:
+        call.waiters += 1
+        try:
+            # Shielded: one caller's deadline must not cancel the others' call
+            return await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            if call.waiters == 1 and not call.task.done():
+                call.task.cancel()
+            raise
+        finally:
+            call.waiters -= 1
+
+    def _finish(self, flight: Tuple[str, str], call: Call):
+        if self._calls.get(flight) is call:
+            del self._calls[flight]
+
+    def stats(self) -> Dict:
+        in_flight: Dict[str, int] = {}
+        for group, _ in self._calls:
+            in_flight[group] = in_flight.get(group, 0) + 1
+
+        stats = {}
+        for group in sorted(self.calls):
+            calls = self.calls[group]
+            coalesced = self.coalesced.get(group, 0)
+            stats[group] = {
+                'calls': calls,
+                'coalesced': coalesced,
+                'coalesced_rate': round(coalesced / (calls + coalesced), 4),
+                'in_flight': in_flight.get(group, 0)
+            }
+        return stats
+
+
+flights = SingleFlight()